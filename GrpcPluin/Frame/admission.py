@@ -0,0 +1,275 @@
+"""Admission control: reject early instead of queueing without bound.
+
+An :class:`AdmissionController` caps the requests in flight at the value
+of its :class:`Limit`. A request over the limit, or one that already
+waited too long in the server's thread pool queue, is rejected at once
+with RESOURCE_EXHAUSTED (429). Adaptive limits shrink when latency grows
+or calls fail, and grow back while the server keeps up.
+"""
+
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from .exceptions.exceptions import ResourceExhaustedException
+
+
+class Limit:
+    """Concurrency limit, updated after every completed request.
+
+    Attributes:
+        limit: Current limit; may be fractional internally
+        min_limit: Lower bound of the limit
+        max_limit: Upper bound of the limit
+    """
+
+    def __init__(self, initial: int, min_limit: int = 1, max_limit: int = 1000) -> None:
+        """Initialize the limit.
+
+        Args:
+            initial: Starting limit
+            min_limit: Lower bound
+            max_limit: Upper bound
+        """
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= initial <= max_limit")
+        self.limit: float = float(initial)
+        self.min_limit: int = min_limit
+        self.max_limit: int = max_limit
+
+    @property
+    def current(self) -> int:
+        """Return the limit as a whole number of requests."""
+        return int(self.limit)
+
+    def update(self, latency: float, in_flight: int, dropped: bool) -> None:
+        """Adjust the limit after a request completes.
+
+        Args:
+            latency: Seconds the request took
+            in_flight: Requests in flight when it started
+            dropped: Whether it failed in a way that signals overload
+        """
+
+    def _clamp(self, value: float) -> float:
+        """Keep a new limit within the bounds."""
+        return max(float(self.min_limit), min(float(self.max_limit), value))
+
+
+class StaticLimit(Limit):
+    """Fixed concurrency limit."""
+
+    def __init__(self, limit: int) -> None:
+        """Initialize the limit.
+
+        Args:
+            limit: Maximum requests in flight
+        """
+        super().__init__(initial=limit, min_limit=limit, max_limit=limit)
+
+
+class AIMDLimit(Limit):
+    """Additive-increase, multiplicative-decrease limit.
+
+    Grows by one while at least half the limit is in use, and shrinks by
+    ``backoff_ratio`` when a request is dropped or slower than
+    ``latency_threshold``.
+    """
+
+    def __init__(
+        self,
+        initial: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 1000,
+        backoff_ratio: float = 0.9,
+        latency_threshold: float | None = None,
+    ) -> None:
+        """Initialize the limit.
+
+        Args:
+            initial: Starting limit
+            min_limit: Lower bound
+            max_limit: Upper bound
+            backoff_ratio: Factor applied on overload, between 0.5 and 1
+            latency_threshold: Seconds above which a request counts as
+                an overload signal; None reacts to drops only
+        """
+        super().__init__(initial, min_limit, max_limit)
+        if not 0.5 <= backoff_ratio < 1:
+            raise ValueError("backoff_ratio must be in [0.5, 1)")
+        self.backoff_ratio: float = backoff_ratio
+        self.latency_threshold: float | None = latency_threshold
+
+    def update(self, latency: float, in_flight: int, dropped: bool) -> None:
+        """Back off on overload, otherwise probe for more capacity."""
+        threshold = self.latency_threshold
+        if dropped or (threshold is not None and latency > threshold):
+            self.limit = self._clamp(self.limit * self.backoff_ratio)
+        elif in_flight * 2 >= self.limit:
+            self.limit = self._clamp(self.limit + 1)
+
+
+class GradientLimit(Limit):
+    """Latency-gradient limit.
+
+    Compares each request's latency with a long-term average. While
+    latency stays near the average the limit grows by a queue allowance
+    of ``sqrt(limit)``; when latency rises above ``tolerance`` times the
+    average, the limit shrinks in proportion.
+    """
+
+    def __init__(
+        self,
+        initial: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 1000,
+        smoothing: float = 0.2,
+        tolerance: float = 1.5,
+        long_window: int = 600,
+    ) -> None:
+        """Initialize the limit.
+
+        Args:
+            initial: Starting limit
+            min_limit: Lower bound
+            max_limit: Upper bound
+            smoothing: Weight of each new estimate, between 0 and 1
+            tolerance: Latency increase over the average that is accepted
+                before the limit shrinks
+            long_window: Number of requests the long-term average spans
+        """
+        super().__init__(initial, min_limit, max_limit)
+        self.smoothing: float = smoothing
+        self.tolerance: float = tolerance
+        self._decay: float = 2.0 / (long_window + 1)
+        self._long_latency: float | None = None
+
+    def update(self, latency: float, in_flight: int, dropped: bool) -> None:
+        """Move the limit along the latency gradient."""
+        if self._long_latency is None:
+            self._long_latency = latency
+        else:
+            self._long_latency += (latency - self._long_latency) * self._decay
+
+        if dropped:
+            self.limit = self._clamp(self.limit * 0.9)
+            return
+        # An under-used limit says nothing about capacity
+        if in_flight * 2 < self.limit:
+            return
+
+        ratio = self.tolerance * self._long_latency / max(latency, 1e-9)
+        gradient = max(0.5, min(1.0, ratio))
+        estimate = self.limit * gradient + math.sqrt(self.limit)
+        self.limit = self._clamp(self.limit * (1 - self.smoothing) + estimate * self.smoothing)
+
+
+class AdmissionController:
+    """Admits requests while in-flight count and queueing delay allow.
+
+    Thread-safe; one controller guards either a single route or every
+    route of a router.
+    """
+
+    def __init__(self, limit: Limit, max_queue_delay: float | None = None) -> None:
+        """Initialize the controller.
+
+        Args:
+            limit: Concurrency limit; one instance per controller, as it
+                keeps state
+            max_queue_delay: Reject requests that waited longer than this
+                many seconds in the sync server's queue (see
+                :class:`QueueTimedExecutor`)
+        """
+        self.limit: Limit = limit
+        self.max_queue_delay: float | None = max_queue_delay
+        self.in_flight: int = 0
+        self.admitted: int = 0
+        self.rejected: int = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> tuple[float, int]:
+        """Admit a request or reject it.
+
+        Returns:
+            Token to pass to :meth:`release`
+
+        Raises:
+            ResourceExhaustedException: If the request must be shed
+        """
+        max_delay = self.max_queue_delay
+        if max_delay is not None and queue_delay() > max_delay:
+            with self._lock:
+                self.rejected += 1
+            raise ResourceExhaustedException("Request waited too long in the server queue")
+
+        with self._lock:
+            if self.in_flight >= self.limit.current:
+                self.rejected += 1
+                raise ResourceExhaustedException(
+                    f"Concurrency limit of {self.limit.current} reached"
+                )
+            self.in_flight += 1
+            self.admitted += 1
+            in_flight = self.in_flight
+        return time.perf_counter(), in_flight
+
+    def release(self, token: tuple[float, int], dropped: bool) -> None:
+        """Mark an admitted request as finished and update the limit.
+
+        Args:
+            token: Value returned by :meth:`acquire`
+            dropped: Whether the request failed in a way that signals
+                overload (e.g. a 5xx status)
+        """
+        started, in_flight = token
+        latency = time.perf_counter() - started
+        with self._lock:
+            self.in_flight -= 1
+            self.limit.update(latency, in_flight, dropped)
+
+    def stats(self) -> dict[str, int]:
+        """Return the current limit and counters.
+
+        Returns:
+            Dictionary with limit, in_flight, admitted and rejected
+        """
+        with self._lock:
+            return {
+                "limit": self.limit.current,
+                "in_flight": self.in_flight,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+            }
+
+
+_queue_delay = threading.local()
+
+
+def queue_delay() -> float:
+    """Return how long the current RPC waited for a server thread.
+
+    Returns:
+        Seconds; 0.0 outside a :class:`QueueTimedExecutor` thread
+    """
+    return getattr(_queue_delay, "value", 0.0)
+
+
+class QueueTimedExecutor(ThreadPoolExecutor):
+    """Thread pool that records how long each task waited to start.
+
+    Used as the sync server's pool, so admission control can see the
+    queueing delay gRPC adds before ``Dispatch`` runs.
+    """
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        """Schedule ``fn`` and time its wait in the queue."""
+        submitted = time.perf_counter()
+
+        def timed() -> Any:
+            _queue_delay.value = time.perf_counter() - submitted
+            return fn(*args, **kwargs)
+
+        return super().submit(timed)
@@ -0,0 +1,154 @@
+"""Precompiled argument binders for route handlers."""
+
+from typing import Any, Callable, get_type_hints
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from .exceptions.exceptions import InvalidArgumentException
+
+
+Converter = Callable[[Any], Any]
+
+# Parameter annotations that receive the request's binary attachment
+BINARY_TYPES: tuple[type, ...] = (bytes, bytearray, memoryview)
+
+
+def is_pydantic_model(cls: Any) -> bool:
+    """Check if a class is a Pydantic model.
+
+    Args:
+        cls: Class to check
+
+    Returns:
+        True if it's a Pydantic model
+    """
+    return isinstance(cls, type) and issubclass(cls, BaseModel)
+
+
+class ArgumentBinder:
+    """Binds request data to the arguments of a route handler.
+
+    The handler annotations are inspected once, when the binder is
+    created, and turned into a plan of converters. Binding a request
+    only runs that plan, so no reflection happens per call.
+
+    Attributes:
+        func: Handler function the binder was compiled for
+        model_parameters: (name, validator) pairs built from the whole body
+        field_parameters: (name, converter) pairs read from a single body key
+        attachment_parameters: (name, type) pairs of ``bytes``,
+            ``bytearray`` and ``memoryview`` parameters, which receive the
+            request's binary attachment
+    """
+
+    __slots__ = ("func", "model_parameters", "field_parameters", "attachment_parameters")
+
+    def __init__(self, func: Callable) -> None:
+        """Compile the binding plan for a handler.
+
+        Args:
+            func: Handler function
+        """
+        self.func: Callable = func
+        model_parameters: list[tuple[str, Converter]] = []
+        field_parameters: list[tuple[str, Converter]] = []
+        attachment_parameters: list[tuple[str, Converter]] = []
+
+        for name, annotation in self._annotations(func).items():
+            # Skip 'return' annotation
+            if name == "return":
+                continue
+
+            if is_pydantic_model(annotation):
+                model_parameters.append((name, annotation.model_validate))
+            elif annotation in BINARY_TYPES:
+                attachment_parameters.append((name, annotation))
+            else:
+                field_parameters.append((name, self._converter(annotation)))
+
+        self.model_parameters: tuple[tuple[str, Converter], ...] = tuple(
+            model_parameters
+        )
+        self.field_parameters: tuple[tuple[str, Converter], ...] = tuple(
+            field_parameters
+        )
+        self.attachment_parameters: tuple[tuple[str, Converter], ...] = tuple(
+            attachment_parameters
+        )
+
+    @staticmethod
+    def _annotations(func: Callable) -> dict[str, Any]:
+        """Resolve the annotations of a handler.
+
+        Args:
+            func: Handler function
+
+        Returns:
+            Mapping of parameter name to resolved annotation
+        """
+        try:
+            return get_type_hints(func, include_extras=True)
+        except (NameError, TypeError):
+            # Unresolvable forward references: fall back to the raw values
+            return dict(getattr(func, "__annotations__", {}))
+
+    @staticmethod
+    def _converter(annotation: Any) -> Converter:
+        """Build the converter for a single body field.
+
+        Plain classes are called directly, as before. Anything else
+        (``Optional[int]``, ``list[str]``, ``Annotated`` ...) gets a
+        cached pydantic ``TypeAdapter``.
+
+        Args:
+            annotation: Parameter annotation
+
+        Returns:
+            Callable converting a raw body value
+        """
+        if isinstance(annotation, type):
+            return annotation
+        return TypeAdapter(annotation).validate_python
+
+    def bind(
+        self,
+        request_data: dict[str, Any],
+        path_params: dict[str, Any] | None = None,
+        attachment: bytes | None = None,
+    ) -> dict[str, Any]:
+        """Build handler arguments from request data.
+
+        Path parameters take precedence over body fields of the same name.
+        Binary parameters take a body field of their name if a codec sent
+        one, else the attachment: ``bytes`` as is, ``memoryview`` as a view
+        of it without copying.
+
+        Args:
+            request_data: Request body data as dictionary
+            path_params: Parameters captured from the URL template
+            attachment: Binary attachment of the request
+
+        Returns:
+            Dictionary of validated arguments
+
+        Raises:
+            InvalidArgumentException: If validation fails
+        """
+        func_params: dict[str, Any] = {}
+        try:
+            for name, validate in self.model_parameters:
+                func_params[name] = validate(request_data)
+            for name, convert in self.field_parameters:
+                if path_params and name in path_params:
+                    func_params[name] = convert(path_params[name])
+                elif name in request_data:
+                    func_params[name] = convert(request_data[name])
+            for name, convert in self.attachment_parameters:
+                if name in request_data:
+                    func_params[name] = convert(request_data[name])
+                elif attachment is not None:
+                    func_params[name] = convert(attachment)
+        except ValidationError as error:
+            error_details = error.json()
+            raise InvalidArgumentException(f"Validation failed:\n{error_details}")
+        return func_params
@@ -0,0 +1,155 @@
+"""Server-side response cache for idempotent routes."""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+from GrpcPluin.codec import get_codec
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Cache policy for a route.
+
+    Attributes:
+        maxsize: Maximum number of cached responses; least recently used
+            entries are evicted first
+        ttl: Seconds a response stays valid; None keeps it until evicted
+    """
+
+    maxsize: int = 1024
+    ttl: Optional[float] = None
+
+
+class ResponseCache:
+    """Bounded LRU cache of encoded responses with optional TTL.
+
+    Values are stored as built for the wire, so a hit skips binding,
+    the handler, response validation and encoding. All operations are
+    thread-safe.
+    """
+
+    def __init__(self, policy: CachePolicy) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            policy: Size and TTL limits
+        """
+        if policy.maxsize < 1:
+            raise ValueError("Cache maxsize must be at least 1")
+
+        self.policy: CachePolicy = policy
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return a cached value, or None on a miss or expired entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at >= time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        ttl = self.policy.ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else float("inf")
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.policy.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, predicate: Callable[[Hashable], bool] | None = None) -> int:
+        """Drop entries.
+
+        Args:
+            predicate: Called with each key; matching entries are dropped.
+                None drops everything.
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            if predicate is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                return dropped
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and the current size.
+
+        Returns:
+            Dictionary with hits, misses, evictions and size
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+
+
+def request_cache_key(request: Any) -> tuple[int, str, str, bytes, bytes]:
+    """Build the cache key of a request: method + url + canonical body.
+
+    Struct bodies are serialized deterministically, which sorts map keys,
+    so equal bodies give equal keys without decoding them. Codec payloads
+    are decoded and re-encoded with sorted keys, so the key order chosen
+    by the client does not matter either. Binary attachments are keyed on
+    their raw bytes.
+
+    Args:
+        request: gRPC request object
+
+    Returns:
+        Hashable cache key
+    """
+    if request.codec:
+        body = _canonical_payload(request.codec, request.payload)
+    else:
+        body = request.body.SerializeToString(deterministic=True)
+    return request.method, request.url, request.codec, body, request.attachment
+
+
+def _canonical_payload(codec: str, payload: bytes) -> bytes:
+    """Re-encode a codec payload as JSON with sorted keys.
+
+    Payloads that cannot be decoded or sorted, e.g. maps with keys of
+    mixed types, are keyed on their raw bytes.
+    """
+    try:
+        value = get_codec(codec).decode(payload)
+        return json.dumps(value, sort_keys=True, separators=(",", ":"), default=repr).encode()
+    except Exception:
+        return payload
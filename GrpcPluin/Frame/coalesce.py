@@ -0,0 +1,227 @@
+"""Single-flight coalescing of identical concurrent requests."""
+
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from GrpcPluin.deadline import CallAbandoned, current_call, effective_timeout
+
+from .exceptions.exceptions import UnavailableException
+
+# Failures that belong to the leader's own call: duplicates run again instead
+_PRIVATE_ERRORS = (CallAbandoned, asyncio.CancelledError)
+
+
+@dataclass(frozen=True)
+class CoalescePolicy:
+    """Coalescing policy for a route.
+
+    Attributes:
+        timeout: Seconds a duplicate waits for the leader's result; None
+            waits as long as the leader runs (or the duplicate's own
+            deadline allows)
+        run_on_timeout: After ``timeout``, run the handler for the
+            duplicate itself (True) or fail it with UNAVAILABLE (False)
+        share_errors: Give duplicates the leader's error (True), or let
+            them run again, one new leader at a time (False)
+    """
+
+    timeout: Optional[float] = None
+    run_on_timeout: bool = True
+    share_errors: bool = True
+
+
+class _Flight:
+    """One execution in progress, whose outcome its duplicates wait for."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done: threading.Event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class RequestCoalescer:
+    """Runs one execution per key at a time and shares its outcome.
+
+    The first request for a key (the leader) runs the handler; identical
+    requests arriving meanwhile wait for its result instead of running
+    the handler again. Nothing is kept once the leader finishes, so unlike
+    a cache no result is ever stale. All operations are thread-safe;
+    :meth:`run_async` must always be called from the same event loop.
+    """
+
+    def __init__(self, policy: CoalescePolicy) -> None:
+        """Initialize the coalescer.
+
+        Args:
+            policy: Timeout and error handling of duplicates
+        """
+        if policy.timeout is not None and policy.timeout < 0:
+            raise ValueError("Coalescing timeout must not be negative")
+
+        self.policy: CoalescePolicy = policy
+        self._flights: dict[Hashable, _Flight] = {}
+        self._futures: dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.executions: int = 0
+        self.coalesced: int = 0
+        self.timeouts: int = 0
+
+    def run(self, key: Hashable, produce: Callable[[], Any]) -> Any:
+        """Run ``produce`` unless an identical request is already running it.
+
+        Args:
+            key: Identity of the request
+            produce: Computes the result
+
+        Returns:
+            The result of this call's or the leader's execution
+
+        Raises:
+            UnavailableException: If waiting timed out and the policy does
+                not run the handler then
+        """
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                if flight is None:
+                    flight = self._flights[key] = _Flight()
+                    self.executions += 1
+                    leader = True
+                else:
+                    leader = False
+
+            if leader:
+                return self._lead(key, flight, produce)
+
+            if not flight.done.wait(effective_timeout(self.policy.timeout)):
+                return self._timed_out(produce)
+            if self._shared(flight.error):
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+
+    async def run_async(self, key: Hashable, produce: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``produce`` unless an identical request is already awaiting it.
+
+        Args:
+            key: Identity of the request
+            produce: Coroutine function computing the result
+
+        Returns:
+            The result of this call's or the leader's execution
+
+        Raises:
+            UnavailableException: If waiting timed out and the policy does
+                not run the handler then
+        """
+        while True:
+            future = self._futures.get(key)
+            if future is None:
+                return await self._lead_async(key, produce)
+
+            try:
+                result, error = await asyncio.wait_for(
+                    asyncio.shield(future), effective_timeout(self.policy.timeout)
+                )
+            except asyncio.TimeoutError:
+                return await self._timed_out_async(produce)
+            if self._shared(error):
+                if error is not None:
+                    raise error
+                return result
+
+    def _lead(self, key: Hashable, flight: _Flight, produce: Callable[[], Any]) -> Any:
+        """Run the execution of a key and publish its outcome."""
+        try:
+            flight.result = produce()
+            return flight.result
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def _lead_async(self, key: Hashable, produce: Callable[[], Awaitable[Any]]) -> Any:
+        """Await the execution of a key and publish its outcome.
+
+        The future always receives a (result, error) pair, so a cancelled
+        leader is never mistaken for a cancelled duplicate.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._futures[key] = future
+        with self._lock:
+            self.executions += 1
+        result, error = None, None
+        try:
+            result = await produce()
+            return result
+        except BaseException as raised:
+            error = raised
+            raise
+        finally:
+            del self._futures[key]
+            future.set_result((result, error))
+
+    def _shared(self, error: BaseException | None) -> bool:
+        """Decide whether a duplicate takes the leader's outcome.
+
+        Args:
+            error: Exception raised by the leader, if any
+
+        Returns:
+            True to return or raise the leader's outcome, False to retry
+        """
+        if error is not None and (
+            isinstance(error, _PRIVATE_ERRORS) or not self.policy.share_errors
+        ):
+            return False
+        with self._lock:
+            self.coalesced += 1
+        return True
+
+    def _give_up(self) -> None:
+        """Handle a duplicate that stopped waiting for its leader.
+
+        Raises:
+            CallAbandoned: If the duplicate's own deadline passed
+            UnavailableException: If the policy does not run the handler
+        """
+        with self._lock:
+            self.timeouts += 1
+        call = current_call()
+        if call is not None:
+            call.check()
+        if not self.policy.run_on_timeout:
+            raise UnavailableException("Timed out waiting for an identical request")
+
+    def _timed_out(self, produce: Callable[[], Any]) -> Any:
+        """Serve a duplicate that stopped waiting for its leader."""
+        self._give_up()
+        return produce()
+
+    async def _timed_out_async(self, produce: Callable[[], Awaitable[Any]]) -> Any:
+        """Serve a duplicate that stopped waiting for its leader."""
+        self._give_up()
+        return await produce()
+
+    def stats(self) -> dict[str, int]:
+        """Return coalescing counters.
+
+        Returns:
+            Dictionary with executions (handler runs by leaders), coalesced
+            (requests served by another request's execution), timeouts and
+            in_flight (keys being executed right now)
+        """
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "timeouts": self.timeouts,
+                "in_flight": len(self._flights) + len(self._futures),
+            }
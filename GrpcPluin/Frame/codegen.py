@@ -0,0 +1,611 @@
+"""Typed protobuf schema generated from the registered routes.
+
+Every route becomes an RPC of the ``Routes`` service. Its request message
+holds the route's path parameters and body fields, typed from the
+handler's annotations and pydantic models; its response message is the
+route's ``response_model``, or a ``google.protobuf.Struct`` for routes
+without one. Generator handlers get server-streaming RPCs.
+
+Field types are read from the pydantic JSON schemas:
+
+* integers, numbers, strings and booleans become int64, double, string and
+  bool fields; singular fields are ``optional``, so a missing value stays
+  missing instead of turning into 0 or ""
+* lists become ``repeated`` fields and ``dict[str, X]`` becomes a ``map``
+* nested models become messages of their own
+* anything else (unions, ``Any``, lists of lists, ...) is carried in a
+  ``google.protobuf.Value``
+
+Field numbers follow the declaration order, so clients must use the schema
+of the server they call: Python clients fetch it through the ``Schema``
+RPC. ``python -m GrpcPluin.Frame.codegen app.module:router`` prints the
+``.proto`` file, e.g. to generate clients in other languages.
+"""
+
+import argparse
+import importlib
+import inspect
+import json
+import logging
+import re
+import sys
+from dataclasses import dataclass
+from typing import Any, Iterator, get_args
+
+from google.protobuf import descriptor_pb2
+from pydantic import TypeAdapter
+from pydantic_core import to_jsonable_python
+
+from GrpcPluin.codec import Codec
+from GrpcPluin.schema import TypedRoute, TypedSchema
+
+from .binder import BINARY_TYPES, ArgumentBinder
+from .enums import FunctionDetails
+from .router import GrpcRouter
+
+logger = logging.getLogger(__name__)
+
+PACKAGE = "grpcplugin.routes"
+SERVICE = "Routes"
+
+_Field = descriptor_pb2.FieldDescriptorProto
+
+_SCALARS: dict[str, int] = {
+    "integer": _Field.TYPE_INT64,
+    "number": _Field.TYPE_DOUBLE,
+    "string": _Field.TYPE_STRING,
+    "boolean": _Field.TYPE_BOOL,
+}
+
+# JSON schema of the values each path parameter converter produces
+_PATH_PARAM_SCHEMAS: dict[str, dict[str, str]] = {
+    "int": {"type": "integer"},
+    "float": {"type": "number"},
+    "str": {"type": "string"},
+}
+
+_PATH_PARAM = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)(?::([A-Za-z_]+))?\}")
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+_STRUCT = ".google.protobuf.Struct"
+_VALUE = ".google.protobuf.Value"
+
+# (type, type_name) of a field, before its label
+_Kind = tuple[int, str]
+
+
+class UnsupportedRoute(ValueError):
+    """Raised when a route cannot be described with protobuf messages."""
+
+
+@dataclass
+class GeneratedRoute:
+    """A route and the typed RPC generated for it.
+
+    Attributes:
+        method: HTTP method
+        url: URL template
+        details: Registered route
+        rpc: Full gRPC method name; empty if the route could not be typed
+        streaming: Whether the RPC streams its responses
+    """
+
+    method: str
+    url: str
+    details: FunctionDetails
+    rpc: str = ""
+    streaming: bool = False
+
+
+@dataclass
+class GeneratedSchema:
+    """Typed service generated from a router.
+
+    Attributes:
+        file: Descriptor of the generated ``.proto`` file
+        service: Full name of the generated service
+        routes: Every route of the router, typed or not
+    """
+
+    file: descriptor_pb2.FileDescriptorProto
+    service: str
+    routes: list[GeneratedRoute]
+
+    @property
+    def descriptor(self) -> bytes:
+        """Serialized file descriptor, identical for identical routers."""
+        return self.file.SerializeToString(deterministic=True)
+
+    def typed_schema(self) -> TypedSchema:
+        """Build the message classes of the schema.
+
+        Returns:
+            Typed schema whose routes are in the order of :attr:`routes`
+        """
+        return TypedSchema(
+            self.descriptor,
+            [(route.method, route.url, route.rpc, route.streaming) for route in self.routes],
+        )
+
+    def to_proto(self) -> str:
+        """Render the schema as ``.proto`` source.
+
+        Returns:
+            Contents of the ``.proto`` file
+        """
+        return _ProtoRenderer(self).render()
+
+
+def build_schema(router: GrpcRouter, package: str = PACKAGE) -> GeneratedSchema:
+    """Generate the typed service of a router's routes.
+
+    Routes whose types cannot be described (e.g. a body field whose name is
+    not a valid identifier) are logged and left without a typed RPC; they
+    stay reachable through ``Dispatch``.
+
+    Args:
+        router: Router whose routes are described
+        package: Protobuf package of the generated messages and service
+
+    Returns:
+        Generated schema
+    """
+    builder = _SchemaBuilder(package)
+    routes = []
+    for method, method_routes in router.routes.items():
+        for url, details in method_routes.items():
+            route = GeneratedRoute(method=method, url=url, details=details)
+            try:
+                route.rpc, route.streaming = builder.add_route(method, url, details, router)
+            except UnsupportedRoute as error:
+                logger.warning(f"No typed RPC for {method} {url}: {error}")
+            routes.append(route)
+    return GeneratedSchema(
+        file=builder.file, service=f"{package}.{SERVICE}", routes=routes
+    )
+
+
+def route_codec(route: TypedRoute) -> Codec:
+    """Build the payload codec of a typed route.
+
+    The generic request pipeline decodes the typed request and encodes the
+    handler result with it, so typed calls get routing, validation,
+    caching and metrics exactly like ``Dispatch``.
+
+    Args:
+        route: Typed route
+
+    Returns:
+        Codec named after the route's RPC
+    """
+    request = route.request
+    response = route.response
+    return Codec(
+        f"proto:{route.rpc}",
+        lambda data: response.encode(to_jsonable_python(data)),
+        request.decode,
+    )
+
+
+class _SchemaBuilder:
+    """Accumulates the messages and RPCs of a generated file."""
+
+    def __init__(self, package: str) -> None:
+        """Start an empty file.
+
+        Args:
+            package: Protobuf package of the file
+        """
+        self.package: str = package
+        self.file = descriptor_pb2.FileDescriptorProto(
+            name=f"{package.replace('.', '/')}.proto",
+            package=package,
+            syntax="proto3",
+            dependency=["google/protobuf/struct.proto"],
+        )
+        self.service = self.file.service.add(name=SERVICE)
+        # Canonical JSON schema of a model -> full name of its message
+        self._models: dict[str, str] = {}
+        self._names: set[str] = set()
+
+    def add_route(
+        self, method: str, url: str, details: FunctionDetails, router: GrpcRouter
+    ) -> tuple[str, bool]:
+        """Add the RPC of a route.
+
+        Args:
+            method: HTTP method
+            url: URL template
+            details: Registered route
+            router: Router the route belongs to
+
+        Returns:
+            (full gRPC method name, whether it streams)
+
+        Raises:
+            UnsupportedRoute: If the route's types cannot be described
+        """
+        func_name = _camel(details.func.__name__)
+        methods = [
+            name for name, routes in router.routes.items() if routes.get(url) is details
+        ]
+        rpc_name = self._unique(func_name if len(methods) == 1 else method.title() + func_name)
+
+        # Build the messages in a scratch file, so a failure leaves no trace
+        scratch = _SchemaBuilder(self.package)
+        scratch._models = dict(self._models)
+        scratch._names = set(self._names)
+        request_type = scratch._request_message(rpc_name, url, details)
+        response_type = scratch._response_message(details)
+
+        self.file.message_type.extend(scratch.file.message_type)
+        self._models = scratch._models
+        self._names = scratch._names | {rpc_name}
+        streaming = inspect.isgeneratorfunction(details.func) or details.is_async_generator
+        self.service.method.add(
+            name=rpc_name,
+            input_type=request_type,
+            output_type=response_type,
+            server_streaming=streaming,
+        )
+        return f"/{self.package}.{SERVICE}/{rpc_name}", streaming
+
+    def _request_message(self, rpc_name: str, url: str, details: FunctionDetails) -> str:
+        """Add the request message of a route: path parameters, then body fields."""
+        if details.binder.attachment_parameters:
+            raise UnsupportedRoute("binary attachments are only sent through Dispatch")
+        properties: dict[str, tuple[dict[str, Any], dict[str, Any]]] = {}
+        for name, converter in _PATH_PARAM.findall(url):
+            properties[name] = (_PATH_PARAM_SCHEMAS.get(converter or "str", {}), {})
+
+        annotations = ArgumentBinder._annotations(details.func)
+        for name, _ in details.binder.field_parameters:
+            if name not in properties:
+                schema = TypeAdapter(annotations[name]).json_schema()
+                properties[name] = (schema, schema.get("$defs", {}))
+        for _, validate in details.binder.model_parameters:
+            schema = validate.__self__.model_json_schema()
+            for name, field_schema in schema.get("properties", {}).items():
+                properties.setdefault(name, (field_schema, schema.get("$defs", {})))
+
+        message = self._add_message(f"{rpc_name}Request")
+        for number, (name, (schema, defs)) in enumerate(properties.items(), start=1):
+            self._add_field(message, name, number, schema, defs)
+        return f".{self.package}.{message.name}"
+
+    def _response_message(self, details: FunctionDetails) -> str:
+        """Add the response message of a route, if it has a response model."""
+        returns = ArgumentBinder._annotations(details.func).get("return")
+        if returns in BINARY_TYPES or any(arg in BINARY_TYPES for arg in get_args(returns)):
+            raise UnsupportedRoute("binary responses are only sent through Dispatch")
+        if details.response_model is None:
+            return _STRUCT
+        schema = details.response_model.model_json_schema(
+            by_alias=False, mode="serialization"
+        )
+        return self._model(details.response_model.__name__, schema, schema.get("$defs", {}))
+
+    def _model(self, name: str, schema: dict[str, Any], defs: dict[str, Any]) -> str:
+        """Add the message of a model, reusing identical ones.
+
+        Returns:
+            Full name of the message
+        """
+        key = json.dumps([schema, _referenced(schema, defs)], sort_keys=True, default=str)
+        full_name = self._models.get(key)
+        if full_name is not None:
+            return full_name
+
+        message = self._add_message(self._unique(_camel(name)))
+        full_name = self._models[key] = f".{self.package}.{message.name}"
+        for number, (field_name, field_schema) in enumerate(
+            schema.get("properties", {}).items(), start=1
+        ):
+            self._add_field(message, field_name, number, field_schema, defs)
+        return full_name
+
+    def _add_message(self, name: str) -> descriptor_pb2.DescriptorProto:
+        """Add an empty top-level message."""
+        self._names.add(name)
+        return self.file.message_type.add(name=name)
+
+    def _unique(self, name: str) -> str:
+        """Return ``name``, numbered if a message or RPC already uses it."""
+        candidate, number = name, 2
+        while candidate in self._names or candidate + "Request" in self._names:
+            candidate, number = f"{name}{number}", number + 1
+        return candidate
+
+    def _add_field(
+        self,
+        message: descriptor_pb2.DescriptorProto,
+        name: str,
+        number: int,
+        schema: dict[str, Any],
+        defs: dict[str, Any],
+    ) -> None:
+        """Add the field described by a JSON schema to a message.
+
+        Raises:
+            UnsupportedRoute: If the field name is not a valid identifier
+        """
+        if not _IDENTIFIER.match(name):
+            raise UnsupportedRoute(f"field name {name!r} is not a valid identifier")
+
+        field = message.field.add(name=name, number=number)
+        schema = _non_null(_resolve(schema, defs))
+        if schema.get("type") == "array":
+            kind = self._single(schema.get("items", {}), defs, message, name)
+            if kind is not None:
+                field.label = _Field.LABEL_REPEATED
+                _set_kind(field, kind)
+                return
+            field.label = _Field.LABEL_OPTIONAL
+            _set_kind(field, (_Field.TYPE_MESSAGE, _VALUE))
+            return
+
+        field.label = _Field.LABEL_OPTIONAL
+        map_entry = self._map_entry(schema, defs, message, name)
+        if map_entry is not None:
+            field.label = _Field.LABEL_REPEATED
+            _set_kind(field, (_Field.TYPE_MESSAGE, map_entry))
+            return
+
+        _set_kind(
+            field, self._single(schema, defs, message, name) or (_Field.TYPE_MESSAGE, _VALUE)
+        )
+        if field.type != _Field.TYPE_MESSAGE:
+            # Explicit presence: an unset field is left out, not sent as 0
+            field.proto3_optional = True
+            field.oneof_index = len(message.oneof_decl)
+            message.oneof_decl.add(name=f"_{name}")
+
+    def _single(
+        self,
+        schema: dict[str, Any],
+        defs: dict[str, Any],
+        message: descriptor_pb2.DescriptorProto,
+        name: str,
+    ) -> _Kind | None:
+        """Return the type of one value, or None if it needs a repeated field."""
+        ref = schema.get("$ref")
+        schema = _non_null(_resolve(schema, defs))
+        if schema.get("type") == "array" or self._is_map(schema, defs):
+            return None
+        if "properties" in schema:
+            model_name = ref.rsplit("/", 1)[-1] if ref else schema.get("title", name)
+            return _Field.TYPE_MESSAGE, self._model(model_name, schema, defs)
+        if schema.get("type") == "object":
+            return _Field.TYPE_MESSAGE, _STRUCT
+
+        json_type = schema.get("type")
+        if json_type is None and "enum" in schema:
+            json_type = _enum_type(schema["enum"])
+        if json_type in _SCALARS:
+            return _SCALARS[json_type], ""
+        return _Field.TYPE_MESSAGE, _VALUE
+
+    def _is_map(self, schema: dict[str, Any], defs: dict[str, Any]) -> bool:
+        """Check whether a schema is a ``dict[str, X]`` with a map-able X."""
+        values = schema.get("additionalProperties")
+        if schema.get("type") != "object" or "properties" in schema:
+            return False
+        if not isinstance(values, dict) or not values:
+            return False
+        values = _non_null(_resolve(values, defs))
+        return values.get("type") != "array" and not (
+            values.get("type") == "object" and "properties" not in values
+        )
+
+    def _map_entry(
+        self,
+        schema: dict[str, Any],
+        defs: dict[str, Any],
+        message: descriptor_pb2.DescriptorProto,
+        name: str,
+    ) -> str | None:
+        """Add the entry type of a map field, if the schema is a map."""
+        if not self._is_map(schema, defs):
+            return None
+        value_kind = self._single(schema["additionalProperties"], defs, message, name)
+        entry = message.nested_type.add(name=f"{_camel(name)}Entry")
+        entry.options.map_entry = True
+        entry.field.add(
+            name="key", number=1, type=_Field.TYPE_STRING, label=_Field.LABEL_OPTIONAL
+        )
+        value = entry.field.add(name="value", number=2, label=_Field.LABEL_OPTIONAL)
+        _set_kind(value, value_kind)
+        return f".{self.package}.{message.name}.{entry.name}"
+
+
+def _set_kind(field: descriptor_pb2.FieldDescriptorProto, kind: _Kind) -> None:
+    """Set the type of a field; scalars must leave ``type_name`` unset."""
+    field.type = kind[0]
+    if kind[1]:
+        field.type_name = kind[1]
+
+
+def _resolve(schema: dict[str, Any], defs: dict[str, Any]) -> dict[str, Any]:
+    """Follow a ``$ref`` to its definition."""
+    ref = schema.get("$ref")
+    if ref is None:
+        return schema
+    return defs.get(ref.rsplit("/", 1)[-1], {})
+
+
+def _non_null(schema: dict[str, Any]) -> dict[str, Any]:
+    """Unwrap ``Optional[X]``: proto fields express null by being unset."""
+    options = schema.get("anyOf")
+    if options is None:
+        return schema
+    values = [option for option in options if option.get("type") != "null"]
+    if len(values) == 1 and len(options) == 2:
+        return values[0]
+    return {}
+
+
+def _enum_type(values: list[Any]) -> str | None:
+    """Return the JSON type shared by every value of an enum."""
+    if all(isinstance(value, str) for value in values):
+        return "string"
+    if all(isinstance(value, int) and not isinstance(value, bool) for value in values):
+        return "integer"
+    return None
+
+
+def _referenced(schema: Any, defs: dict[str, Any]) -> dict[str, Any]:
+    """Collect the definitions a schema refers to, directly or not."""
+    found: dict[str, Any] = {}
+    pending = [schema]
+    while pending:
+        node = pending.pop()
+        for ref in _refs(node):
+            name = ref.rsplit("/", 1)[-1]
+            if name not in found and name in defs:
+                found[name] = defs[name]
+                pending.append(defs[name])
+    return found
+
+
+def _refs(node: Any) -> Iterator[str]:
+    """Yield every ``$ref`` inside a JSON schema node."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "$ref" and isinstance(value, str):
+                yield value
+            elif key != "$defs":
+                yield from _refs(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _refs(item)
+
+
+def _camel(name: str) -> str:
+    """Turn a Python or model name into a protobuf message name."""
+    words = re.split(r"[^A-Za-z0-9]+", name)
+    camel = "".join(word[:1].upper() + word[1:] for word in words if word)
+    if not camel or camel[0].isdigit():
+        camel = "M" + camel
+    return camel
+
+
+_SCALAR_NAMES: dict[int, str] = {
+    _Field.TYPE_INT64: "int64",
+    _Field.TYPE_DOUBLE: "double",
+    _Field.TYPE_STRING: "string",
+    _Field.TYPE_BOOL: "bool",
+    _Field.TYPE_BYTES: "bytes",
+}
+
+
+class _ProtoRenderer:
+    """Writes a generated schema as ``.proto`` source."""
+
+    def __init__(self, schema: GeneratedSchema) -> None:
+        """Initialize the renderer.
+
+        Args:
+            schema: Generated schema to render
+        """
+        self.schema: GeneratedSchema = schema
+        self.package: str = schema.file.package
+
+    def render(self) -> str:
+        """Return the ``.proto`` source."""
+        file = self.schema.file
+        lines = [
+            "// Generated by GrpcPluin.Frame.codegen from the registered routes.",
+            'syntax = "proto3";',
+            "",
+            f"package {self.package};",
+            "",
+            'import "google/protobuf/struct.proto";',
+            "",
+        ]
+        rpcs = {
+            route.rpc.rsplit("/", 1)[-1]: route for route in self.schema.routes if route.rpc
+        }
+        for service in file.service:
+            lines.append(f"service {service.name} {{")
+            for method in service.method:
+                route = rpcs.get(method.name)
+                if route is not None:
+                    lines.append(f"    // {route.method} {route.url}")
+                stream = "stream " if method.server_streaming else ""
+                lines.append(
+                    f"    rpc {method.name}({self._type(method.input_type)}) "
+                    f"returns ({stream}{self._type(method.output_type)});"
+                )
+            lines.extend(["}", ""])
+
+        for message in file.message_type:
+            lines.extend(self._message(message))
+        return "\n".join(lines)
+
+    def _message(self, message: descriptor_pb2.DescriptorProto) -> list[str]:
+        """Render a message; map entry types become ``map<>`` fields."""
+        entries = {
+            f".{self.package}.{message.name}.{nested.name}": nested
+            for nested in message.nested_type
+            if nested.options.map_entry
+        }
+        lines = [f"message {message.name} {{"]
+        for field in message.field:
+            entry = entries.get(field.type_name)
+            if entry is not None:
+                key, value = entry.field
+                field_type = f"map<{self._field_type(key)}, {self._field_type(value)}>"
+            elif field.label == _Field.LABEL_REPEATED:
+                field_type = f"repeated {self._field_type(field)}"
+            elif field.proto3_optional:
+                field_type = f"optional {self._field_type(field)}"
+            else:
+                field_type = self._field_type(field)
+            lines.append(f"    {field_type} {field.name} = {field.number};")
+        lines.extend(["}", ""])
+        return lines
+
+    def _field_type(self, field: descriptor_pb2.FieldDescriptorProto) -> str:
+        """Return the type of a field as written in ``.proto`` source."""
+        if field.type == _Field.TYPE_MESSAGE:
+            return self._type(field.type_name)
+        return _SCALAR_NAMES[field.type]
+
+    def _type(self, type_name: str) -> str:
+        """Shorten a fully qualified message name relative to the package."""
+        prefix = f".{self.package}."
+        if type_name.startswith(prefix):
+            return type_name[len(prefix):]
+        return type_name.lstrip(".")
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Print the ``.proto`` file of a router's typed service.
+
+    Args:
+        argv: Command line arguments (default: ``sys.argv[1:]``)
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m GrpcPluin.Frame.codegen",
+        description="Generate the typed .proto of the routes registered on a router.",
+    )
+    parser.add_argument(
+        "router",
+        help="router to describe, as module:attribute (default attribute: router)",
+    )
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    parser.add_argument("--package", default=PACKAGE, help="protobuf package name")
+    args = parser.parse_args(argv)
+
+    module_name, _, attribute = args.router.partition(":")
+    router = getattr(importlib.import_module(module_name), attribute or "router")
+    source = build_schema(router, args.package).to_proto()
+    if args.output is None:
+        sys.stdout.write(source)
+        return
+    with open(args.output, "w") as output:
+        output.write(source)
+
+
+if __name__ == "__main__":
+    main()
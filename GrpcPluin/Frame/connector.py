@@ -1,12 +1,23 @@
 """Connector for setting up gRPC server."""
 
-from dataclasses import dataclass
-from typing import Any, Callable, TypeVar
+import asyncio
+import json
+import os
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Callable, Optional, Sequence, TypeVar
 
 import grpc
 from grpc._channel import Channel  # type: ignore
 from grpc._server import _Server  # type: ignore
 
+from .admission import QueueTimedExecutor
+from .prefork import Supervisor, on_shutdown_signal
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None  # type: ignore[assignment]
+
 
 T = TypeVar("T")
 
@@ -43,6 +54,19 @@ class GrpcComposer:
         """
         self.service_provider(self.servicer, server)
 
+    def warm_up(self, configs: "GrpcConfigs | None" = None, processes: int = 1) -> None:
+        """Let the servicer apply the configs and prepare its executors.
+
+        Does nothing for servicers without a ``warm_up`` method.
+
+        Args:
+            configs: Server configuration
+            processes: Server processes started by ``install_app``
+        """
+        warm_up = getattr(self.servicer, "warm_up", None)
+        if warm_up is not None:
+            warm_up(configs, processes)
+
     def get_stub(self, channel: Channel) -> Any:
         """Create a stub from a channel.
 
@@ -69,48 +93,366 @@ class GrpcComposer:
 
 @dataclass
 class GrpcConfigs:
-    """Configuration for gRPC server."""
+    """Configuration for gRPC server.
+
+    Tuning fields left as None keep the gRPC defaults. Configs can be
+    built in code, from environment variables (:meth:`from_env`) or from a
+    JSON/TOML file (:meth:`from_file`).
+
+    Attributes:
+        server_uri: Address to listen on (host:port or unix:path)
+        workers: Thread pool size of the sync server
+        maximum_concurrent_rpcs: Cap on in-flight RPCs; extra calls are
+            rejected with RESOURCE_EXHAUSTED
+        max_send_message_length: Largest response message in bytes
+        max_receive_message_length: Largest request message in bytes
+        keepalive_time_ms: Interval between keepalive pings
+        keepalive_timeout_ms: Time to wait for a keepalive ack
+        keepalive_permit_without_calls: Allow keepalive pings on idle
+            connections
+        http2_min_recv_ping_interval_ms: Minimum interval between client
+            pings the server accepts
+        http2_stream_window_bytes: Initial HTTP/2 flow-control window of
+            each stream
+        http2_bdp_probe: Let gRPC grow flow-control windows by probing
+            bandwidth-delay product
+        so_reuseport: Allow several processes to bind the same port
+        shutdown_grace: Seconds in-flight calls get to finish after
+            SIGTERM/SIGINT before the server stops
+        process_workers: Size of the router's process pool in each server
+            process, unless the pool was created with one; None shares
+            the CPUs among the server processes
+        batch_workers: Items of a parallel batch run at once (manager
+            default: 10)
+        max_batch_items: Largest batch accepted; larger ones fail with
+            INVALID_ARGUMENT (manager default: 1000)
+        options: Extra raw gRPC channel arguments
+    """
+
+    server_uri: str = "0.0.0.0:50052"
+    workers: int = 10
+    maximum_concurrent_rpcs: Optional[int] = None
+    max_send_message_length: Optional[int] = None
+    max_receive_message_length: Optional[int] = None
+    keepalive_time_ms: Optional[int] = None
+    keepalive_timeout_ms: Optional[int] = None
+    keepalive_permit_without_calls: Optional[bool] = None
+    http2_min_recv_ping_interval_ms: Optional[int] = None
+    http2_stream_window_bytes: Optional[int] = None
+    http2_bdp_probe: Optional[bool] = None
+    so_reuseport: Optional[bool] = None
+    shutdown_grace: float = 10.0
+    process_workers: Optional[int] = None
+    batch_workers: Optional[int] = None
+    max_batch_items: Optional[int] = None
+    options: list[tuple[str, Any]] = field(default_factory=list)
+
+    def process_pool_size(self, processes: int) -> int:
+        """Return the process pool size of each of ``processes`` servers.
+
+        Args:
+            processes: Server processes started by ``install_app``
+
+        Returns:
+            ``process_workers`` if set, else the CPUs divided among the
+            server processes, at least 1
+        """
+        if self.process_workers is not None:
+            return self.process_workers
+        return max(1, (os.cpu_count() or 1) // processes)
+
+    def server_options(self) -> list[tuple[str, Any]]:
+        """Translate the tuning fields into gRPC server arguments.
+
+        Returns:
+            List of (argument, value) pairs for ``grpc.server``
+        """
+        options: list[tuple[str, Any]] = []
+        for name, argument in _SERVER_ARGUMENTS.items():
+            value = getattr(self, name)
+            if value is not None:
+                options.append((argument, int(value)))
+        return options + list(self.options)
+
+    @classmethod
+    def from_env(cls, prefix: str = "GRPCPLUGIN_", **defaults: Any) -> "GrpcConfigs":
+        """Build configs from environment variables.
 
-    server_uri: str
+        Each field is read from ``<prefix><FIELD NAME>``, e.g.
+        ``GRPCPLUGIN_WORKERS=32``. ``options`` is read as a JSON list of
+        [name, value] pairs.
+
+        Args:
+            prefix: Environment variable prefix
+            **defaults: Values used for variables that are not set
+
+        Returns:
+            Server configuration
+
+        Raises:
+            ValueError: If a variable cannot be parsed
+        """
+        values = dict(defaults)
+        for config_field in fields(cls):
+            raw = os.environ.get(f"{prefix}{config_field.name.upper()}")
+            if raw is not None:
+                values[config_field.name] = _parse_env(config_field.name, raw)
+        return cls(**values)
+
+    @classmethod
+    def from_file(cls, path: str) -> "GrpcConfigs":
+        """Build configs from a JSON or TOML file.
+
+        The file holds the field names as top-level keys; a TOML file may
+        also keep them in a ``[grpc]`` table.
+
+        Args:
+            path: Path to a ``.json`` or ``.toml`` file
+
+        Returns:
+            Server configuration
+
+        Raises:
+            ValueError: If the file has unknown keys or an unsupported type
+        """
+        if path.endswith(".toml"):
+            if tomllib is None:
+                raise ValueError("TOML configs need Python 3.11+ (tomllib)")
+            with open(path, "rb") as config_file:
+                values = tomllib.load(config_file)
+            values = values.get("grpc", values)
+        elif path.endswith(".json"):
+            with open(path) as config_file:
+                values = json.load(config_file)
+        else:
+            raise ValueError(f"Unsupported config file type: {path}")
+
+        unknown = set(values) - {config_field.name for config_field in fields(cls)}
+        if unknown:
+            raise ValueError(f"Unknown config keys in {path}: {sorted(unknown)}")
+        if "options" in values:
+            values["options"] = [tuple(option) for option in values["options"]]
+        return cls(**values)
+
+
+# GrpcConfigs fields and the gRPC arguments they set
+_SERVER_ARGUMENTS: dict[str, str] = {
+    "max_send_message_length": "grpc.max_send_message_length",
+    "max_receive_message_length": "grpc.max_receive_message_length",
+    "keepalive_time_ms": "grpc.keepalive_time_ms",
+    "keepalive_timeout_ms": "grpc.keepalive_timeout_ms",
+    "keepalive_permit_without_calls": "grpc.keepalive_permit_without_calls",
+    "http2_min_recv_ping_interval_ms": "grpc.http2.min_ping_interval_without_data_ms",
+    "http2_stream_window_bytes": "grpc.http2.lookahead_bytes",
+    "http2_bdp_probe": "grpc.http2.bdp_probe",
+    "so_reuseport": "grpc.so_reuseport",
+}
+
+
+def _parse_env(name: str, raw: str) -> Any:
+    """Convert an environment variable to the type of a GrpcConfigs field."""
+    if name == "server_uri":
+        return raw
+    if name == "options":
+        return [tuple(option) for option in json.loads(raw)]
+    if raw.lower() in ("true", "yes", "on"):
+        return True
+    if raw.lower() in ("false", "no", "off"):
+        return False
+    for convert in (int, float):
+        try:
+            return convert(raw)
+        except ValueError:
+            pass
+    raise ValueError(f"Invalid value for {name}: {raw!r}")
+
+
+def _prefork(
+    connect: Callable[[], None],
+    configs: GrpcConfigs,
+    workers: int,
+    cpu_affinity: bool | Sequence[int],
+) -> None:
+    """Serve from ``workers`` forked processes sharing one port.
+
+    Args:
+        connect: Builds and runs one server until it is stopped
+        configs: Server configuration; must listen on a TCP port
+        workers: Number of worker processes
+        cpu_affinity: CPU pinning, see :class:`Supervisor`
+    """
+    if configs.server_uri.startswith("unix:"):
+        raise ValueError("Multi-process serving needs a TCP address, not a unix socket")
+    if configs.so_reuseport is False:
+        raise ValueError("Multi-process serving needs so_reuseport")
+    Supervisor(
+        serve=lambda index: connect(),
+        workers=workers,
+        cpu_affinity=cpu_affinity,
+        grace=configs.shutdown_grace,
+    ).run()
 
 
 class GrpcConnector:
     """Connector for managing gRPC server lifecycle.
 
     This class handles the setup and startup of a gRPC server,
-    registering services and managing the server process.
+    registering services and managing the server process. The server is
+    built from the configs in :meth:`install_app`, unless one is given.
     """
 
     def __init__(
         self,
-        server: _Server,
-        composers: list[GrpcComposer],
-        configs: GrpcConfigs,
+        server: _Server | None = None,
+        composers: list[GrpcComposer] | None = None,
+        configs: GrpcConfigs | None = None,
     ) -> None:
         """Initialize the gRPC connector.
 
+        The parameters keep their original order, so positional
+        ``(server, composers, configs)`` calls still work.
+
         Args:
-            server: gRPC server instance
+            server: Prebuilt gRPC server; the tuning fields of ``configs``
+                are ignored when it is given (default: built from
+                ``configs`` in :meth:`install_app`)
             composers: List of service composers
-            configs: Server configuration
+            configs: Server configuration (default: :class:`GrpcConfigs`)
+
+        Raises:
+            TypeError: If no composers are given
         """
-        self.server: _Server = server
+        if composers is None:
+            raise TypeError("GrpcConnector requires composers")
         self.composers: list[GrpcComposer] = composers
-        self.configs: GrpcConfigs = configs
+        self.configs: GrpcConfigs = configs if configs is not None else GrpcConfigs()
+        self.server: _Server | None = server
+
+    def _build_server(self) -> _Server:
+        """Create the sync server described by the configs."""
+        return grpc.server(
+            QueueTimedExecutor(max_workers=self.configs.workers),
+            options=self.configs.server_options(),
+            maximum_concurrent_rpcs=self.configs.maximum_concurrent_rpcs,
+        )
+
+    def _connect(self, processes: int = 1) -> None:
+        """Register services and start the server.
+
+        Args:
+            processes: Server processes sharing the machine
+        """
+        if self.server is None:
+            self.server = self._build_server()
 
-    def _connect(self) -> None:
-        """Register services and start the server."""
         # Register all service composers
         for composer in self.composers:
             composer.service_provider(composer.servicer, self.server)
+            composer.warm_up(self.configs, processes)
 
         # Add port and start server
         self.server.add_insecure_port(self.configs.server_uri)
         self.server.start()
 
-        print(f"gRPC server started on {self.configs.server_uri}")
+        # Let in-flight calls finish on SIGTERM/SIGINT
+        server = self.server
+        on_shutdown_signal(lambda: server.stop(self.configs.shutdown_grace))
+
+        print(f"gRPC server started on {self.configs.server_uri} (pid {os.getpid()})")
         self.server.wait_for_termination()
 
-    def install_app(self) -> None:
-        """Install and start the gRPC application."""
-        self._connect()
+    def install_app(
+        self, workers: int = 1, cpu_affinity: bool | Sequence[int] = False
+    ) -> None:
+        """Install and start the gRPC application.
+
+        Args:
+            workers: Server processes; above 1, pre-forked workers share
+                the port through SO_REUSEPORT and are restarted if they die
+            cpu_affinity: Pin worker processes to CPUs: True for one CPU
+                per worker, or a list of CPUs to cycle through
+        """
+        if workers == 1:
+            self._connect()
+            return
+        if self.server is not None:
+            raise ValueError("A prebuilt server cannot be shared by forked workers")
+        _prefork(lambda: self._connect(workers), self.configs, workers, cpu_affinity)
+
+
+class AsyncGrpcConnector:
+    """Connector for managing a ``grpc.aio`` server lifecycle.
+
+    The server is created inside the event loop started by
+    :meth:`install_app`, so only the configuration is held up front.
+    """
+
+    def __init__(
+        self,
+        composers: list[GrpcComposer],
+        configs: GrpcConfigs | None = None,
+        maximum_concurrent_rpcs: int | None = None,
+    ) -> None:
+        """Initialize the asyncio gRPC connector.
+
+        Args:
+            composers: List of service composers
+            configs: Server configuration (default: :class:`GrpcConfigs`)
+            maximum_concurrent_rpcs: Optional cap on in-flight RPCs,
+                overriding ``configs.maximum_concurrent_rpcs``
+        """
+        self.composers: list[GrpcComposer] = composers
+        self.configs: GrpcConfigs = configs if configs is not None else GrpcConfigs()
+        if maximum_concurrent_rpcs is not None:
+            self.configs = replace(
+                self.configs, maximum_concurrent_rpcs=maximum_concurrent_rpcs
+            )
+
+    async def _connect(self, processes: int = 1) -> None:
+        """Create the server, register services and serve until stopped.
+
+        Args:
+            processes: Server processes sharing the machine
+        """
+        server = grpc.aio.server(
+            options=self.configs.server_options(),
+            maximum_concurrent_rpcs=self.configs.maximum_concurrent_rpcs,
+        )
+
+        # Register all service composers
+        for composer in self.composers:
+            composer.add_servicer_to_server(server)
+            composer.warm_up(self.configs, processes)
+
+        # Add port and start server
+        server.add_insecure_port(self.configs.server_uri)
+        await server.start()
+
+        # Let in-flight calls finish on SIGTERM/SIGINT
+        loop = asyncio.get_running_loop()
+        on_shutdown_signal(
+            lambda: loop.call_soon_threadsafe(
+                asyncio.ensure_future, server.stop(self.configs.shutdown_grace)
+            )
+        )
+
+        print(f"gRPC asyncio server started on {self.configs.server_uri} (pid {os.getpid()})")
+        await server.wait_for_termination()
+
+    def install_app(
+        self, workers: int = 1, cpu_affinity: bool | Sequence[int] = False
+    ) -> None:
+        """Install and start the gRPC application on a new event loop.
+
+        Args:
+            workers: Server processes; above 1, pre-forked workers share
+                the port through SO_REUSEPORT and are restarted if they die
+            cpu_affinity: Pin worker processes to CPUs: True for one CPU
+                per worker, or a list of CPUs to cycle through
+        """
+        if workers == 1:
+            asyncio.run(self._connect())
+            return
+        _prefork(
+            lambda: asyncio.run(self._connect(workers)), self.configs, workers, cpu_affinity
+        )
@@ -1,11 +1,23 @@
 """Enumerations and data structures for the gRPC frame."""
 
-from dataclasses import dataclass
+import inspect
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Callable, Optional
 
 from pydantic import BaseModel
 
+from GrpcPluin.compression import CompressionPolicy
+
+from .admission import AdmissionController
+from .binder import ArgumentBinder
+from .cache import ResponseCache
+from .coalesce import RequestCoalescer
+from .executors import ExecutorGroup
+from .metrics import RouteMetrics
+from .middleware import AsyncChain, Chain, Middleware
+from .serializer import ResponseSerializer
+
 
 class METHODS(str, Enum):
     """HTTP methods supported by the gRPC service."""
@@ -23,7 +35,49 @@ class FunctionDetails:
     Attributes:
         func: The handler function to call
         response_model: Optional Pydantic model for response validation
+        cache: Optional response cache for idempotent GET routes
+        coalescer: Optional single-flight coalescer for GET routes
+        middlewares: Middleware applied to this route only
+        executor: Where the handler runs: None for the server's own
+            threads or event loop, "process" for the router's process pool,
+            or the name of an executor group
+        executor_group: Thread pool of the route's executor group, if any
+        admission: Optional admission controller of this route
+        revalidate_response: Whether handler results that already are
+            ``response_model`` instances are validated again
+        compression: Compression policy of the route's responses; None
+            uses the router's default
+        middleware: Composed sync middleware chain, None if there is none
+        async_middleware: Composed asyncio middleware chain
+        metrics: Request metrics of the route, keyed by HTTP method
+        binder: Argument binder compiled from the handler signature
+        serializer: Response serializer compiled from ``response_model``
+        is_coroutine: Whether the handler is an ``async def`` function
+        is_async_generator: Whether the handler is an ``async def``
+            generator, usable only with the asyncio server
     """
 
     func: Callable
     response_model: Optional[type[BaseModel]] = None
+    cache: Optional[ResponseCache] = None
+    coalescer: Optional[RequestCoalescer] = None
+    middlewares: list[Middleware] = field(default_factory=list)
+    executor: Optional[str] = None
+    executor_group: Optional[ExecutorGroup] = field(default=None, repr=False)
+    admission: Optional[AdmissionController] = None
+    revalidate_response: bool = True
+    compression: Optional[CompressionPolicy] = None
+    middleware: Optional[Chain] = field(default=None, repr=False)
+    async_middleware: Optional[AsyncChain] = field(default=None, repr=False)
+    metrics: dict[str, RouteMetrics] = field(default_factory=dict, repr=False)
+    binder: ArgumentBinder = field(init=False, repr=False)
+    serializer: ResponseSerializer = field(init=False, repr=False)
+    is_coroutine: bool = field(init=False, repr=False)
+    is_async_generator: bool = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Compile the argument binder and serializer once, at registration time."""
+        self.binder = ArgumentBinder(self.func)
+        self.serializer = ResponseSerializer(self.response_model, self.revalidate_response)
+        self.is_coroutine = inspect.iscoroutinefunction(self.func)
+        self.is_async_generator = inspect.isasyncgenfunction(self.func)
@@ -49,6 +49,34 @@ class InvalidArgumentException(BaseGrpcServerException):
             self.details = f"{self.details}: {extra_details}"
 
 
+class UnavailableException(BaseGrpcServerException):
+    """Raised when a request cannot be served right now and may be retried."""
+
+    code = StatusCode.UNAVAILABLE
+    details = "Service unavailable"
+
+
+class ResourceExhaustedException(BaseGrpcServerException):
+    """Raised when a request is shed because the server is overloaded."""
+
+    code = StatusCode.RESOURCE_EXHAUSTED
+    details = "Server overloaded, retry later"
+
+
+class CancelledException(BaseGrpcServerException):
+    """Raised when the client cancelled before the response was ready."""
+
+    code = StatusCode.CANCELLED
+    details = "Call cancelled by the client"
+
+
+class DeadlineExceededException(BaseGrpcServerException):
+    """Raised when the client's deadline passed before the response was ready."""
+
+    code = StatusCode.DEADLINE_EXCEEDED
+    details = "Deadline exceeded"
+
+
 EXCEPTIONS_MAPPING = {
     StatusCode.NOT_FOUND: 404,
     StatusCode.INVALID_ARGUMENT: 400,
@@ -60,5 +88,7 @@ EXCEPTIONS_MAPPING = {
     StatusCode.ABORTED: 409,
     StatusCode.OUT_OF_RANGE: 400,
     StatusCode.UNIMPLEMENTED: 501,
+    StatusCode.CANCELLED: 499,
+    StatusCode.DEADLINE_EXCEEDED: 504,
     StatusCode.OK: 200,
 }
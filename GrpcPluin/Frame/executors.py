@@ -0,0 +1,448 @@
+"""Process pool for CPU-bound route handlers, and bulkheaded thread pools.
+
+An :class:`ExecutorGroup` gives a group of routes threads of its own, so a
+route stuck on a slow downstream exhausts its group, not the server.
+"""
+
+import asyncio
+import contextvars
+import inspect
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+from GrpcPluin.deadline import CallAbandoned, current_call
+
+from .exceptions.exceptions import ResourceExhaustedException, UnavailableException
+
+logger = logging.getLogger(__name__)
+
+# Route option value that runs a handler in the router's process pool.
+PROCESS = "process"
+
+
+def _run_in_worker(func: Callable, arguments: dict[str, Any]) -> Any:
+    """Call a handler inside a worker process."""
+    if inspect.iscoroutinefunction(func):
+        return asyncio.run(func(**arguments))
+    return func(**arguments)
+
+
+def _ping() -> int:
+    """Return the worker's PID; used to start and warm up workers."""
+    return os.getpid()
+
+
+def check_process_handler(func: Callable) -> None:
+    """Reject handlers that cannot run in a worker process.
+
+    Handlers are sent to workers by reference, so they must be importable
+    module-level functions; generators cannot be sent back, and neither
+    can ``memoryview`` arguments.
+
+    Args:
+        func: Route handler
+
+    Raises:
+        ValueError: If the handler cannot run in a process pool
+    """
+    name = getattr(func, "__qualname__", repr(func))
+    if "<locals>" in name or "<lambda>" in name:
+        raise ValueError(f"Process handlers must be module-level functions: {name}")
+    if inspect.isgeneratorfunction(func) or inspect.isasyncgenfunction(func):
+        raise ValueError(f"Generator handlers cannot run in a process pool: {name}")
+    for parameter in inspect.signature(func).parameters.values():
+        if parameter.annotation in (memoryview, "memoryview"):
+            raise ValueError(
+                f"memoryview parameters cannot be sent to a process pool, use bytes: {name}"
+            )
+
+
+class ProcessPool:
+    """Managed :class:`ProcessPoolExecutor` for CPU-bound handlers.
+
+    Validated arguments (including pydantic models) are pickled to a
+    worker, and the handler's result is pickled back. The executor is
+    created on first use, or up front by :meth:`start`. If a worker
+    dies, the broken executor is replaced by a fresh one, and the
+    affected requests fail with :class:`UnavailableException`.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        warmup: bool = True,
+        initializer: Callable[..., Any] | None = None,
+        initargs: tuple[Any, ...] = (),
+        start_method: str | None = None,
+        max_tasks_per_child: int | None = None,
+    ) -> None:
+        """Configure the pool; no process is started yet.
+
+        Args:
+            workers: Worker processes (default: number of CPUs)
+            warmup: Start every worker (and run ``initializer``) in
+                :meth:`start` instead of on the first requests
+            initializer: Called once in every worker, e.g. to load models
+            initargs: Arguments for ``initializer``
+            start_method: multiprocessing start method (default:
+                "forkserver" where available, else "spawn"; plain "fork"
+                is unsafe once gRPC has started its threads)
+            max_tasks_per_child: Replace a worker after this many calls
+        """
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be at least 1")
+        if start_method is None:
+            available = multiprocessing.get_all_start_methods()
+            start_method = "forkserver" if "forkserver" in available else "spawn"
+
+        self.workers: int = workers or os.cpu_count() or 1
+        self._sized: bool = workers is not None
+        self.warmup: bool = warmup
+        self.initializer: Callable[..., Any] | None = initializer
+        self.initargs: tuple[Any, ...] = initargs
+        self.start_method: str = start_method
+        self.max_tasks_per_child: int | None = max_tasks_per_child
+        self.restarts: int = 0
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def set_default_workers(self, workers: int) -> None:
+        """Resize the pool, unless its size was given explicitly.
+
+        Used by the connectors so that pre-forked server processes share
+        the CPUs instead of each starting one worker per CPU. Has no
+        effect once the pool has started.
+
+        Args:
+            workers: Worker processes
+        """
+        if not self._sized and self._executor is None:
+            self.workers = max(1, workers)
+
+    def _create(self) -> ProcessPoolExecutor:
+        """Create a new executor with the configured options."""
+        options: dict[str, Any] = {}
+        if self.max_tasks_per_child is not None:
+            options["max_tasks_per_child"] = self.max_tasks_per_child
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=self.initializer,
+            initargs=self.initargs,
+            **options,
+        )
+
+    def _current(self) -> ProcessPoolExecutor:
+        """Return the live executor, creating it on first use."""
+        executor = self._executor
+        if executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = self._create()
+                executor = self._executor
+        return executor
+
+    def start(self) -> None:
+        """Create the executor and, if ``warmup`` is set, start every worker."""
+        executor = self._current()
+        if self.warmup:
+            futures = [executor.submit(_ping) for _ in range(self.workers)]
+            pids = {future.result() for future in futures}
+            logger.info(f"Process pool warmed up: {len(pids)} workers")
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        """Replace a broken executor, once, however many calls saw it break."""
+        with self._lock:
+            if self._executor is not broken:
+                return
+            self._executor = self._create()
+            self.restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+        logger.error(f"Process pool worker crashed; pool restarted ({self.restarts} so far)")
+
+    def submit(
+        self, func: Callable, arguments: dict[str, Any]
+    ) -> tuple[ProcessPoolExecutor, Future]:
+        """Send a handler call to a worker.
+
+        Args:
+            func: Route handler
+            arguments: Validated handler arguments
+
+        Returns:
+            The executor used and the call's future
+        """
+        executor = self._current()
+        try:
+            return executor, executor.submit(_run_in_worker, func, arguments)
+        except BrokenProcessPool:
+            self._restart(executor)
+            executor = self._current()
+            return executor, executor.submit(_run_in_worker, func, arguments)
+
+    def run(self, func: Callable, arguments: dict[str, Any]) -> Any:
+        """Run a handler in a worker and wait for its result.
+
+        Args:
+            func: Route handler
+            arguments: Validated handler arguments
+
+        Returns:
+            Handler return value
+
+        Raises:
+            UnavailableException: If the worker died during the call
+        """
+        executor, future = self.submit(func, arguments)
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            self._restart(executor)
+            raise UnavailableException("Handler worker process crashed")
+
+    async def run_async(self, func: Callable, arguments: dict[str, Any]) -> Any:
+        """Run a handler in a worker without blocking the event loop.
+
+        Args:
+            func: Route handler
+            arguments: Validated handler arguments
+
+        Returns:
+            Handler return value
+
+        Raises:
+            UnavailableException: If the worker died during the call
+        """
+        executor, future = self.submit(func, arguments)
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            self._restart(executor)
+            raise UnavailableException("Handler worker process crashed")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop every worker.
+
+        Args:
+            wait: Wait for running calls to finish
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+def _run_in_group(func: Callable, arguments: dict[str, Any]) -> Any:
+    """Call a handler on a group thread, unless its caller left while it queued."""
+    call = current_call()
+    if call is not None:
+        call.check()
+    if inspect.iscoroutinefunction(func):
+        return asyncio.run(func(**arguments))
+    return func(**arguments)
+
+
+def check_group_handler(func: Callable) -> None:
+    """Reject handlers that cannot be confined to an executor group.
+
+    A generator would be created on a group thread but consumed on the
+    server's, escaping the group's limits.
+
+    Args:
+        func: Route handler
+
+    Raises:
+        ValueError: If the handler is a generator function
+    """
+    if inspect.isgeneratorfunction(func) or inspect.isasyncgenfunction(func):
+        name = getattr(func, "__qualname__", repr(func))
+        raise ValueError(f"Generator handlers cannot run in an executor group: {name}")
+
+
+class ExecutorGroup:
+    """Bounded thread pool shared by a group of routes: a bulkhead.
+
+    At most ``workers`` handlers of the group run at once and at most
+    ``max_queue`` more wait for a thread; calls beyond that are rejected
+    at once with :class:`ResourceExhaustedException` (429). A slow route
+    thus holds at most ``workers + max_queue`` of the server's threads,
+    and the other routes keep theirs. Queued calls whose caller cancelled
+    or ran out of time are dropped without running. Thread-safe.
+
+    Attributes:
+        name: Name routes use to join the group
+        workers: Threads of the group
+        max_queue: Calls allowed to wait for a thread
+    """
+
+    def __init__(self, name: str, workers: int = 4, max_queue: int | None = None) -> None:
+        """Configure the group; threads start with the first calls.
+
+        Args:
+            name: Name routes use to join the group
+            workers: Threads of the group
+            max_queue: Calls allowed to wait for a thread (default: as many
+                as ``workers``)
+
+        Raises:
+            ValueError: If workers is below 1, max_queue negative, or the
+                name is "process"
+        """
+        if name == PROCESS:
+            raise ValueError(f"{PROCESS!r} is reserved for the process pool")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if max_queue is None:
+            max_queue = workers
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+        self.name: str = name
+        self.workers: int = workers
+        self.max_queue: int = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=f"grpc-{name}"
+        )
+        self._lock = threading.Lock()
+        self._pending: int = 0
+        self._active: int = 0
+        self._peak: int = 0
+        self._completed: int = 0
+        self._rejected: int = 0
+        self._dropped: int = 0
+        self._waited: float = 0.0
+
+    def submit(self, func: Callable, arguments: dict[str, Any]) -> Future:
+        """Queue a handler call in the current context.
+
+        Args:
+            func: Route handler
+            arguments: Validated handler arguments
+
+        Returns:
+            The call's future
+
+        Raises:
+            ResourceExhaustedException: If the group's threads and queue
+                are full
+        """
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise ResourceExhaustedException(f"Executor group {self.name!r} is saturated")
+            self._pending += 1
+            self._peak = max(self._peak, self._pending)
+        # Copy the context so the handler sees the current call
+        context = contextvars.copy_context()
+        try:
+            future = self._executor.submit(
+                self._task, time.monotonic(), context, func, arguments
+            )
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _task(
+        self,
+        queued: float,
+        context: contextvars.Context,
+        func: Callable,
+        arguments: dict[str, Any],
+    ) -> Any:
+        """Run a queued call on a group thread, counting it as active."""
+        with self._lock:
+            self._active += 1
+            self._waited += time.monotonic() - queued
+        try:
+            return context.run(_run_in_group, func, arguments)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _done(self, future: Future) -> None:
+        """Release the call's slot once it ran, failed or was cancelled."""
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled() or isinstance(future.exception(), CallAbandoned):
+                self._dropped += 1
+            else:
+                self._completed += 1
+
+    def run(self, func: Callable, arguments: dict[str, Any]) -> Any:
+        """Run a handler on the group and wait for its result.
+
+        Waits no longer than the current call's deadline; a call still
+        queued by then is cancelled.
+
+        Args:
+            func: Route handler
+            arguments: Validated handler arguments
+
+        Returns:
+            Handler return value
+
+        Raises:
+            ResourceExhaustedException: If the group is saturated
+            CallAbandoned: If the deadline passed first
+        """
+        future = self.submit(func, arguments)
+        call = current_call()
+        timeout = call.time_remaining() if call is not None else None
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise CallAbandoned(cancelled=False) from None
+
+    async def run_async(self, func: Callable, arguments: dict[str, Any]) -> Any:
+        """Run a handler on the group without blocking the event loop.
+
+        Args:
+            func: Route handler
+            arguments: Validated handler arguments
+
+        Returns:
+            Handler return value
+
+        Raises:
+            ResourceExhaustedException: If the group is saturated
+        """
+        return await asyncio.wrap_future(self.submit(func, arguments))
+
+    def stats(self) -> dict[str, Any]:
+        """Return the group's size, saturation and counters.
+
+        Returns:
+            Dictionary with workers, max_queue, active, queued, peak
+            (most calls in the group at once), completed, rejected,
+            dropped and wait_seconds (total time calls spent queued)
+        """
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": self._pending - self._active,
+                "peak": self._peak,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "dropped": self._dropped,
+                "wait_seconds": self._waited,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the group's threads.
+
+        Args:
+            wait: Wait for running calls to finish
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
@@ -1,24 +1,103 @@
 """gRPC manager for handling server requests."""
 
+import asyncio
+import contextvars
+import functools
 import logging
-from typing import Any
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, AsyncIterable, AsyncIterator, Hashable, Iterable, Iterator
 
 import grpc
 from google.protobuf import json_format
+from google.protobuf.message import DecodeError
 from google.protobuf.struct_pb2 import Struct
 from grpc import StatusCode
 from grpc._server import _Context  # type: ignore
 from pydantic import ValidationError
 from GrpcPluin.proto.base_proto_pb2 import Response as GrpcResponse  # type: ignore
+from GrpcPluin.proto.base_proto_pb2 import BatchResponse as GrpcBatchResponse  # type: ignore
 from GrpcPluin.proto.base_proto_pb2 import Method as GrpcMethod  # type: ignore
-from GrpcPluin.proto.base_proto_pb2_grpc import GrpcHandlerServicer
+from GrpcPluin.proto.base_proto_pb2 import Request as GrpcRequest  # type: ignore
+from GrpcPluin.proto.base_proto_pb2 import RouteSchema as GrpcRouteSchema  # type: ignore
+from GrpcPluin.proto.base_proto_pb2 import SchemaResponse as GrpcSchemaResponse  # type: ignore
+from GrpcPluin.proto.base_proto_pb2 import StatsResponse as GrpcStatsResponse  # type: ignore
+from GrpcPluin.proto.base_proto_pb2_grpc import (
+    GrpcHandlerServicer,
+    add_GrpcHandlerServicer_to_server,
+)
+from GrpcPluin.codec import Codec, get_codec, register_codec
+from GrpcPluin.compression import METADATA_KEY, CompressionPolicy
+from GrpcPluin.deadline import CallAbandoned, CallContext, bound_context, call_scope
+from GrpcPluin.schema import (
+    SCHEMA_METADATA_KEY,
+    STATUS_METADATA_KEY,
+    TypedRoute,
+    TypedSchema,
+)
 
+from .admission import AdmissionController
+from .binder import BINARY_TYPES
+from .cache import request_cache_key
+from .codegen import build_schema, route_codec
 from .enums import FunctionDetails
-from .exceptions.exceptions import BaseGrpcServerException, EXCEPTIONS_MAPPING
+from .executors import PROCESS
+from .metrics import CLIENT_CLOSED, RouteMetrics
+from .middleware import MiddlewareRequest
+from .exceptions.exceptions import (
+    BaseGrpcServerException,
+    CancelledException,
+    DeadlineExceededException,
+    EXCEPTIONS_MAPPING,
+    InvalidArgumentException,
+    NotFoundException,
+)
 from .router import GrpcRouter
 
 logger = logging.getLogger(__name__)
 
+OK_STATUS = EXCEPTIONS_MAPPING[StatusCode.OK]
+INTERNAL_STATUS = EXCEPTIONS_MAPPING[StatusCode.INTERNAL]
+DEADLINE_STATUS = EXCEPTIONS_MAPPING[StatusCode.DEADLINE_EXCEEDED]
+
+# gRPC code a failed typed call ends with, by HTTP-style status (first mapping wins)
+STATUS_CODES: dict[int, StatusCode] = {
+    status: code for code, status in reversed(list(EXCEPTIONS_MAPPING.items()))
+}
+
+
+class UploadedRequest:
+    """A request whose attachment was streamed over several messages.
+
+    Reads like the first message of the upload, whose attachment is
+    replaced with the chunks of every message, joined.
+
+    Attributes:
+        attachment: Whole attachment of the upload
+    """
+
+    __slots__ = ("_first", "_size", "attachment")
+
+    def __init__(self, first: Any, attachment: bytes, size: int) -> None:
+        """Initialize the request.
+
+        Args:
+            first: First message of the upload
+            attachment: Joined attachment chunks
+            size: Serialized size of all messages, in bytes
+        """
+        self._first = first
+        self._size = size
+        self.attachment: bytes = attachment
+
+    def ByteSize(self) -> int:
+        """Return the serialized size of the whole upload."""
+        return self._size
+
+    def __getattr__(self, name: str) -> Any:
+        """Read every other field from the first message."""
+        return getattr(self._first, name)
+
 
 class GrpcManager(GrpcHandlerServicer):
     """gRPC server handler that dispatches requests to registered routes.
@@ -27,13 +106,61 @@ class GrpcManager(GrpcHandlerServicer):
     the routing of requests to appropriate handler functions.
     """
 
-    def __init__(self, router: GrpcRouter) -> None:
+    def __init__(
+        self,
+        router: GrpcRouter,
+        executor: Executor | None = None,
+        batch_workers: int = 10,
+        max_batch_items: int = 1000,
+    ) -> None:
         """Initialize the gRPC manager.
 
         Args:
             router: Router instance to use for dispatching
+            executor: Executor for parallel batch items (default: a pool
+                of ``batch_workers`` threads created on the first parallel
+                batch)
+            batch_workers: Items of parallel batches run at once
+            max_batch_items: Largest batch accepted; larger ones fail with
+                INVALID_ARGUMENT
         """
         self.router: GrpcRouter = router
+        self.executor: Executor | None = executor
+        self.batch_workers: int = batch_workers
+        self.max_batch_items: int = max_batch_items
+        self._executor_lock = threading.Lock()
+        self.schema: TypedSchema | None = None
+        self._schema_response: GrpcSchemaResponse = GrpcSchemaResponse()
+        self._typed_routes: dict[str, FunctionDetails] = {}
+
+    def warm_up(self, configs: Any = None, processes: int = 1) -> None:
+        """Apply the server configs and prepare the router's executors.
+
+        Called by the connectors before the server starts.
+
+        Args:
+            configs: GrpcConfigs of the server; its batch fields that are
+                set override this manager's
+            processes: Server processes sharing the machine, which share
+                the CPUs for the router's process pool
+        """
+        process_workers = None
+        if configs is not None:
+            if configs.batch_workers is not None:
+                self.batch_workers = configs.batch_workers
+            if configs.max_batch_items is not None:
+                self.max_batch_items = configs.max_batch_items
+            process_workers = configs.process_pool_size(processes)
+        self.router.warm_up(process_workers)
+
+    def _batch_too_large(self, request: Any) -> str | None:
+        """Return why a batch is rejected, or None if it is accepted."""
+        if len(request.requests) > self.max_batch_items:
+            return (
+                f"Batch of {len(request.requests)} requests exceeds the limit of "
+                f"{self.max_batch_items}"
+            )
+        return None
 
     def Dispatch(self, request: Any, context: _Context) -> GrpcResponse | _Context:
         """Handle incoming gRPC requests.
@@ -46,79 +173,1549 @@ class GrpcManager(GrpcHandlerServicer):
             GrpcResponse on success, context on error
         """
         try:
-            # Convert protobuf to Python dict
-            body = json_format.MessageToDict(request.body)
+            return self._handle(request, context)
 
-            # Find the route handler
-            method_str = GrpcMethod.Name(request.method)
-            func_detail: FunctionDetails = self.router._routing(
-                method=method_str, url=request.url
+        except BaseGrpcServerException as error:
+            return self._error_response(error)
+
+        except Exception as error:
+            # Handle unexpected exceptions
+            self._internal_error(error, context)
+            return context
+
+    def DispatchStream(self, request: Any, context: _Context) -> Iterator[GrpcResponse]:
+        """Handle server-streaming requests.
+
+        The route handler may return a generator (or any iterable) of
+        dicts; every item is validated and sent as its own response
+        message. gRPC flow control pulls items only as fast as the client
+        reads them. A handler returning a single dict sends one message.
+
+        Args:
+            request: gRPC request object
+            context: gRPC server context
+
+        Yields:
+            One GrpcResponse per chunk; a known server exception ends the
+            stream with a failed response, an unexpected one with INTERNAL
+        """
+        metrics = None
+        status_code = INTERNAL_STATUS
+        sent = 0
+        compression = None
+        admitted = ()
+        call = self._call_context(context)
+        try:
+            func_detail, path_params, metrics = self._route(request)
+            started = metrics.start()
+            codec = self._request_codec(request)
+            if func_detail.is_async_generator:
+                raise TypeError("async generator handlers require the asyncio server")
+
+            call.check()
+            # A stream holds its slot until the last chunk is sent
+            admitted = self._admit(func_detail)
+            func_arguments = self._bind(request, codec, func_detail, path_params)
+            # The generator is resumed by gRPC, so run every step in a
+            # context where this call is current
+            scope = bound_context(call)
+            chunks = scope.run(
+                self._call_handler, func_detail, func_arguments, request, path_params, context
             )
+            if isinstance(chunks, (dict, *BINARY_TYPES)):
+                chunks = (chunks,)
+
+            status_code = OK_STATUS
+            compression = self._stream_compression(func_detail, context)
+            iterator = iter(chunks)
+            done = object()
+            while True:
+                chunk = scope.run(next, iterator, done)
+                if chunk is done:
+                    break
+                call.check()
+                grpc_response = self._build_response(func_detail, chunk, codec)
+                status_code = grpc_response.status_code
+                sent += self._chunk_size(grpc_response, compression, context)
+                yield grpc_response
+
+        except GeneratorExit:
+            status_code = CLIENT_CLOSED
+            raise
+
+        except CallAbandoned as error:
+            # Nobody is left to read an error response
+            status_code = self._status_of(self._abandoned(error))
+
+        except BaseGrpcServerException as error:
+            status_code = self._status_of(error)
+            yield self._error_response(error)
+
+        except Exception as error:
+            status_code = INTERNAL_STATUS
+            self._internal_error(error, context)
+
+        finally:
+            if admitted:
+                self._release(admitted, status_code)
+            if metrics is not None:
+                metrics.record_bytes(request.ByteSize(), sent, compression is not None)
+                metrics.finish(started, status_code)
+
+    def DispatchBatch(self, request: Any, context: _Context) -> GrpcBatchResponse:
+        """Handle many routed requests in one round trip.
+
+        Every item goes through the same routing, binding and validation
+        as :meth:`Dispatch`, and gets its own status: a failing item never
+        fails the batch. Items run in order, or concurrently on the
+        executor when ``parallel`` is set.
 
-            # Extract and validate function arguments
-            func_arguments: dict[str, Any] = self.router._declare_function_argument(
-                func=func_detail.func, request_data=body
+        Args:
+            request: gRPC batch request object
+            context: gRPC server context
+
+        Returns:
+            One response per request, in request order
+        """
+        too_large = self._batch_too_large(request)
+        if too_large is not None:
+            context.abort(StatusCode.INVALID_ARGUMENT, too_large)
+        if request.parallel and len(request.requests) > 1:
+            responses = list(
+                self._batch_executor().map(
+                    functools.partial(self._handle_item, context=context),
+                    request.requests,
+                )
             )
+        else:
+            responses = [self._handle_item(item, context) for item in request.requests]
+        batch = GrpcBatchResponse(responses=responses)
+        self._compress_batch(batch, context)
+        return batch
+
+    def _batch_executor(self) -> Executor:
+        """Return the executor of parallel batches, creating it only once."""
+        executor = self.executor
+        if executor is None:
+            with self._executor_lock:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(
+                        max_workers=self.batch_workers, thread_name_prefix="grpc-batch"
+                    )
+                executor = self.executor
+        return executor
+
+    def DispatchUpload(
+        self, request_iterator: Iterable[Any], context: _Context
+    ) -> GrpcResponse | _Context:
+        """Handle a request whose attachment is streamed in chunks.
+
+        The first message carries the request and the first chunk of its
+        attachment; later messages only carry further chunks. Once all
+        chunks arrived the request is handled like :meth:`Dispatch`.
+
+        Args:
+            request_iterator: Messages of the upload
+            context: gRPC server context
+
+        Returns:
+            GrpcResponse on success, context on error
+        """
+        try:
+            return self._handle(self._join_upload(request_iterator), context)
 
-            # Call the handler function
-            response: dict[str, Any] = self.router._call(
-                func=func_detail.func, request_data=func_arguments
+        except BaseGrpcServerException as error:
+            return self._error_response(error)
+
+        except Exception as error:
+            self._internal_error(error, context)
+            return context
+
+    @staticmethod
+    def _join_upload(request_iterator: Iterable[Any]) -> UploadedRequest:
+        """Receive every message of an upload and join its attachment.
+
+        Args:
+            request_iterator: Messages of the upload
+
+        Returns:
+            The uploaded request
+
+        Raises:
+            InvalidArgumentException: If the upload has no message
+        """
+        iterator = iter(request_iterator)
+        first = next(iterator, None)
+        if first is None:
+            raise InvalidArgumentException("Upload without a request message")
+        chunks = [first.attachment]
+        size = first.ByteSize()
+        for message in iterator:
+            chunks.append(message.attachment)
+            size += message.ByteSize()
+        return UploadedRequest(first, b"".join(chunks), size)
+
+    def Stats(self, request: Any, context: _Context) -> GrpcStatsResponse:
+        """Report per-route request metrics.
+
+        Args:
+            request: gRPC stats request object
+            context: gRPC server context
+
+        Returns:
+            Route metrics as a Struct, plus the Prometheus exposition when
+            ``format`` is "prometheus"
+        """
+        return self._stats_response(request)
+
+    def _stats_response(self, request: Any) -> GrpcStatsResponse:
+        """Build the response of a Stats call.
+
+        Args:
+            request: gRPC stats request object
+
+        Returns:
+            gRPC stats response
+        """
+        data = Struct()
+        data.update(
+            {
+                "routes": self.router.stats(),
+                "caches": self.router.cache_stats(),
+                "coalescing": self.router.coalesce_stats(),
+                "admission": self.router.admission_stats(),
+                "executors": self.router.executor_stats(),
+            }
+        )
+        text = ""
+        if request.format == "prometheus":
+            text = self.router.metrics.to_prometheus()
+        return GrpcStatsResponse(data=data, text=text)
+
+    def Schema(self, request: Any, context: _Context) -> GrpcSchemaResponse:
+        """Describe the typed per-route RPCs.
+
+        Args:
+            request: gRPC schema request object
+            context: gRPC server context
+
+        Returns:
+            Descriptor of the typed service and the RPC of every route;
+            empty when the typed service is not installed
+        """
+        return self._schema_response
+
+    def typed_service(self) -> grpc.GenericRpcHandler:
+        """Build the typed per-route service.
+
+        Generates one RPC per route (see ``GrpcPluin.Frame.codegen``) and
+        registers the payload codec of each. Typed calls then go through
+        the same pipeline as ``Dispatch``: routing, validation, admission,
+        caching, compression and metrics.
+
+        Returns:
+            Handler serving the typed RPCs, to add to the gRPC server
+        """
+        generated = build_schema(self.router)
+        schema = generated.typed_schema()
+        handlers = {}
+        routes = []
+        for generated_route, route in zip(generated.routes, schema.routes):
+            routes.append(
+                GrpcRouteSchema(
+                    method=GrpcMethod.Value(route.method),
+                    url=route.url,
+                    rpc=route.rpc,
+                    streaming=route.streaming,
+                )
+            )
+            if not route.typed:
+                continue
+            register_codec(route_codec(route))
+            self._typed_routes[route.rpc] = generated_route.details
+            handlers[route.rpc.rsplit("/", 1)[1]] = self._typed_handler(route)
+
+        self.schema = schema
+        self._schema_response = GrpcSchemaResponse(
+            descriptor=generated.descriptor, routes=routes
+        )
+        return grpc.method_handlers_generic_handler(generated.service, handlers)
+
+    def _typed_handler(self, route: TypedRoute) -> grpc.RpcMethodHandler:
+        """Build the method handler of a typed RPC.
+
+        Messages are left serialized: the route's codec decodes them inside
+        the request pipeline, and responses come out already encoded.
+
+        Args:
+            route: Typed route
+
+        Returns:
+            Unary or server-streaming method handler
+        """
+        if route.streaming:
+            return grpc.unary_stream_rpc_method_handler(
+                functools.partial(self._dispatch_typed_stream, route)
             )
-            status_code = StatusCode.OK
-            result = True
-            message = None
-            # Validate response against response_model if provided
-            if func_detail.response_model is not None:
+        return grpc.unary_unary_rpc_method_handler(
+            functools.partial(self._dispatch_typed, route)
+        )
+
+    def _dispatch_typed(self, route: TypedRoute, payload: bytes, context: _Context) -> bytes:
+        """Serve a unary typed RPC.
+
+        Args:
+            route: Typed route the RPC belongs to
+            payload: Serialized request message
+            context: gRPC server context
+
+        Returns:
+            Serialized response message; empty when the call failed, whose
+            status then carries the error
+        """
+        if self._stale_schema(context):
+            return b""
+        try:
+            response = self._handle(self._typed_request(route, payload), context)
+        except BaseGrpcServerException as error:
+            response = self._error_response(error)
+        except Exception as error:
+            self._internal_error(error, context)
+            return b""
+        if not response.result:
+            self._typed_failure(response, context)
+        return response.payload
+
+    def _dispatch_typed_stream(
+        self, route: TypedRoute, payload: bytes, context: _Context
+    ) -> Iterator[bytes]:
+        """Serve a server-streaming typed RPC.
+
+        Args:
+            route: Typed route the RPC belongs to
+            payload: Serialized request message
+            context: gRPC server context
+
+        Yields:
+            Serialized response messages; a failed chunk ends the stream
+            with its status
+        """
+        if self._stale_schema(context):
+            return
+        try:
+            request = self._typed_request(route, payload)
+        except BaseGrpcServerException as error:
+            self._typed_failure(self._error_response(error), context)
+            return
+        for response in self.DispatchStream(request, context):
+            if not response.result:
+                self._typed_failure(response, context)
+                return
+            yield response.payload
+
+    def _typed_request(self, route: TypedRoute, payload: bytes) -> GrpcRequest:
+        """Turn a typed call into the request ``Dispatch`` would receive.
+
+        Path parameters are read from the message to rebuild the URL; the
+        whole message is then decoded by the route's codec as the body.
+
+        Args:
+            route: Typed route the call belongs to
+            payload: Serialized request message
+
+        Returns:
+            Request for the generic pipeline
+
+        Raises:
+            InvalidArgumentException: If the message cannot be decoded or
+                lacks a path parameter
+            NotFoundException: If the URL resolves to another route
+        """
+        if route.path_params:
+            try:
+                message = route.request.message_class.FromString(payload)
+            except DecodeError:
+                raise InvalidArgumentException("Request message cannot be decoded")
+            path_params = {
+                name: getattr(message, name)
+                for name in route.path_params
+                if message.HasField(name)
+            }
+            try:
+                url = route.url_for(path_params)
+            except KeyError as error:
+                raise InvalidArgumentException(f"Missing path parameter {error}")
+            # Another template may be more specific for these values
+            func_detail, _ = self.router._routing(route.method, url)
+            if func_detail is not self._typed_routes[route.rpc]:
+                raise NotFoundException(f"{route.method} {url} is not served by {route.rpc}")
+        else:
+            url = route.url
+        return GrpcRequest(
+            url=url,
+            method=GrpcMethod.Value(route.method),
+            payload=payload,
+            codec=f"proto:{route.rpc}",
+        )
+
+    def _stale_schema(self, context: Any) -> bool:
+        """Reject a typed call built from another version of the schema.
+
+        Args:
+            context: gRPC server context
+
+        Returns:
+            True if the call was failed with FAILED_PRECONDITION; the
+            current fingerprint is sent so the client can refresh
+        """
+        for key, value in context.invocation_metadata() or ():
+            if key == SCHEMA_METADATA_KEY and value != self.schema.fingerprint:
+                context.set_trailing_metadata(
+                    ((SCHEMA_METADATA_KEY, self.schema.fingerprint),)
+                )
+                context.set_code(StatusCode.FAILED_PRECONDITION)
+                context.set_details("Typed schema changed; fetch it again")
+                return True
+        return False
+
+    @staticmethod
+    def _typed_failure(response: GrpcResponse, context: Any) -> None:
+        """End a typed call with the status of a failed response.
+
+        Args:
+            response: Failed response of the generic pipeline
+            context: gRPC server context
+        """
+        context.set_trailing_metadata(((STATUS_METADATA_KEY, str(response.status_code)),))
+        context.set_code(STATUS_CODES.get(response.status_code, StatusCode.UNKNOWN))
+        context.set_details(response.message)
+
+    def _handle(self, request: Any, context: Any, compress: bool = True) -> GrpcResponse:
+        """Route a single request, apply admission control and record metrics.
+
+        Args:
+            request: gRPC request object
+            context: gRPC server context
+            compress: Apply the route's compression policy to the call;
+                False for batch items, whose batch is compressed as a whole
+
+        Returns:
+            Encoded gRPC response
+
+        Raises:
+            BaseGrpcServerException: For known routing or validation errors,
+                ResourceExhaustedException when the request is shed, and
+                CancelledException or DeadlineExceededException when the
+                caller gave up
+        """
+        func_detail, path_params, metrics = self._route(request)
+        started = metrics.start()
+        status_code = INTERNAL_STATUS
+        admitted = ()
+        try:
+            with call_scope(self._call_context(context)) as call:
+                call.check()
+                admitted = self._admit(func_detail)
+                grpc_response = self._respond(
+                    request, context, func_detail, path_params, call
+                )
+            status_code = grpc_response.status_code
+            self._account(request, grpc_response, func_detail, metrics, context, compress)
+            return grpc_response
+        except CallAbandoned as error:
+            abandoned = self._abandoned(error)
+            status_code = self._status_of(abandoned)
+            raise abandoned from None
+        except BaseGrpcServerException as error:
+            status_code = self._status_of(error)
+            raise
+        finally:
+            if admitted:
+                self._release(admitted, status_code)
+            metrics.finish(started, status_code)
+
+    def _admit(
+        self, func_detail: FunctionDetails
+    ) -> tuple[tuple[AdmissionController, tuple[float, int]], ...]:
+        """Pass a request through the router-wide and route controllers.
+
+        Args:
+            func_detail: Details of the matched route
+
+        Returns:
+            (controller, token) pairs to release when the request ends
+
+        Raises:
+            ResourceExhaustedException: If a controller sheds the request
+        """
+        router_admission = self.router.admission
+        route_admission = func_detail.admission
+        if router_admission is None and route_admission is None:
+            return ()
+
+        admitted = []
+        try:
+            for controller in (router_admission, route_admission):
+                if controller is not None:
+                    admitted.append((controller, controller.acquire()))
+        except BaseGrpcServerException:
+            # Rejected by the route: give the router-wide slot back unchanged
+            for controller, token in admitted:
+                controller.release(token, dropped=False)
+            raise
+        return tuple(admitted)
+
+    @staticmethod
+    def _release(
+        admitted: tuple[tuple[AdmissionController, tuple[float, int]], ...],
+        status_code: int,
+    ) -> None:
+        """Release admitted slots, reporting server errors as overload.
+
+        Args:
+            admitted: Pairs returned by :meth:`_admit`
+            status_code: Status sent to the client
+        """
+        dropped = status_code >= INTERNAL_STATUS
+        for controller, token in admitted:
+            controller.release(token, dropped)
+
+    def _respond(
+        self,
+        request: Any,
+        context: Any,
+        func_detail: FunctionDetails,
+        path_params: dict[str, Any],
+        call: CallContext,
+    ) -> GrpcResponse:
+        """Bind, call and encode a routed request.
+
+        Args:
+            request: gRPC request object
+            context: gRPC server context
+            func_detail: Details of the matched route
+            path_params: Parameters captured from the URL
+            call: Deadline and cancellation state of the call
+
+        Returns:
+            Encoded gRPC response
+
+        Raises:
+            BaseGrpcServerException: For known validation errors
+            CallAbandoned: If the caller is gone once the handler returns
+        """
+        codec = self._request_codec(request)
+
+        # Serve cached GET routes before binding
+        cache_key, cached = self._cache_lookup(func_detail, request)
+        if cached is not None:
+            return cached
+
+        def produce() -> GrpcResponse:
+            func_arguments = self._bind(request, codec, func_detail, path_params)
+            response = self._call_handler(
+                func_detail, func_arguments, request, path_params, context
+            )
+
+            # Skip validation and encoding for a caller that gave up
+            call.check()
+            grpc_response = self._build_response(func_detail, response, codec)
+            self._cache_store(func_detail, cache_key, grpc_response)
+            return grpc_response
+
+        if func_detail.coalescer is None:
+            return produce()
+        return func_detail.coalescer.run(self._coalesce_key(request, cache_key), produce)
+
+    def _handle_item(self, request: Any, context: Any) -> GrpcResponse:
+        """Handle a batch item, turning every error into its own response.
+
+        Args:
+            request: gRPC request object
+            context: gRPC server context of the batch call
+
+        Returns:
+            Encoded gRPC response, failed if the item raised
+        """
+        try:
+            return self._handle(request, context, compress=False)
+        except BaseGrpcServerException as error:
+            return self._error_response(error)
+        except Exception as error:
+            return self._internal_error_response(error)
+
+    def _call_handler(
+        self,
+        func_detail: FunctionDetails,
+        func_arguments: dict[str, Any],
+        request: Any,
+        path_params: dict[str, Any],
+        context: Any,
+    ) -> Any:
+        """Call a route handler through its middleware chain, if any.
+
+        Args:
+            func_detail: Details of the matched route
+            func_arguments: Validated handler arguments
+            request: gRPC request object
+            path_params: Parameters captured from the URL
+            context: gRPC server context
+
+        Returns:
+            Handler (or middleware) result
+        """
+        if func_detail.middleware is None:
+            return self._invoke(func_detail, func_arguments)
+
+        return func_detail.middleware(
+            self._middleware_request(func_arguments, request, path_params, context),
+            lambda middleware_request: self._invoke(
+                func_detail, middleware_request.arguments
+            ),
+        )
+
+    def _invoke(self, func_detail: FunctionDetails, func_arguments: dict[str, Any]) -> Any:
+        """Call a route handler.
+
+        Args:
+            func_detail: Details of the matched route
+            func_arguments: Validated handler arguments
+
+        Returns:
+            Handler return value
+        """
+        if func_detail.executor == PROCESS:
+            return self.router.process_pool.run(func_detail.func, func_arguments)
+        if func_detail.executor_group is not None:
+            return func_detail.executor_group.run(func_detail.func, func_arguments)
+        if func_detail.is_coroutine:
+            return asyncio.run(func_detail.func(**func_arguments))
+        return self.router._call(func=func_detail.func, request_data=func_arguments)
+
+    @staticmethod
+    def _middleware_request(
+        func_arguments: dict[str, Any],
+        request: Any,
+        path_params: dict[str, Any],
+        context: Any,
+    ) -> MiddlewareRequest:
+        """Describe a routed request for middleware.
+
+        Args:
+            func_arguments: Validated handler arguments
+            request: gRPC request object
+            path_params: Parameters captured from the URL
+            context: gRPC server context
+
+        Returns:
+            Middleware request
+        """
+        return MiddlewareRequest(
+            method=GrpcMethod.Name(request.method),
+            url=request.url,
+            path_params=path_params,
+            arguments=func_arguments,
+            metadata=dict(context.invocation_metadata() or ()),
+        )
+
+    @staticmethod
+    def _request_codec(request: Any) -> Codec | None:
+        """Resolve the payload codec negotiated by a request.
+
+        Args:
+            request: gRPC request object
+
+        Returns:
+            The codec, or None for Struct-encoded requests
+
+        Raises:
+            InvalidArgumentException: If the codec is not registered
+        """
+        if not request.codec:
+            return None
+        try:
+            return get_codec(request.codec)
+        except KeyError:
+            raise InvalidArgumentException(f"Unsupported codec {request.codec!r}")
+
+    def _route(
+        self, request: Any
+    ) -> tuple[FunctionDetails, dict[str, Any], RouteMetrics]:
+        """Find the route handler of a request.
+
+        Requests that match no route are counted in the router's
+        ``unmatched`` metrics.
+
+        Args:
+            request: gRPC request object
+
+        Returns:
+            Function details, captured path parameters and the metrics of
+            the route and method
+
+        Raises:
+            NotFoundException: If no route matches
+        """
+        method_str = GrpcMethod.Name(request.method)
+        try:
+            func_detail, path_params = self.router._routing(
+                method=method_str, url=request.url
+            )
+        except NotFoundException as error:
+            unmatched = self.router.metrics.unmatched
+            unmatched.finish(unmatched.start(), self._status_of(error))
+            raise
+        return func_detail, path_params, func_detail.metrics[method_str]
+
+    def _compression(
+        self, func_detail: FunctionDetails | None, context: Any
+    ) -> CompressionPolicy | None:
+        """Pick the compression policy of a response.
+
+        The client's per-call choice wins over the route's policy, which
+        wins over the router's default. A client choice keeps the size
+        threshold of the route or router.
+
+        Args:
+            func_detail: Details of the matched route; None for a batch
+            context: gRPC server context
+
+        Returns:
+            Policy to apply, or None to send the response uncompressed
+        """
+        policy = self.router.compression
+        if func_detail is not None and func_detail.compression is not None:
+            policy = func_detail.compression
+
+        for key, value in context.invocation_metadata() or ():
+            if key == METADATA_KEY:
+                default = policy if policy is not None else CompressionPolicy()
                 try:
-                    validated_response = func_detail.response_model(**response)
-                    logger.info(f"validation_response: {validated_response}")
-                    # Use dict() for compatibility with both Pydantic v1 and v2
-                    if hasattr(validated_response, "model_dump"):
-                        response = validated_response.model_dump()
-                    else:
-                        response = validated_response.dict()
-                    status_code = StatusCode.OK
-                    result = True
-                    message = None
-                except ValidationError as error:
-                    logger.error(f"ValidationError: {type(error)}")
-                    logger.error(f"Response validation failed: {error}")
-                    status_code = StatusCode.INVALID_ARGUMENT
-                    result = False
-                    message = "Response does not match expected model"
-                    response = {}
-
-            # Convert response to protobuf Struct
-            struct_response = Struct()
-            struct_response.update(response)
-            status_code = EXCEPTIONS_MAPPING[status_code]
-
-            # Return success response
+                    return CompressionPolicy(algorithm=value, min_size=default.min_size)
+                except ValueError:
+                    break
+        return policy
+
+    @staticmethod
+    def _compress(policy: CompressionPolicy | None, context: Any, size: int) -> bool:
+        """Compress the response of a unary call if it is large enough.
+
+        Args:
+            policy: Policy picked by :meth:`_compression`
+            context: gRPC server context
+            size: Size of the response message in bytes
+
+        Returns:
+            Whether the response is sent compressed
+        """
+        if policy is None or not policy.compresses(size):
+            return False
+        context.set_compression(policy.compression)
+        return True
+
+    def _account(
+        self,
+        request: Any,
+        grpc_response: GrpcResponse,
+        func_detail: FunctionDetails,
+        metrics: RouteMetrics,
+        context: Any,
+        compress: bool,
+    ) -> bool:
+        """Compress a unary response if needed and record its message sizes.
+
+        Args:
+            request: gRPC request object
+            grpc_response: Response about to be sent
+            func_detail: Details of the matched route
+            metrics: Metrics of the route
+            context: gRPC server context
+            compress: Whether the call's compression is decided here
+
+        Returns:
+            Whether the response is sent compressed
+        """
+        size = grpc_response.ByteSize()
+        compressed = compress and self._compress(
+            self._compression(func_detail, context), context, size
+        )
+        metrics.record_bytes(request.ByteSize(), size, compressed)
+        return compressed
+
+    def _compress_batch(self, batch: GrpcBatchResponse, context: Any) -> bool:
+        """Compress a batch response by the router's policy if it is large enough.
+
+        Args:
+            batch: Batch response about to be sent
+            context: gRPC server context
+
+        Returns:
+            Whether the batch is sent compressed
+        """
+        return self._compress(self._compression(None, context), context, batch.ByteSize())
+
+    def _stream_compression(
+        self, func_detail: FunctionDetails, context: Any
+    ) -> CompressionPolicy | None:
+        """Enable compression for a stream whose policy asks for it.
+
+        Args:
+            func_detail: Details of the matched route
+            context: gRPC server context
+
+        Returns:
+            The policy, checked against every chunk, or None
+        """
+        policy = self._compression(func_detail, context)
+        if policy is None or policy.algorithm == "none":
+            return None
+        context.set_compression(policy.compression)
+        return policy
+
+    @staticmethod
+    def _chunk_size(
+        grpc_response: GrpcResponse, policy: CompressionPolicy | None, context: Any
+    ) -> int:
+        """Leave a small stream chunk uncompressed and return its size.
+
+        Args:
+            grpc_response: Chunk about to be sent
+            policy: Policy returned by :meth:`_stream_compression`
+            context: gRPC server context
+
+        Returns:
+            Size of the chunk message in bytes
+        """
+        size = grpc_response.ByteSize()
+        if policy is not None and not policy.compresses(size):
+            context.disable_next_message_compression()
+        return size
+
+    @staticmethod
+    def _call_context(context: Any) -> CallContext:
+        """Read the deadline and cancellation state of a call.
+
+        Args:
+            context: gRPC server context
+
+        Returns:
+            Call context made current while the request is handled
+        """
+        return CallContext.from_timeout(context.time_remaining(), context.is_active)
+
+    @staticmethod
+    def _abandoned(error: CallAbandoned) -> BaseGrpcServerException:
+        """Turn an abandoned call into the matching server exception."""
+        if error.cancelled:
+            return CancelledException()
+        return DeadlineExceededException()
+
+    @staticmethod
+    def _status_of(error: BaseGrpcServerException) -> int:
+        """Return the HTTP-style status code reported for a server exception."""
+        return EXCEPTIONS_MAPPING.get(error.code, INTERNAL_STATUS)
+
+    @staticmethod
+    def _bind(
+        request: Any,
+        codec: Codec | None,
+        func_detail: FunctionDetails,
+        path_params: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Decode the request body and bind the handler arguments.
+
+        Args:
+            request: gRPC request object
+            codec: Payload codec negotiated by the request, if any
+            func_detail: Details of the matched route
+            path_params: Parameters captured from the URL
+
+        Returns:
+            Validated handler arguments
+        """
+        # Convert the payload or protobuf Struct to Python dict
+        if codec is not None:
+            try:
+                body = codec.decode(request.payload) if request.payload else {}
+            except ValueError as error:
+                raise InvalidArgumentException(f"Undecodable {codec.name} payload: {error}")
+        else:
+            body = json_format.MessageToDict(request.body)
+
+        # Extract and validate function arguments; reading the attachment
+        # copies it, so only routes with binary parameters do
+        binder = func_detail.binder
+        attachment = request.attachment if binder.attachment_parameters else None
+        return binder.bind(body, path_params, attachment)
+
+    @staticmethod
+    def _cache_lookup(
+        func_detail: FunctionDetails, request: Any
+    ) -> tuple[Hashable | None, GrpcResponse | None]:
+        """Look a request up in its route's response cache.
+
+        Args:
+            func_detail: Details of the matched route
+            request: gRPC request object
+
+        Returns:
+            (cache key, cached response); both None for uncached routes
+        """
+        if func_detail.cache is None:
+            return None, None
+        key = request_cache_key(request)
+        return key, func_detail.cache.get(key)
+
+    @staticmethod
+    def _coalesce_key(request: Any, cache_key: Hashable | None) -> Hashable:
+        """Return the key identical requests are coalesced on.
+
+        Args:
+            request: gRPC request object
+            cache_key: Key from :meth:`_cache_lookup`, reused when the
+                route is also cached
+
+        Returns:
+            Method, URL, codec and canonical body of the request
+        """
+        return cache_key if cache_key is not None else request_cache_key(request)
+
+    @staticmethod
+    def _cache_store(
+        func_detail: FunctionDetails, key: Hashable | None, response: GrpcResponse
+    ) -> None:
+        """Store a successful response in its route's cache.
+
+        Args:
+            func_detail: Details of the matched route
+            key: Key returned by :meth:`_cache_lookup`
+            response: Encoded response
+        """
+        if func_detail.cache is not None and response.result:
+            func_detail.cache.put(key, response)
+
+    @staticmethod
+    def _build_response(
+        func_detail: FunctionDetails, response: Any, codec: Codec | None = None
+    ) -> GrpcResponse:
+        """Validate a handler result and encode it as a gRPC response.
+
+        The route's precompiled serializer validates the result and writes
+        it straight into the response message; nothing is logged unless
+        validation fails. ``bytes``, ``bytearray`` and ``memoryview``
+        results are sent as the response's binary attachment instead.
+
+        Args:
+            func_detail: Details of the route that produced the result
+            response: Handler return value, a dict or a model instance
+            codec: Payload codec to answer with; None encodes a Struct
+
+        Returns:
+            Encoded gRPC response
+        """
+        if isinstance(response, BINARY_TYPES):
+            return GrpcResponse(result=True, status_code=OK_STATUS, attachment=bytes(response))
+
+        serializer = func_detail.serializer
+        try:
+            validated = serializer.validate(response)
+        except ValidationError as error:
+            logger.error(f"Response validation failed: {error}")
+            grpc_response = GrpcResponse(
+                result=False,
+                status_code=EXCEPTIONS_MAPPING[StatusCode.INVALID_ARGUMENT],
+                message="Response does not match expected model",
+            )
+            if codec is not None:
+                grpc_response.payload = codec.encode({})
+                grpc_response.codec = codec.name
+            return grpc_response
+
+        # Answer in the codec the client negotiated
+        if codec is not None:
             return GrpcResponse(
-                result=result,
-                status_code=status_code,
-                data=struct_response,
-                message=message,
+                result=True,
+                status_code=OK_STATUS,
+                payload=serializer.encode(validated, codec),
+                codec=codec.name,
             )
 
+        grpc_response = GrpcResponse(result=True, status_code=OK_STATUS)
+        grpc_response.data.update(serializer.dump(validated))
+        return grpc_response
+
+    @staticmethod
+    def _error_response(error: BaseGrpcServerException) -> GrpcResponse:
+        """Build the response for a known server exception.
+
+        Args:
+            error: Raised server exception
+
+        Returns:
+            Failed gRPC response carrying the mapped status code
+        """
+        # context.set_details(error.details)
+        # context.set_code(error.code)
+        # return context
+        logger.error(f"Server exception: {error}")
+        status_code = EXCEPTIONS_MAPPING.get(error.code, StatusCode.INTERNAL)
+        return GrpcResponse(
+            result=False,
+            status_code=status_code,
+            data={},
+            message=error.details,
+        )
+
+    @staticmethod
+    def _internal_error_response(error: Exception) -> GrpcResponse:
+        """Build the response for an unexpected exception in a batch item.
+
+        Args:
+            error: Unexpected exception
+
+        Returns:
+            Failed gRPC response with status 500
+        """
+        logger.error(f"Internal server error: {error}")
+        return GrpcResponse(
+            result=False,
+            status_code=EXCEPTIONS_MAPPING[StatusCode.INTERNAL],
+            data={},
+            message=f"Internal server error: {error}",
+        )
+
+    @staticmethod
+    def _internal_error(error: Exception, context: Any) -> str:
+        """Log an unexpected exception and mark the call as failed.
+
+        Args:
+            error: Unexpected exception
+            context: gRPC server context
+
+        Returns:
+            Details sent to the client
+        """
+        logger.error(f"Internal server error: {error}")
+        details = f"Internal server error: {error}"
+        context.set_details(details)
+        context.set_code(StatusCode.INTERNAL)
+        return details
+
+
+class AsyncGrpcManager(GrpcManager):
+    """asyncio variant of :class:`GrpcManager` for ``grpc.aio`` servers.
+
+    ``async def`` handlers are awaited on the event loop. Plain handlers
+    are offloaded to an executor so they never block the loop.
+    """
+
+    def __init__(
+        self,
+        router: GrpcRouter,
+        executor: Executor | None = None,
+        batch_workers: int = 10,
+        max_batch_items: int = 1000,
+    ) -> None:
+        """Initialize the asyncio gRPC manager.
+
+        Args:
+            router: Router instance to use for dispatching
+            executor: Executor for sync handlers (default: the loop's
+                default executor)
+            batch_workers: Items of a parallel batch run at once
+            max_batch_items: Largest batch accepted; larger ones fail with
+                INVALID_ARGUMENT
+        """
+        super().__init__(
+            router=router,
+            executor=executor,
+            batch_workers=batch_workers,
+            max_batch_items=max_batch_items,
+        )
+
+    async def Dispatch(  # type: ignore[override]
+        self, request: Any, context: grpc.aio.ServicerContext
+    ) -> GrpcResponse:
+        """Handle incoming gRPC requests.
+
+        Args:
+            request: gRPC request object
+            context: gRPC asyncio server context
+
+        Returns:
+            GrpcResponse; unexpected errors abort the call with INTERNAL
+        """
+        try:
+            return await self._handle_async(request, context)
+
         except BaseGrpcServerException as error:
-            # Handle known server exceptions
-            # context.set_details(error.details)
-            # context.set_code(error.code)
-            # return context
-            logger.error(f"Server exception: {error}")
-            status_code = EXCEPTIONS_MAPPING.get(error.code, StatusCode.INTERNAL)
-            return GrpcResponse(
-                result=False,
-                status_code=status_code,
-                data={},
-                message=error.details,
+            return self._error_response(error)
+
+        except Exception as error:
+            details = self._internal_error(error, context)
+            await context.abort(StatusCode.INTERNAL, details)
+
+    async def DispatchStream(  # type: ignore[override]
+        self, request: Any, context: grpc.aio.ServicerContext
+    ) -> AsyncIterator[GrpcResponse]:
+        """Handle server-streaming requests.
+
+        Async generator handlers are iterated on the event loop. Sync
+        generators are advanced one item at a time on the executor, so a
+        slow producer never blocks the loop.
+
+        Args:
+            request: gRPC request object
+            context: gRPC asyncio server context
+
+        Yields:
+            One GrpcResponse per chunk
+        """
+        metrics = None
+        status_code = INTERNAL_STATUS
+        sent = 0
+        compression = None
+        admitted = ()
+        call = self._call_context(context)
+        try:
+            func_detail, path_params, metrics = self._route(request)
+            started = metrics.start()
+            codec = self._request_codec(request)
+            with call_scope(call):
+                call.check()
+                # A stream holds its slot until the last chunk is sent
+                admitted = self._admit(func_detail)
+                func_arguments = self._bind(request, codec, func_detail, path_params)
+                chunks = await self._call_handler_async(
+                    func_detail, func_arguments, request, path_params, context
+                )
+
+                status_code = OK_STATUS
+                compression = self._stream_compression(func_detail, context)
+                if hasattr(chunks, "__aiter__"):
+                    async for chunk in chunks:
+                        call.check()
+                        grpc_response = self._build_response(func_detail, chunk, codec)
+                        status_code = grpc_response.status_code
+                        sent += self._chunk_size(grpc_response, compression, context)
+                        yield grpc_response
+                    return
+
+                if isinstance(chunks, (dict, *BINARY_TYPES)):
+                    chunks = (chunks,)
+
+                # Sync generators run on the executor, in this call's context
+                scope = contextvars.copy_context()
+                loop = asyncio.get_running_loop()
+                iterator = iter(chunks)
+                done = object()
+                while True:
+                    chunk = await loop.run_in_executor(
+                        self.executor, scope.run, next, iterator, done
+                    )
+                    if chunk is done:
+                        break
+                    call.check()
+                    grpc_response = self._build_response(func_detail, chunk, codec)
+                    status_code = grpc_response.status_code
+                    sent += self._chunk_size(grpc_response, compression, context)
+                    yield grpc_response
+
+        except (GeneratorExit, asyncio.CancelledError):
+            status_code = DEADLINE_STATUS if call.expired else CLIENT_CLOSED
+            raise
+
+        except CallAbandoned as error:
+            status_code = self._status_of(self._abandoned(error))
+
+        except BaseGrpcServerException as error:
+            status_code = self._status_of(error)
+            yield self._error_response(error)
+
+        except Exception as error:
+            status_code = INTERNAL_STATUS
+            details = self._internal_error(error, context)
+            await context.abort(StatusCode.INTERNAL, details)
+
+        finally:
+            if admitted:
+                self._release(admitted, status_code)
+            if metrics is not None:
+                metrics.record_bytes(request.ByteSize(), sent, compression is not None)
+                metrics.finish(started, status_code)
+
+    async def DispatchBatch(  # type: ignore[override]
+        self, request: Any, context: grpc.aio.ServicerContext
+    ) -> GrpcBatchResponse:
+        """Handle many routed requests in one round trip.
+
+        Args:
+            request: gRPC batch request object
+            context: gRPC asyncio server context
+
+        Returns:
+            One response per request, in request order
+        """
+        too_large = self._batch_too_large(request)
+        if too_large is not None:
+            await context.abort(StatusCode.INVALID_ARGUMENT, too_large)
+        if request.parallel:
+            # At most batch_workers items in flight, sync handlers included
+            semaphore = asyncio.Semaphore(self.batch_workers)
+
+            async def bounded(item: Any) -> GrpcResponse:
+                async with semaphore:
+                    return await self._handle_item_async(item, context)
+
+            responses = await asyncio.gather(*(bounded(item) for item in request.requests))
+        else:
+            responses = [
+                await self._handle_item_async(item, context) for item in request.requests
+            ]
+        batch = GrpcBatchResponse(responses=responses)
+        if self._compress_batch(batch, context):
+            await self._announce_compression(context)
+        return batch
+
+    async def DispatchUpload(  # type: ignore[override]
+        self, request_iterator: AsyncIterable[Any], context: grpc.aio.ServicerContext
+    ) -> GrpcResponse:
+        """Handle a request whose attachment is streamed in chunks.
+
+        Args:
+            request_iterator: Messages of the upload
+            context: gRPC asyncio server context
+
+        Returns:
+            GrpcResponse; unexpected errors abort the call with INTERNAL
+        """
+        try:
+            request = await self._join_upload_async(request_iterator)
+            return await self._handle_async(request, context)
+
+        except BaseGrpcServerException as error:
+            return self._error_response(error)
+
+        except Exception as error:
+            details = self._internal_error(error, context)
+            await context.abort(StatusCode.INTERNAL, details)
+
+    @staticmethod
+    async def _join_upload_async(request_iterator: AsyncIterable[Any]) -> UploadedRequest:
+        """Receive every message of an upload and join its attachment.
+
+        Raises:
+            InvalidArgumentException: If the upload has no message
+        """
+        first = None
+        chunks = []
+        size = 0
+        async for message in request_iterator:
+            if first is None:
+                first = message
+            chunks.append(message.attachment)
+            size += message.ByteSize()
+        if first is None:
+            raise InvalidArgumentException("Upload without a request message")
+        return UploadedRequest(first, b"".join(chunks), size)
+
+    async def Stats(  # type: ignore[override]
+        self, request: Any, context: grpc.aio.ServicerContext
+    ) -> GrpcStatsResponse:
+        """Report per-route request metrics.
+
+        Args:
+            request: gRPC stats request object
+            context: gRPC asyncio server context
+
+        Returns:
+            Route metrics as a Struct, plus the Prometheus exposition when
+            ``format`` is "prometheus"
+        """
+        return self._stats_response(request)
+
+    async def Schema(  # type: ignore[override]
+        self, request: Any, context: grpc.aio.ServicerContext
+    ) -> GrpcSchemaResponse:
+        """Describe the typed per-route RPCs.
+
+        Args:
+            request: gRPC schema request object
+            context: gRPC asyncio server context
+
+        Returns:
+            Descriptor of the typed service and the RPC of every route
+        """
+        return self._schema_response
+
+    async def _dispatch_typed(  # type: ignore[override]
+        self, route: TypedRoute, payload: bytes, context: grpc.aio.ServicerContext
+    ) -> bytes:
+        """Serve a unary typed RPC.
+
+        Args:
+            route: Typed route the RPC belongs to
+            payload: Serialized request message
+            context: gRPC asyncio server context
+
+        Returns:
+            Serialized response message; empty when the call failed
+        """
+        if self._stale_schema(context):
+            return b""
+        try:
+            response = await self._handle_async(self._typed_request(route, payload), context)
+        except BaseGrpcServerException as error:
+            response = self._error_response(error)
+        except Exception as error:
+            self._internal_error(error, context)
+            return b""
+        if not response.result:
+            self._typed_failure(response, context)
+        return response.payload
+
+    async def _dispatch_typed_stream(  # type: ignore[override]
+        self, route: TypedRoute, payload: bytes, context: grpc.aio.ServicerContext
+    ) -> AsyncIterator[bytes]:
+        """Serve a server-streaming typed RPC.
+
+        Args:
+            route: Typed route the RPC belongs to
+            payload: Serialized request message
+            context: gRPC asyncio server context
+
+        Yields:
+            Serialized response messages
+        """
+        if self._stale_schema(context):
+            return
+        try:
+            request = self._typed_request(route, payload)
+        except BaseGrpcServerException as error:
+            self._typed_failure(self._error_response(error), context)
+            return
+        async for response in self.DispatchStream(request, context):
+            if not response.result:
+                self._typed_failure(response, context)
+                return
+            yield response.payload
+
+    async def _handle_async(
+        self, request: Any, context: Any, compress: bool = True
+    ) -> GrpcResponse:
+        """Route a single request and record its metrics.
+
+        Args:
+            request: gRPC request object
+            context: gRPC asyncio server context
+            compress: Apply the route's compression policy to the call
+
+        Returns:
+            Encoded gRPC response
+
+        Raises:
+            BaseGrpcServerException: For known routing or validation errors,
+                or when the caller gave up
+        """
+        func_detail, path_params, metrics = self._route(request)
+        started = metrics.start()
+        status_code = INTERNAL_STATUS
+        admitted = ()
+        call = self._call_context(context)
+        try:
+            with call_scope(call):
+                call.check()
+                admitted = self._admit(func_detail)
+                grpc_response = await self._respond_async(
+                    request, context, func_detail, path_params, call
+                )
+            status_code = grpc_response.status_code
+            if self._account(
+                request, grpc_response, func_detail, metrics, context, compress
+            ):
+                await self._announce_compression(context)
+            return grpc_response
+        except asyncio.CancelledError:
+            # grpc.aio cancels the handler task when the deadline passes too
+            status_code = DEADLINE_STATUS if call.expired else CLIENT_CLOSED
+            raise
+        except CallAbandoned as error:
+            abandoned = self._abandoned(error)
+            status_code = self._status_of(abandoned)
+            raise abandoned from None
+        except BaseGrpcServerException as error:
+            status_code = self._status_of(error)
+            raise
+        finally:
+            if admitted:
+                self._release(admitted, status_code)
+            metrics.finish(started, status_code)
+
+    async def _respond_async(
+        self,
+        request: Any,
+        context: Any,
+        func_detail: FunctionDetails,
+        path_params: dict[str, Any],
+        call: CallContext,
+    ) -> GrpcResponse:
+        """Bind, call and encode a routed request.
+
+        Args:
+            request: gRPC request object
+            context: gRPC asyncio server context
+            func_detail: Details of the matched route
+            path_params: Parameters captured from the URL
+            call: Deadline and cancellation state of the call
+
+        Returns:
+            Encoded gRPC response
+
+        Raises:
+            BaseGrpcServerException: For known validation errors
+            CallAbandoned: If the caller is gone once the handler returns
+        """
+        codec = self._request_codec(request)
+
+        # Serve cached GET routes before binding
+        cache_key, cached = self._cache_lookup(func_detail, request)
+        if cached is not None:
+            return cached
+
+        async def produce() -> GrpcResponse:
+            func_arguments = self._bind(request, codec, func_detail, path_params)
+            response = await self._call_handler_async(
+                func_detail, func_arguments, request, path_params, context
             )
 
+            call.check()
+            grpc_response = self._build_response(func_detail, response, codec)
+            self._cache_store(func_detail, cache_key, grpc_response)
+            return grpc_response
+
+        if func_detail.coalescer is None:
+            return await produce()
+        return await func_detail.coalescer.run_async(
+            self._coalesce_key(request, cache_key), produce
+        )
+
+    @staticmethod
+    def _call_context(context: Any) -> CallContext:
+        """Read the deadline and cancellation state of a call.
+
+        Args:
+            context: gRPC asyncio server context
+
+        Returns:
+            Call context made current while the request is handled
+        """
+        return CallContext.from_timeout(
+            context.time_remaining(), lambda: not context.cancelled()
+        )
+
+    @staticmethod
+    async def _announce_compression(context: Any) -> None:
+        """Send the initial metadata of a compressed unary response.
+
+        grpc.aio leaves the compression chosen with ``set_compression`` out
+        of the metadata it sends along with a unary response, which then
+        goes out uncompressed; sending the metadata first includes it.
+
+        Args:
+            context: gRPC asyncio server context
+        """
+        try:
+            await context.send_initial_metadata(())
+        except grpc.aio.UsageError:
+            # The handler already sent it: nothing left to announce
+            pass
+
+    async def _handle_item_async(self, request: Any, context: Any) -> GrpcResponse:
+        """Handle a batch item, turning every error into its own response.
+
+        Args:
+            request: gRPC request object
+            context: gRPC asyncio server context of the batch call
+
+        Returns:
+            Encoded gRPC response, failed if the item raised
+        """
+        try:
+            return await self._handle_async(request, context, compress=False)
+        except BaseGrpcServerException as error:
+            return self._error_response(error)
         except Exception as error:
-            # Handle unexpected exceptions
-            logger.error(f"Internal server error: {error}")
-            error_message = str(error)
-            context.set_details(f"Internal server error: {error_message}")
-            context.set_code(StatusCode.INTERNAL)
-            return context
+            return self._internal_error_response(error)
+
+    async def _call_handler_async(
+        self,
+        func_detail: FunctionDetails,
+        func_arguments: dict[str, Any],
+        request: Any,
+        path_params: dict[str, Any],
+        context: Any,
+    ) -> Any:
+        """Call a route handler through its asyncio middleware chain, if any.
+
+        Args:
+            func_detail: Details of the matched route
+            func_arguments: Validated handler arguments
+            request: gRPC request object
+            path_params: Parameters captured from the URL
+            context: gRPC asyncio server context
+
+        Returns:
+            Handler (or middleware) result
+        """
+        if func_detail.async_middleware is None:
+            return await self._invoke_async(func_detail, func_arguments)
+
+        return await func_detail.async_middleware(
+            self._middleware_request(func_arguments, request, path_params, context),
+            lambda middleware_request: self._invoke_async(
+                func_detail, middleware_request.arguments
+            ),
+        )
+
+    async def _invoke_async(
+        self, func_detail: FunctionDetails, func_arguments: dict[str, Any]
+    ) -> Any:
+        """Await async handlers and offload sync ones to the executor.
+
+        Sync handlers of an executor group run on the group's threads;
+        ``async def`` handlers stay on the event loop.
+
+        Args:
+            func_detail: Details of the matched route
+            func_arguments: Validated handler arguments
+
+        Returns:
+            Handler return value; async generator handlers return the
+            generator unconsumed
+        """
+        if func_detail.executor == PROCESS:
+            return await self.router.process_pool.run_async(func_detail.func, func_arguments)
+        if func_detail.executor_group is not None and not func_detail.is_coroutine:
+            return await func_detail.executor_group.run_async(func_detail.func, func_arguments)
+        if func_detail.is_coroutine:
+            return await func_detail.func(**func_arguments)
+        if func_detail.is_async_generator:
+            return func_detail.func(**func_arguments)
+        # Copy the context so the handler sees the current call
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            functools.partial(
+                contextvars.copy_context().run, func_detail.func, **func_arguments
+            ),
+        )
+
+
+def add_manager_to_server(manager: GrpcManager, server: Any) -> None:
+    """Serve a manager's generic RPCs and typed per-route RPCs.
+
+    Args:
+        manager: Manager holding the routes
+        server: gRPC server, sync or asyncio, not started yet
+    """
+    add_GrpcHandlerServicer_to_server(manager, server)
+    server.add_generic_rpc_handlers((manager.typed_service(),))
@@ -0,0 +1,140 @@
+"""Path template matching for router URLs."""
+
+import re
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+# Segment converters usable as ``{name:type}`` in a path template.
+# ``str`` is the default and is always tried last at a given position.
+PARAM_CONVERTERS: dict[str, Callable[[str], Any]] = {
+    "int": int,
+    "float": float,
+    "str": str,
+}
+
+_PARAM_PATTERN = re.compile(
+    r"^\{(?P<name>[A-Za-z_][A-Za-z0-9_]*)(?::(?P<type>[A-Za-z_]+))?\}$"
+)
+
+
+def is_template(url: str) -> bool:
+    """Check whether a URL contains path parameters.
+
+    Args:
+        url: URL path
+
+    Returns:
+        True if the URL has at least one ``{param}`` segment
+    """
+    return "{" in url
+
+
+class _Node(Generic[T]):
+    """Trie node for a single path segment."""
+
+    __slots__ = ("static", "params", "value")
+
+    def __init__(self) -> None:
+        self.static: dict[str, _Node[T]] = {}
+        # (name, type, converter, child) in match priority order
+        self.params: list[tuple[str, str, Callable[[str], Any], _Node[T]]] = []
+        self.value: Optional[T] = None
+
+
+class RouteMatcher(Generic[T]):
+    """Segment trie matching URLs against path templates.
+
+    Templates are split on ``/`` and stored one segment per level, so a
+    lookup costs one step per URL segment regardless of how many
+    templates are registered. Static segments are preferred over
+    parameters; typed parameters are tried before ``str`` ones.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty matcher."""
+        self._root: _Node[T] = _Node()
+
+    def add(self, template: str, value: T) -> None:
+        """Register a path template.
+
+        Args:
+            template: URL template such as ``/users/{id:int}``
+            value: Value returned when the template matches
+
+        Raises:
+            ValueError: If a parameter segment is malformed or uses an
+                unknown converter
+        """
+        node = self._root
+        for segment in template.split("/"):
+            if not is_template(segment):
+                node = node.static.setdefault(segment, _Node())
+                continue
+            node = self._param_child(node, segment, template)
+        node.value = value
+
+    @staticmethod
+    def _param_child(node: _Node[T], segment: str, template: str) -> _Node[T]:
+        """Find or create the child node for a parameter segment."""
+        match = _PARAM_PATTERN.match(segment)
+        if match is None:
+            raise ValueError(f"Invalid path parameter {segment!r} in {template}")
+
+        name, type_name = match.group("name"), match.group("type") or "str"
+        if type_name not in PARAM_CONVERTERS:
+            raise ValueError(f"Unknown path parameter type {type_name!r} in {template}")
+
+        for param_name, param_type, _, child in node.params:
+            if param_name == name and param_type == type_name:
+                return child
+
+        child: _Node[T] = _Node()
+        node.params.append((name, type_name, PARAM_CONVERTERS[type_name], child))
+        node.params.sort(key=lambda param: param[1] == "str")
+        return child
+
+    def match(self, url: str) -> Optional[tuple[T, dict[str, Any]]]:
+        """Match a URL against the registered templates.
+
+        Args:
+            url: Concrete request URL
+
+        Returns:
+            (value, captured parameters) or None if nothing matches
+        """
+        params: dict[str, Any] = {}
+        value = self._match(self._root, url.split("/"), 0, params)
+        if value is None:
+            return None
+        return value, params
+
+    def _match(
+        self, node: _Node[T], segments: list[str], index: int, params: dict[str, Any]
+    ) -> Optional[T]:
+        """Walk the trie from ``node``, backtracking on dead ends."""
+        if index == len(segments):
+            return node.value
+
+        segment = segments[index]
+        child = node.static.get(segment)
+        if child is not None:
+            value = self._match(child, segments, index + 1, params)
+            if value is not None:
+                return value
+
+        if not segment:
+            return None
+
+        for name, _, converter, child in node.params:
+            try:
+                params[name] = converter(segment)
+            except ValueError:
+                continue
+            value = self._match(child, segments, index + 1, params)
+            if value is not None:
+                return value
+            del params[name]
+
+        return None
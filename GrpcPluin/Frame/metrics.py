@@ -0,0 +1,291 @@
+"""Per-route request metrics and latency histograms."""
+
+import bisect
+import threading
+import time
+from typing import Any, Iterable
+
+
+# Histogram upper bounds in seconds: 1, 1.5, 2, 2.5, 3, 4, 5, 6, 7, 8, 9
+# times every power of ten from 10us to 100s.
+_MANTISSAS = (1.0, 1.5, 2.0, 2.5, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0)
+LATENCY_BOUNDS: tuple[float, ...] = tuple(
+    round(mantissa * 10.0**exponent, 9)
+    for exponent in range(-5, 2)
+    for mantissa in _MANTISSAS
+) + (100.0,)
+
+# Coarser subset of LATENCY_BOUNDS used for the Prometheus exposition.
+PROMETHEUS_BOUNDS: tuple[float, ...] = tuple(
+    round(mantissa * 10.0**exponent, 9)
+    for exponent in range(-5, 2)
+    for mantissa in (1.0, 2.5, 5.0)
+) + (100.0,)
+
+# Status recorded when the client goes away before the response is sent.
+CLIENT_CLOSED = 499
+
+
+class _Shard:
+    """Counters written by a single thread."""
+
+    __slots__ = (
+        "requests",
+        "in_flight",
+        "statuses",
+        "buckets",
+        "latency_sum",
+        "bytes_received",
+        "bytes_sent",
+        "compressed",
+    )
+
+    def __init__(self) -> None:
+        self.requests: int = 0
+        self.in_flight: int = 0
+        self.statuses: dict[int, int] = {}
+        # One extra bucket for observations above the last bound
+        self.buckets: list[int] = [0] * (len(LATENCY_BOUNDS) + 1)
+        self.latency_sum: float = 0.0
+        self.bytes_received: int = 0
+        self.bytes_sent: int = 0
+        self.compressed: int = 0
+
+
+class RouteMetrics:
+    """Request counters and latency histogram for one route and method.
+
+    Every thread writes to its own shard, so recording never takes a
+    lock; readers merge the shards. Readers may see a request a moment
+    late, never a torn or lost update.
+    """
+
+    def __init__(self, method: str, url: str) -> None:
+        """Initialize empty metrics.
+
+        Args:
+            method: HTTP method of the route
+            url: URL template of the route
+        """
+        self.method: str = method
+        self.url: str = url
+        self._local = threading.local()
+        self._shards: list[_Shard] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> _Shard:
+        """Return the calling thread's shard, creating it on first use."""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = _Shard()
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def start(self) -> float:
+        """Mark a request as in flight.
+
+        Returns:
+            Start timestamp to pass to :meth:`finish`
+        """
+        self._shard().in_flight += 1
+        return time.perf_counter()
+
+    def finish(self, started: float, status_code: int) -> None:
+        """Record a finished request.
+
+        Args:
+            started: Timestamp returned by :meth:`start`
+            status_code: HTTP-style status code sent to the client
+        """
+        elapsed = time.perf_counter() - started
+        shard = self._shard()
+        shard.in_flight -= 1
+        shard.requests += 1
+        shard.statuses[status_code] = shard.statuses.get(status_code, 0) + 1
+        shard.buckets[bisect.bisect_left(LATENCY_BOUNDS, elapsed)] += 1
+        shard.latency_sum += elapsed
+
+    def record_bytes(self, received: int, sent: int, compressed: bool) -> None:
+        """Record the message sizes of a request.
+
+        Sizes are those of the protobuf messages, before gRPC compresses
+        them for the wire.
+
+        Args:
+            received: Size of the request message in bytes
+            sent: Size of the response message(s) in bytes
+            compressed: Whether the response was sent compressed
+        """
+        shard = self._shard()
+        shard.bytes_received += received
+        shard.bytes_sent += sent
+        shard.compressed += compressed
+
+    def snapshot(self) -> dict[str, Any]:
+        """Merge the shards into a point-in-time view.
+
+        Returns:
+            Dictionary with requests, errors, in_flight, statuses,
+            latency percentiles (seconds), histogram buckets, message
+            bytes received and sent, and compressed responses
+        """
+        with self._shards_lock:
+            shards = list(self._shards)
+
+        requests = in_flight = 0
+        bytes_received = bytes_sent = compressed = 0
+        latency_sum = 0.0
+        statuses: dict[int, int] = {}
+        buckets = [0] * (len(LATENCY_BOUNDS) + 1)
+        for shard in shards:
+            requests += shard.requests
+            in_flight += shard.in_flight
+            latency_sum += shard.latency_sum
+            bytes_received += shard.bytes_received
+            bytes_sent += shard.bytes_sent
+            compressed += shard.compressed
+            for status, count in list(shard.statuses.items()):
+                statuses[status] = statuses.get(status, 0) + count
+            for index, count in enumerate(shard.buckets):
+                buckets[index] += count
+
+        return {
+            "requests": requests,
+            "errors": sum(count for status, count in statuses.items() if status >= 400),
+            "in_flight": in_flight,
+            "statuses": statuses,
+            "latency_sum": latency_sum,
+            "p50": _percentile(buckets, 0.50),
+            "p99": _percentile(buckets, 0.99),
+            "p999": _percentile(buckets, 0.999),
+            "buckets": buckets,
+            "bytes_received": bytes_received,
+            "bytes_sent": bytes_sent,
+            "compressed_responses": compressed,
+        }
+
+
+def _percentile(buckets: list[int], quantile: float) -> float:
+    """Estimate a quantile by interpolating inside its histogram bucket."""
+    total = sum(buckets)
+    if total == 0:
+        return 0.0
+
+    rank = quantile * total
+    seen = 0
+    for index, count in enumerate(buckets):
+        if count and seen + count >= rank:
+            lower = LATENCY_BOUNDS[index - 1] if index > 0 else 0.0
+            upper = LATENCY_BOUNDS[index] if index < len(LATENCY_BOUNDS) else lower
+            return lower + (upper - lower) * (rank - seen) / count
+        seen += count
+    return LATENCY_BOUNDS[-1]
+
+
+class MetricsRegistry:
+    """All route metrics of a router, plus requests that matched no route."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self.routes: dict[tuple[str, str], RouteMetrics] = {}
+        self.unmatched: RouteMetrics = RouteMetrics("*", "<unmatched>")
+
+    def route(self, method: str, url: str) -> RouteMetrics:
+        """Return the metrics of a route, creating them if needed.
+
+        Args:
+            method: HTTP method
+            url: URL template
+
+        Returns:
+            Route metrics
+        """
+        key = (method, url)
+        metrics = self.routes.get(key)
+        if metrics is None:
+            metrics = self.routes[key] = RouteMetrics(method, url)
+        return metrics
+
+    def _all(self) -> Iterable[RouteMetrics]:
+        """Yield every route's metrics followed by the unmatched bucket."""
+        yield from list(self.routes.values())
+        yield self.unmatched
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return a JSON-friendly snapshot of every route.
+
+        Histogram buckets are omitted and status codes become strings.
+
+        Returns:
+            Mapping of ``"METHOD url"`` to route statistics
+        """
+        result: dict[str, dict[str, Any]] = {}
+        for metrics in self._all():
+            snapshot = metrics.snapshot()
+            if not snapshot["requests"] and not snapshot["in_flight"]:
+                continue
+            snapshot.pop("buckets")
+            snapshot["statuses"] = {
+                str(status): count for status, count in snapshot["statuses"].items()
+            }
+            result[f"{metrics.method} {metrics.url}"] = snapshot
+        return result
+
+    def to_prometheus(self, prefix: str = "grpcplugin") -> str:
+        """Render every route in the Prometheus text exposition format.
+
+        Args:
+            prefix: Metric name prefix
+
+        Returns:
+            Exposition text
+        """
+        routes = [
+            (f'method="{metrics.method}",route="{_escape(metrics.url)}"', metrics.snapshot())
+            for metrics in self._all()
+        ]
+        duration = f"{prefix}_request_duration_seconds"
+
+        # Every metric family is emitted as one contiguous group
+        lines = [f"# TYPE {prefix}_requests_total counter"]
+        for labels, snapshot in routes:
+            lines.append(f"{prefix}_requests_total{{{labels}}} {snapshot['requests']}")
+
+        lines.append(f"# TYPE {prefix}_responses_total counter")
+        for labels, snapshot in routes:
+            for status, count in sorted(snapshot["statuses"].items()):
+                lines.append(f'{prefix}_responses_total{{{labels},status="{status}"}} {count}')
+
+        lines.append(f"# TYPE {prefix}_in_flight gauge")
+        for labels, snapshot in routes:
+            lines.append(f"{prefix}_in_flight{{{labels}}} {snapshot['in_flight']}")
+
+        for name, key in (
+            ("received_bytes_total", "bytes_received"),
+            ("sent_bytes_total", "bytes_sent"),
+            ("compressed_responses_total", "compressed_responses"),
+        ):
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for labels, snapshot in routes:
+                lines.append(f"{prefix}_{name}{{{labels}}} {snapshot[key]}")
+
+        lines.append(f"# TYPE {duration} histogram")
+        for labels, snapshot in routes:
+            cumulative = 0
+            buckets = snapshot["buckets"]
+            for index, bound in enumerate(LATENCY_BOUNDS):
+                cumulative += buckets[index]
+                if bound in PROMETHEUS_BOUNDS:
+                    lines.append(f'{duration}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+            lines.append(f'{duration}_bucket{{{labels},le="+Inf"}} {snapshot["requests"]}')
+            lines.append(f"{duration}_sum{{{labels}}} {snapshot['latency_sum']}")
+            lines.append(f"{duration}_count{{{labels}}} {snapshot['requests']}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
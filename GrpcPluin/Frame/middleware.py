@@ -0,0 +1,196 @@
+"""Middleware pipeline around route handlers."""
+
+import inspect
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+
+@dataclass
+class MiddlewareRequest:
+    """A routed request as seen by middleware.
+
+    Attributes:
+        method: HTTP method of the route
+        url: Request URL
+        path_params: Parameters captured from the URL template
+        arguments: Validated handler arguments; middleware may edit them
+        metadata: gRPC invocation metadata (e.g. auth headers)
+        state: Free-form storage shared between hooks of one request
+    """
+
+    method: str
+    url: str
+    path_params: dict[str, Any]
+    arguments: dict[str, Any]
+    metadata: dict[str, Any] = field(default_factory=dict)
+    state: dict[str, Any] = field(default_factory=dict)
+
+
+class Middleware:
+    """Base class for middleware.
+
+    Override ``before`` and/or ``after``; either may be ``async def``,
+    in which case the middleware only runs on the asyncio server.
+
+    ``before`` runs ahead of the handler. Returning None (or the request
+    itself) continues; returning anything else short-circuits: the
+    handler and inner middleware are skipped and the value is used as
+    the handler result. ``after`` receives the handler result (or the
+    short-circuit value) and returns the result to send.
+    """
+
+    def before(self, request: MiddlewareRequest) -> Any:
+        """Run before the handler.
+
+        Args:
+            request: Routed request
+
+        Returns:
+            None to continue, or a result to short-circuit with
+        """
+        return None
+
+    def after(self, request: MiddlewareRequest, response: Any) -> Any:
+        """Run after the handler.
+
+        Args:
+            request: Routed request
+            response: Handler result
+
+        Returns:
+            Result to send
+        """
+        return response
+
+
+class FunctionMiddleware(Middleware):
+    """Adapts a plain ``before`` function to :class:`Middleware`."""
+
+    def __init__(self, func: Callable[[MiddlewareRequest], Any]) -> None:
+        """Wrap a function.
+
+        Args:
+            func: Function called with the request before the handler
+        """
+        self.before = func  # type: ignore[method-assign]
+
+
+def as_middleware(middleware: Middleware | Callable) -> Middleware:
+    """Normalize a middleware instance, class or plain function.
+
+    Args:
+        middleware: Middleware instance, Middleware subclass, or function
+
+    Returns:
+        Middleware instance
+    """
+    if isinstance(middleware, Middleware):
+        return middleware
+    if isinstance(middleware, type) and issubclass(middleware, Middleware):
+        return middleware()
+    return FunctionMiddleware(middleware)
+
+
+Invoker = Callable[[MiddlewareRequest], Any]
+Chain = Callable[[MiddlewareRequest, Invoker], Any]
+AsyncInvoker = Callable[[MiddlewareRequest], Awaitable[Any]]
+AsyncChain = Callable[[MiddlewareRequest, AsyncInvoker], Awaitable[Any]]
+
+
+def _hooks(middleware: Middleware) -> tuple[Callable | None, Callable | None]:
+    """Return the hooks a middleware actually overrides."""
+    before = middleware.before
+    after = middleware.after
+    if getattr(before, "__func__", None) is Middleware.before:
+        before = None
+    if getattr(after, "__func__", None) is Middleware.after:
+        after = None
+    return before, after
+
+
+def compose(middlewares: list[Middleware]) -> Chain | None:
+    """Compose middleware into a single callable for the sync server.
+
+    Args:
+        middlewares: Middleware, outermost first
+
+    Returns:
+        ``chain(request, invoke)`` running every hook around ``invoke``,
+        or None when there is nothing to run
+
+    Raises:
+        TypeError: If any hook is ``async def``
+    """
+    chain: Chain | None = None
+    for middleware in reversed(middlewares):
+        before, after = _hooks(middleware)
+        if before is None and after is None:
+            continue
+        if inspect.iscoroutinefunction(before) or inspect.iscoroutinefunction(after):
+            raise TypeError(
+                f"{type(middleware).__name__} has async hooks and needs the asyncio server"
+            )
+        chain = _link(before, after, chain)
+    return chain
+
+
+def _link(before: Callable | None, after: Callable | None, inner: Chain | None) -> Chain:
+    """Wrap ``inner`` with one middleware's sync hooks."""
+
+    def chain(request: MiddlewareRequest, invoke: Invoker) -> Any:
+        response = before(request) if before is not None else None
+        if response is None or response is request:
+            response = inner(request, invoke) if inner is not None else invoke(request)
+        if after is not None:
+            response = after(request, response)
+        return response
+
+    return chain
+
+
+def compose_async(middlewares: list[Middleware]) -> AsyncChain | None:
+    """Compose middleware into a single coroutine function for asyncio.
+
+    Sync and async hooks can be mixed; whether to await each hook is
+    decided here, once, not per request.
+
+    Args:
+        middlewares: Middleware, outermost first
+
+    Returns:
+        ``chain(request, invoke)`` coroutine function, or None when there
+        is nothing to run
+    """
+    chain: AsyncChain | None = None
+    for middleware in reversed(middlewares):
+        before, after = _hooks(middleware)
+        if before is None and after is None:
+            continue
+        chain = _link_async(before, after, chain)
+    return chain
+
+
+def _link_async(
+    before: Callable | None, after: Callable | None, inner: AsyncChain | None
+) -> AsyncChain:
+    """Wrap ``inner`` with one middleware's hooks, awaiting async ones."""
+    await_before = inspect.iscoroutinefunction(before)
+    await_after = inspect.iscoroutinefunction(after)
+
+    async def chain(request: MiddlewareRequest, invoke: AsyncInvoker) -> Any:
+        response = None
+        if before is not None:
+            response = await before(request) if await_before else before(request)
+        if response is None or response is request:
+            if inner is not None:
+                response = await inner(request, invoke)
+            else:
+                response = await invoke(request)
+        if after is not None:
+            if await_after:
+                response = await after(request, response)
+            else:
+                response = after(request, response)
+        return response
+
+    return chain
@@ -0,0 +1,199 @@
+"""Pre-fork multi-process serving.
+
+The supervisor forks worker processes that each run their own gRPC
+server on the same port (SO_REUSEPORT lets the kernel spread incoming
+connections over them), restarts workers that die, and forwards
+SIGTERM/SIGINT so every worker shuts down gracefully.
+
+Workers are forked before any gRPC server exists in the supervisor,
+which is what makes forking safe with gRPC.
+"""
+
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Callable, Sequence
+
+logger = logging.getLogger(__name__)
+
+SHUTDOWN_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+# Supervisor polling interval, and how long a worker must live before its
+# restart backoff resets
+_POLL_INTERVAL = 0.2
+_HEALTHY_AFTER = 60.0
+_MAX_BACKOFF = 30.0
+
+
+def on_shutdown_signal(callback: Callable[[], None]) -> None:
+    """Call ``callback`` on SIGTERM or SIGINT instead of dying abruptly.
+
+    Only possible from the main thread; elsewhere this does nothing.
+
+    Args:
+        callback: Called from the signal handler
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for signum in SHUTDOWN_SIGNALS:
+        signal.signal(signum, lambda *_: callback())
+
+
+def _cpu_for(slot: int, cpu_affinity: bool | Sequence[int]) -> int | None:
+    """Pick the CPU a worker slot is pinned to, if any."""
+    if cpu_affinity is False or not hasattr(os, "sched_setaffinity"):
+        return None
+    cpus = sorted(os.sched_getaffinity(0)) if cpu_affinity is True else list(cpu_affinity)
+    return cpus[slot % len(cpus)] if cpus else None
+
+
+class _Slot:
+    """One worker position kept filled by the supervisor."""
+
+    __slots__ = ("index", "pid", "started_at", "failures", "next_start")
+
+    def __init__(self, index: int) -> None:
+        self.index: int = index
+        self.pid: int | None = None
+        self.started_at: float = 0.0
+        self.failures: int = 0
+        self.next_start: float = 0.0
+
+
+class Supervisor:
+    """Forks and supervises worker processes.
+
+    Attributes:
+        workers: Number of worker processes
+        cpu_affinity: False, True to pin worker ``i`` to the ``i``-th
+            available CPU, or an explicit list of CPUs to cycle through
+        grace: Seconds workers get to finish in-flight calls on shutdown
+            before they are killed
+    """
+
+    def __init__(
+        self,
+        serve: Callable[[int], None],
+        workers: int,
+        cpu_affinity: bool | Sequence[int] = False,
+        grace: float = 10.0,
+    ) -> None:
+        """Configure the supervisor.
+
+        Args:
+            serve: Run in every worker with its slot index; must serve
+                until a shutdown signal arrives
+            workers: Number of worker processes
+            cpu_affinity: CPU pinning, see the class attributes
+            grace: Graceful shutdown period in seconds
+
+        Raises:
+            RuntimeError: If the platform cannot fork
+        """
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Multi-process serving needs os.fork (POSIX only)")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        self.serve: Callable[[int], None] = serve
+        self.workers: int = workers
+        self.cpu_affinity: bool | Sequence[int] = cpu_affinity
+        self.grace: float = grace
+        self._slots: list[_Slot] = [_Slot(index) for index in range(workers)]
+        self._stopping_since: float | None = None
+
+    def run(self) -> None:
+        """Start every worker and supervise them until shut down."""
+        for signum in SHUTDOWN_SIGNALS:
+            signal.signal(signum, self._shutdown)
+        logger.info(f"Supervisor {os.getpid()} starting {self.workers} workers")
+
+        while True:
+            self._reap()
+            if self._stopping_since is None:
+                self._fill()
+            elif not any(slot.pid for slot in self._slots):
+                break
+            elif time.monotonic() - self._stopping_since > self.grace:
+                self._signal_all(signal.SIGKILL)
+            time.sleep(_POLL_INTERVAL)
+
+        logger.info("All workers stopped")
+
+    def _shutdown(self, signum: int, frame: object) -> None:
+        """Begin a graceful shutdown and forward it to every worker."""
+        if self._stopping_since is None:
+            logger.info(f"Received {signal.Signals(signum).name}, stopping workers")
+            self._stopping_since = time.monotonic()
+            self._signal_all(signal.SIGTERM)
+
+    def _signal_all(self, signum: int) -> None:
+        """Send a signal to every live worker."""
+        for slot in self._slots:
+            if slot.pid:
+                try:
+                    os.kill(slot.pid, signum)
+                except ProcessLookupError:
+                    pass
+
+    def _reap(self) -> None:
+        """Collect exited workers and schedule their restart."""
+        for slot in self._slots:
+            if not slot.pid:
+                continue
+            pid, status = os.waitpid(slot.pid, os.WNOHANG)
+            if pid == 0:
+                continue
+
+            slot.pid = None
+            if self._stopping_since is not None:
+                continue
+            lived = time.monotonic() - slot.started_at
+            slot.failures = 0 if lived > _HEALTHY_AFTER else slot.failures + 1
+            backoff = min(_MAX_BACKOFF, 0.5 * 2 ** max(slot.failures - 1, 0))
+            slot.next_start = time.monotonic() + backoff
+            logger.error(
+                f"Worker {slot.index} (pid {pid}) exited with status "
+                f"{os.waitstatus_to_exitcode(status)}; restarting in {backoff:.1f}s"
+            )
+
+    def _fill(self) -> None:
+        """Fork a worker into every empty slot whose backoff has elapsed."""
+        now = time.monotonic()
+        for slot in self._slots:
+            if slot.pid is None and now >= slot.next_start:
+                self._spawn(slot)
+
+    def _spawn(self, slot: _Slot) -> None:
+        """Fork one worker process."""
+        # Unflushed output would otherwise be written by both processes
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid:
+            slot.pid = pid
+            slot.started_at = time.monotonic()
+            logger.info(f"Worker {slot.index} started (pid {pid})")
+            return
+
+        # Child: drop the supervisor's signal handlers, pin, serve, exit
+        exit_code = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            cpu = _cpu_for(slot.index, self.cpu_affinity)
+            if cpu is not None:
+                os.sched_setaffinity(0, {cpu})
+            self.serve(slot.index)
+        except KeyboardInterrupt:
+            pass
+        except BaseException as error:
+            logger.exception(f"Worker {slot.index} failed: {error}")
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exit_code)
@@ -2,10 +2,26 @@
 
 from typing import Any, Callable
 
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel
 
+from GrpcPluin.compression import CompressionPolicy, as_policy
+
+from .admission import AdmissionController, Limit
+from .binder import ArgumentBinder, is_pydantic_model
+from .cache import CachePolicy, ResponseCache
+from .coalesce import CoalescePolicy, RequestCoalescer
 from .enums import FunctionDetails, METHODS
-from .exceptions.exceptions import NotFoundException, InvalidArgumentException
+from .exceptions.exceptions import NotFoundException
+from .executors import (
+    PROCESS,
+    ExecutorGroup,
+    ProcessPool,
+    check_group_handler,
+    check_process_handler,
+)
+from .matcher import RouteMatcher, is_template
+from .metrics import MetricsRegistry
+from .middleware import Middleware, as_middleware, compose, compose_async
 
 
 class GrpcRouter:
@@ -16,31 +32,69 @@ class GrpcRouter:
     """
 
     def __init__(self) -> None:
-        """Initialize the router with empty routes and middlewares."""
+        """Initialize the router with empty routes, middlewares and metrics."""
         self.routes: dict[str, dict[str, FunctionDetails]] = {
             "GET": {},
             "PUT": {},
             "DELETE": {},
             "POST": {},
         }
-        self.middlewares: list[Callable] = []
+        self.middlewares: list[Middleware] = []
+        self.metrics: MetricsRegistry = MetricsRegistry()
+        self.process_pool: ProcessPool = ProcessPool()
+        self.executor_groups: dict[str, ExecutorGroup] = {}
+        self.admission: AdmissionController | None = None
+        self.compression: CompressionPolicy | None = None
+        self._matchers: dict[str, RouteMatcher[FunctionDetails]] = {
+            method: RouteMatcher() for method in self.routes
+        }
 
     def __call__(
         self,
         url: str,
         methods: list[METHODS] | None = None,
         response_model: type[BaseModel] | None = None,
+        cache: CachePolicy | None = None,
+        middlewares: list[Middleware | Callable] | None = None,
+        executor: str | ExecutorGroup | None = None,
+        admission: Limit | AdmissionController | None = None,
+        revalidate_response: bool = True,
+        coalesce: bool | CoalescePolicy = False,
+        compression: CompressionPolicy | str | None = None,
     ) -> Callable:
         """Decorator to register a route handler.
 
         Args:
-            url: URL path for the route
+            url: URL path for the route, optionally with typed path
+                parameters such as ``/users/{id:int}``
             methods: List of HTTP methods (default: [GET])
             response_model: Optional Pydantic model for response validation
+            cache: Optional cache policy; only allowed on GET-only routes
+            middlewares: Middleware for this route only, run inside the
+                router-wide middleware
+            executor: "process" to run a CPU-bound handler in
+                ``self.process_pool`` instead of the server's threads; the
+                name of a group added with :meth:`add_executor_group`, or
+                an ExecutorGroup, to run it on that group's threads
+            admission: Concurrency limit of this route (e.g.
+                ``AIMDLimit()``), or a configured AdmissionController;
+                requests over it are rejected with status 429
+            revalidate_response: Validate handler results that already are
+                ``response_model`` instances; False only serializes them
+            coalesce: True or a CoalescePolicy to let identical concurrent
+                requests share one handler execution; only allowed on
+                GET-only routes
+            compression: Compression of the route's responses: a policy,
+                or "gzip", "deflate" or "none" with the default size
+                threshold; None uses ``self.compression``
 
         Returns:
             Decorator function
 
+        Raises:
+            ValueError: If a cache or coalescing is requested for a non-GET
+                method, or the executor is unknown or cannot run the handler
+
         Example:
             @router(url="/users", methods=[METHODS.POST])
             def create_user(user: User):
@@ -48,38 +102,128 @@ class GrpcRouter:
         """
         if methods is None:
             methods = [METHODS.GET]
+        if cache is not None and any(method != METHODS.GET for method in methods):
+            raise ValueError(f"Response caching is only supported on GET routes: {url}")
+        if coalesce is True:
+            coalesce = CoalescePolicy()
+        if coalesce and any(method != METHODS.GET for method in methods):
+            raise ValueError(f"Request coalescing is only supported on GET routes: {url}")
+        group = self._executor_group(executor, url)
+        if group is not None:
+            executor = group.name
 
         def decorator(func: Callable) -> Callable:
             """Inner decorator that registers the function."""
+            if executor == PROCESS:
+                check_process_handler(func)
+            if group is not None:
+                check_group_handler(func)
+            details = FunctionDetails(
+                func=func,
+                response_model=response_model,
+                cache=ResponseCache(cache) if cache is not None else None,
+                coalescer=RequestCoalescer(coalesce) if coalesce else None,
+                compression=as_policy(compression),
+                middlewares=[as_middleware(m) for m in middlewares or ()],
+                executor=executor,
+                executor_group=group,
+                admission=(
+                    AdmissionController(admission)
+                    if isinstance(admission, Limit)
+                    else admission
+                ),
+                revalidate_response=revalidate_response,
+            )
+            self._compose(details)
             for method in methods:
-                self.routes[method.value][url] = FunctionDetails(
-                    func=func, response_model=response_model
-                )
+                self.routes[method.value][url] = details
+                details.metrics[method.value] = self.metrics.route(method.value, url)
+                if is_template(url):
+                    self._matchers[method.value].add(url, details)
             return func
 
         return decorator
 
-    def _routing(self, method: str, url: str) -> FunctionDetails:
+    def add_executor_group(
+        self, name: str, workers: int = 4, max_queue: int | None = None
+    ) -> ExecutorGroup:
+        """Create a named thread pool that routes can share.
+
+        Args:
+            name: Name routes pass as ``executor``
+            workers: Threads of the group
+            max_queue: Calls allowed to wait for a thread (default: as many
+                as ``workers``); calls beyond are rejected with status 429
+
+        Returns:
+            The new group
+
+        Raises:
+            ValueError: If a group of that name exists or the size is invalid
+        """
+        if name in self.executor_groups:
+            raise ValueError(f"Executor group {name!r} already exists")
+        group = self.executor_groups[name] = ExecutorGroup(name, workers, max_queue)
+        return group
+
+    def _executor_group(
+        self, executor: str | ExecutorGroup | None, url: str
+    ) -> ExecutorGroup | None:
+        """Resolve a route's executor option to its group, if it names one.
+
+        Raises:
+            ValueError: If the executor is unknown, or another group has
+                the same name
+        """
+        if executor is None or executor == PROCESS:
+            return None
+        if isinstance(executor, ExecutorGroup):
+            registered = self.executor_groups.setdefault(executor.name, executor)
+            if registered is not executor:
+                raise ValueError(f"Executor group {executor.name!r} already exists")
+            return executor
+        if executor not in self.executor_groups:
+            raise ValueError(f"Unknown executor {executor!r} for route {url}")
+        return self.executor_groups[executor]
+
+    def _routing(self, method: str, url: str) -> tuple[FunctionDetails, dict[str, Any]]:
         """Find a registered route handler.
 
+        Static URLs are resolved with a single dict lookup; templated
+        routes fall back to the per-method matcher.
+
         Args:
             method: HTTP method as string
             url: URL path
 
         Returns:
-            Function details for the route
+            Function details for the route and the captured path parameters
 
         Raises:
             NotFoundException: If the route is not found
         """
-        try:
-            return self.routes[method][url]
-        except KeyError:
+        static_routes = self.routes.get(method)
+        if static_routes is None:
+            raise NotFoundException(f"No handler found for {method} {url}")
+
+        # Templates are stored under their pattern too: a request for the
+        # literal pattern must not reach the handler without its captures
+        func_detail = static_routes.get(url)
+        if func_detail is not None and not is_template(url):
+            return func_detail, {}
+
+        matched = self._matchers[method].match(url)
+        if matched is None:
             raise NotFoundException(f"No handler found for {method} {url}")
+        return matched
 
     def _declare_function_argument(self, func: Callable, request_data: dict) -> dict:
         """Extract and validate function arguments from request data.
 
+        Registered routes carry a precompiled binder in
+        ``FunctionDetails.binder``; this compiles one on the fly for
+        callers that only hold the function.
+
         Args:
             func: Handler function
             request_data: Request body data as dictionary
@@ -90,26 +234,7 @@ class GrpcRouter:
         Raises:
             InvalidArgumentException: If validation fails
         """
-        try:
-            func_params: dict[str, Any] = {}
-            annotations = getattr(func, "__annotations__", {})
-
-            for key, annotation_type in annotations.items():
-                # Skip 'return' annotation
-                if key == "return":
-                    continue
-
-                # Check if it's a Pydantic model
-                if self._is_pydantic_model(annotation_type):
-                    func_params[key] = annotation_type(**request_data)
-                elif key in request_data:
-                    func_params[key] = annotation_type(request_data[key])
-
-            return func_params
-
-        except ValidationError as error:
-            error_details = error.json()
-            raise InvalidArgumentException(f"Validation failed:\n{error_details}")
+        return ArgumentBinder(func).bind(request_data)
 
     @staticmethod
     def _is_pydantic_model(cls: type) -> bool:
@@ -121,7 +246,7 @@ class GrpcRouter:
         Returns:
             True if it's a Pydantic model
         """
-        return isinstance(cls, type) and issubclass(cls, BaseModel)
+        return is_pydantic_model(cls)
 
     def _call(self, func: Callable, request_data: dict) -> Any:
         """Call a handler function with request data.
@@ -135,10 +260,156 @@ class GrpcRouter:
         """
         return func(**request_data)
 
-    def add_middleware(self, func: Callable) -> None:
-        """Add middleware function.
+    def invalidate_cache(self, url: str | None = None) -> int:
+        """Drop cached GET responses.
 
         Args:
-            func: Middleware function to add
+            url: A route template to clear that whole route, a concrete URL
+                to drop only its entries, or None to clear every route
+
+        Returns:
+            Number of entries dropped
         """
-        self.middlewares.append(func)
+        if url is None:
+            return sum(
+                details.cache.invalidate()
+                for details in self.routes["GET"].values()
+                if details.cache is not None
+            )
+
+        details = self.routes["GET"].get(url)
+        if details is not None and is_template(url):
+            return details.cache.invalidate() if details.cache is not None else 0
+
+        try:
+            details, _ = self._routing("GET", url)
+        except NotFoundException:
+            return 0
+        if details.cache is None:
+            return 0
+        return details.cache.invalidate(lambda key: key[1] == url)
+
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        """Return cache counters of every cached route.
+
+        Returns:
+            Mapping of route URL to hits, misses, evictions and size
+        """
+        return {
+            url: details.cache.stats()
+            for url, details in self.routes["GET"].items()
+            if details.cache is not None
+        }
+
+    def coalesce_stats(self) -> dict[str, dict[str, int]]:
+        """Return coalescing counters of every coalesced route.
+
+        Returns:
+            Mapping of route URL to executions, coalesced, timeouts and
+            in_flight
+        """
+        return {
+            url: details.coalescer.stats()
+            for url, details in self.routes["GET"].items()
+            if details.coalescer is not None
+        }
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return request metrics of every route that has seen traffic.
+
+        Returns:
+            Mapping of ``"METHOD url"`` to requests, errors, in_flight,
+            responses per status code and p50/p99/p999 latency in seconds
+        """
+        return self.metrics.snapshot()
+
+    def admission_stats(self) -> dict[str, dict[str, int]]:
+        """Return limits and counters of every admission controller.
+
+        Returns:
+            Mapping of "*" (router-wide) and route URLs to limit,
+            in_flight, admitted and rejected
+        """
+        stats = {}
+        if self.admission is not None:
+            stats["*"] = self.admission.stats()
+        for routes in self.routes.values():
+            for url, details in routes.items():
+                if details.admission is not None:
+                    stats[url] = details.admission.stats()
+        return stats
+
+    def executor_stats(self) -> dict[str, dict[str, Any]]:
+        """Return size, saturation and counters of every executor group.
+
+        Returns:
+            Mapping of group name to workers, max_queue, active, queued,
+            peak, completed, rejected, dropped and wait_seconds
+        """
+        return {name: group.stats() for name, group in self.executor_groups.items()}
+
+    def add_middleware(self, func: Middleware | Callable) -> Middleware | Callable:
+        """Add middleware to every route.
+
+        Accepts a :class:`Middleware` instance or subclass, or a plain
+        function used as a ``before`` hook. Can be used as a decorator.
+
+        Args:
+            func: Middleware to add
+
+        Returns:
+            The middleware, unchanged
+        """
+        self.middlewares.append(as_middleware(func))
+        for details in self._registered():
+            self._compose(details)
+        return func
+
+    def warm_up(self, process_workers: int | None = None) -> None:
+        """Start the process pool if any route runs in it.
+
+        Called by the connectors before the server accepts requests, so
+        worker start-up does not land on the first requests.
+
+        Args:
+            process_workers: Size of the process pool, unless it was
+                created with an explicit size
+        """
+        if any(details.executor == PROCESS for details in self._registered()):
+            if process_workers is not None:
+                self.process_pool.set_default_workers(process_workers)
+            self.process_pool.start()
+
+    def _registered(self) -> list[FunctionDetails]:
+        """Return every registered route once, even if it has several methods."""
+        unique: dict[int, FunctionDetails] = {}
+        for routes in self.routes.values():
+            for details in routes.values():
+                unique.setdefault(id(details), details)
+        return list(unique.values())
+
+    def _compose(self, details: FunctionDetails) -> None:
+        """Compose the middleware chains of a route.
+
+        Runs at registration time, so requests only call the composed
+        chain; routes without middleware keep None and skip it entirely.
+
+        Args:
+            details: Route to compose
+        """
+        middlewares = self.middlewares + details.middlewares
+        details.async_middleware = compose_async(middlewares)
+        try:
+            details.middleware = compose(middlewares)
+        except TypeError as error:
+            details.middleware = _requires_asyncio(str(error))
+
+
+def _requires_asyncio(message: str) -> Callable:
+    """Build a sync chain that reports async-only middleware when used."""
+
+    def chain(request: Any, invoke: Callable) -> Any:
+        # A fresh error per call: a shared one would pile up tracebacks
+        raise TypeError(message)
+
+    return chain
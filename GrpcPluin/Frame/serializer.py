@@ -0,0 +1,95 @@
+"""Precompiled response serializers for route handlers."""
+
+from typing import Any, Callable
+
+from pydantic import BaseModel
+
+from GrpcPluin.codec import JSON_CODEC, Codec
+
+
+class ResponseSerializer:
+    """Validates and serializes the results of a route handler.
+
+    The counterpart of :class:`ArgumentBinder` on the way out: the
+    pydantic-core validator and serializer of the response model are
+    looked up once, when the route is registered, so a call only runs
+    them. For the built-in "json" codec the serializer writes the payload
+    bytes directly, without building an intermediate dict.
+
+    Attributes:
+        response_model: Model handler results are validated against, if any
+        revalidate: Whether results that already are instances of the
+            response model are validated again
+    """
+
+    __slots__ = ("response_model", "revalidate", "_validate", "_to_python", "_to_json")
+
+    def __init__(
+        self, response_model: type[BaseModel] | None, revalidate: bool = True
+    ) -> None:
+        """Compile the serializer of a route.
+
+        Args:
+            response_model: Optional Pydantic model for response validation
+            revalidate: Validate results that already are model instances;
+                False trusts the handler and only serializes them
+        """
+        self.response_model: type[BaseModel] | None = response_model
+        self.revalidate: bool = revalidate
+        self._validate: Callable[[Any], BaseModel] | None = None
+        self._to_python: Callable[[BaseModel], Any] | None = None
+        self._to_json: Callable[[BaseModel], bytes] | None = None
+        if response_model is not None:
+            self._validate = response_model.__pydantic_validator__.validate_python
+            self._to_python = response_model.__pydantic_serializer__.to_python
+            self._to_json = response_model.__pydantic_serializer__.to_json
+
+    def validate(self, response: Any) -> Any:
+        """Validate a handler result against the response model.
+
+        Args:
+            response: Handler return value, a dict or a model instance
+
+        Returns:
+            Model instance; the result unchanged for routes without a model
+
+        Raises:
+            ValidationError: If the result does not match the model
+        """
+        if self._validate is None:
+            return response
+        if isinstance(response, self.response_model):
+            if not self.revalidate:
+                return response
+            # pydantic passes instances through as they are: check the data
+            response = self._to_python(response)
+        return self._validate(response)
+
+    def dump(self, validated: Any) -> Any:
+        """Convert a validated result to plain Python data.
+
+        Args:
+            validated: Value returned by :meth:`validate`
+
+        Returns:
+            Data ready for a Struct or a codec
+        """
+        if self._to_python is not None:
+            return self._to_python(validated)
+        if isinstance(validated, BaseModel):
+            return validated.model_dump()
+        return validated
+
+    def encode(self, validated: Any, codec: Codec) -> bytes:
+        """Encode a validated result with a payload codec.
+
+        Args:
+            validated: Value returned by :meth:`validate`
+            codec: Payload codec negotiated by the request
+
+        Returns:
+            Encoded payload
+        """
+        if self._to_json is not None and codec is JSON_CODEC:
+            return self._to_json(validated)
+        return codec.encode(self.dump(validated))
@@ -1,41 +1,175 @@
-"""gRPC Plugin - A framework for building gRPC servers and clients."""
+"""gRPC Plugin - A framework for building gRPC servers and clients.
 
-from concurrent import futures
+Everything here is loaded on first access (PEP 562), so client-only
+processes that ``import GrpcPluin.client`` never load the server side.
+The global ``router``, ``connector`` and ``async_connector`` are built
+on first use, and the connectors only create their gRPC server in
+``install_app()``, configured from ``GRPCPLUGIN_*`` environment
+variables (see :meth:`GrpcConfigs.from_env`).
+"""
 
-from grpc import server
+import importlib
+import threading
+from typing import TYPE_CHECKING, Any
 
-from .Frame.connector import GrpcComposer, GrpcConfigs, GrpcConnector
-from .Frame.manager import GrpcManager
-from .Frame.router import METHODS, GrpcRouter
-from .proto.base_proto_pb2_grpc import (
-    GrpcHandlerStub,
-    add_GrpcHandlerServicer_to_server,
-)
+if TYPE_CHECKING:
+    from .Frame.admission import (
+        AdmissionController,
+        AIMDLimit,
+        GradientLimit,
+        StaticLimit,
+    )
+    from .Frame.cache import CachePolicy
+    from .Frame.coalesce import CoalescePolicy
+    from .Frame.connector import (
+        AsyncGrpcConnector,
+        GrpcComposer,
+        GrpcConfigs,
+        GrpcConnector,
+    )
+    from .Frame.executors import ExecutorGroup, ProcessPool
+    from .Frame.manager import AsyncGrpcManager, GrpcManager
+    from .Frame.middleware import Middleware, MiddlewareRequest
+    from .Frame.router import METHODS, GrpcRouter
+    from .compression import CompressionPolicy
+    from .deadline import CallAbandoned, CallContext, current_call
 
-# Create a global router instance
-router = GrpcRouter()
+    router: GrpcRouter
+    composer: GrpcComposer
+    connector: GrpcConnector
+    async_connector: AsyncGrpcConnector
 
-# Create a composer for the gRPC service
-composer = GrpcComposer(
-    stub=GrpcHandlerStub,
-    service_provider=add_GrpcHandlerServicer_to_server,
-    servicer=GrpcManager(router=router),
-)
 
-# Create a connector for managing the gRPC server
-connector = GrpcConnector(
-    server=server(thread_pool=futures.ThreadPoolExecutor(max_workers=10)),
-    composers=[composer],
-    configs=GrpcConfigs(server_uri="0.0.0.0:50052"),
-)
+# Public name -> module that defines it
+_LAZY_IMPORTS: dict[str, str] = {
+    "AdmissionController": ".Frame.admission",
+    "AIMDLimit": ".Frame.admission",
+    "GradientLimit": ".Frame.admission",
+    "StaticLimit": ".Frame.admission",
+    "CachePolicy": ".Frame.cache",
+    "CoalescePolicy": ".Frame.coalesce",
+    "AsyncGrpcConnector": ".Frame.connector",
+    "GrpcComposer": ".Frame.connector",
+    "GrpcConfigs": ".Frame.connector",
+    "GrpcConnector": ".Frame.connector",
+    "ExecutorGroup": ".Frame.executors",
+    "ProcessPool": ".Frame.executors",
+    "AsyncGrpcManager": ".Frame.manager",
+    "GrpcManager": ".Frame.manager",
+    "Middleware": ".Frame.middleware",
+    "MiddlewareRequest": ".Frame.middleware",
+    "METHODS": ".Frame.router",
+    "GrpcRouter": ".Frame.router",
+    "CompressionPolicy": ".compression",
+    "CallAbandoned": ".deadline",
+    "CallContext": ".deadline",
+    "current_call": ".deadline",
+}
+
+_singletons_lock = threading.RLock()
+
+
+def _build_router() -> Any:
+    """Create the global router instance."""
+    from .Frame.router import GrpcRouter
+
+    return GrpcRouter()
+
+
+def _build_composer() -> Any:
+    """Create the composer of the sync gRPC service."""
+    from .Frame.connector import GrpcComposer
+    from .Frame.manager import GrpcManager, add_manager_to_server
+    from .proto.base_proto_pb2_grpc import GrpcHandlerStub
+
+    return GrpcComposer(
+        stub=GrpcHandlerStub,
+        service_provider=add_manager_to_server,
+        servicer=GrpcManager(router=__getattr__("router")),
+    )
+
+
+def _build_connector() -> Any:
+    """Create the connector managing the sync gRPC server."""
+    from .Frame.connector import GrpcConfigs, GrpcConnector
+
+    return GrpcConnector(
+        composers=[__getattr__("composer")],
+        configs=GrpcConfigs.from_env(),
+    )
+
+
+def _build_async_connector() -> Any:
+    """Create the asyncio connector serving the same router on grpc.aio."""
+    from .Frame.connector import AsyncGrpcConnector, GrpcComposer, GrpcConfigs
+    from .Frame.manager import AsyncGrpcManager, add_manager_to_server
+    from .proto.base_proto_pb2_grpc import GrpcHandlerStub
+
+    return AsyncGrpcConnector(
+        composers=[
+            GrpcComposer(
+                stub=GrpcHandlerStub,
+                service_provider=add_manager_to_server,
+                servicer=AsyncGrpcManager(router=__getattr__("router")),
+            )
+        ],
+        configs=GrpcConfigs.from_env(),
+    )
+
+
+_SINGLETONS = {
+    "router": _build_router,
+    "composer": _build_composer,
+    "connector": _build_connector,
+    "async_connector": _build_async_connector,
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Load public classes and build global instances on first access."""
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+
+    if name in _SINGLETONS:
+        with _singletons_lock:
+            if name not in globals():
+                globals()[name] = _SINGLETONS[name]()
+            return globals()[name]
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    """List the lazily loaded names alongside the module globals."""
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     "router",
     "connector",
+    "async_connector",
     "METHODS",
     "GrpcRouter",
     "GrpcConnector",
+    "AsyncGrpcConnector",
     "GrpcManager",
+    "AsyncGrpcManager",
     "GrpcComposer",
     "GrpcConfigs",
+    "CachePolicy",
+    "CoalescePolicy",
+    "CompressionPolicy",
+    "ExecutorGroup",
+    "ProcessPool",
+    "AdmissionController",
+    "StaticLimit",
+    "AIMDLimit",
+    "GradientLimit",
+    "CallContext",
+    "CallAbandoned",
+    "current_call",
+    "Middleware",
+    "MiddlewareRequest",
 ]
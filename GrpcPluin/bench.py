@@ -0,0 +1,427 @@
+"""End-to-end benchmark of the Dispatch pipeline.
+
+Starts an in-process server with synthetic routes, drives ``Dispatch``
+through :class:`GrpcRequestHandler` and prints a JSON report with
+throughput, latency percentiles and a per-phase CPU split, so runs can
+be diffed against a baseline.
+
+Run:
+
+    python -m GrpcPluin.bench --payload small nested --concurrency 1 16
+    python -m GrpcPluin.bench --transport unix --duration 10 -o baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import tempfile
+import threading
+import time
+from concurrent import futures
+from typing import Any, Callable
+
+import grpc
+from google.protobuf import json_format
+from pydantic import BaseModel
+
+from GrpcPluin.codec import get_codec
+from GrpcPluin.client.caller import GrpcRequestHandler, _to_grpc_request
+from GrpcPluin.client.exceptions import GrpcException
+from GrpcPluin.client.pool import ChannelPool
+from GrpcPluin.client.structures import METHODS as CLIENT_METHODS, Request
+from GrpcPluin.Frame.enums import METHODS
+from GrpcPluin.Frame.manager import GrpcManager
+from GrpcPluin.Frame.router import GrpcRouter
+from GrpcPluin.proto.base_proto_pb2 import Method as GrpcMethod  # type: ignore
+from GrpcPluin.proto.base_proto_pb2 import Request as GrpcRequest  # type: ignore
+from GrpcPluin.proto.base_proto_pb2 import Response as GrpcResponse  # type: ignore
+from GrpcPluin.proto.base_proto_pb2_grpc import add_GrpcHandlerServicer_to_server
+
+
+class Small(BaseModel):
+    """Flat payload of a few scalar fields."""
+
+    name: str
+    family: str
+    age: int
+
+
+class Address(BaseModel):
+    """Nested part of :class:`User`."""
+
+    city: str
+    zip: int
+
+
+class User(BaseModel):
+    """Nested payload with lists and a sub-model."""
+
+    id: int
+    tags: list[str]
+    address: Address
+    scores: list[float]
+
+
+class Row(BaseModel):
+    """One row of :class:`Rows`."""
+
+    id: int
+    name: str
+    value: float
+
+
+class Rows(BaseModel):
+    """Large list payload."""
+
+    rows: list[Row]
+
+
+PAYLOADS: dict[str, dict[str, Any]] = {
+    "small": {"name": "far", "family": "ghorbani", "age": 4},
+    "nested": {
+        "id": 1,
+        "tags": ["a", "b", "c"],
+        "address": {"city": "x", "zip": 12345},
+        "scores": [1.5, 2.5, 3.5],
+    },
+    "large_list": {
+        "rows": [{"id": i, "name": f"row-{i}", "value": i * 0.5} for i in range(1_000)]
+    },
+}
+
+# "decode" and "encode" measure the Struct body, or the payload codec
+# when one is configured.
+PHASES = (
+    "decode",
+    "routing",
+    "binding",
+    "handler",
+    "response_validation",
+    "encode",
+)
+
+
+def build_router() -> GrpcRouter:
+    """Register one echo route per payload shape on a fresh router.
+
+    Returns:
+        Router with ``POST /bench/<payload>`` routes
+    """
+    bench_router = GrpcRouter()
+
+    @bench_router(url="/bench/small", methods=[METHODS.POST], response_model=Small)
+    def small(name: str, family: str, age: int) -> dict:
+        return {"name": name, "family": family, "age": age}
+
+    @bench_router(url="/bench/nested", methods=[METHODS.POST], response_model=User)
+    def nested(user: User) -> dict:
+        return user.model_dump()
+
+    @bench_router(url="/bench/large_list", methods=[METHODS.POST], response_model=Rows)
+    def large_list(rows: list[Row]) -> dict:
+        return {"rows": [row.model_dump() for row in rows]}
+
+    return bench_router
+
+
+def start_server(
+    bench_router: GrpcRouter, transport: str, workers: int
+) -> tuple[grpc.Server, str, Callable[[], None]]:
+    """Start an in-process gRPC server for the benchmark router.
+
+    Args:
+        bench_router: Router to serve
+        transport: "tcp" for a localhost port, "unix" for a unix socket
+        workers: Server thread pool size
+
+    Returns:
+        (server, target for clients, cleanup function)
+    """
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=workers))
+    add_GrpcHandlerServicer_to_server(GrpcManager(router=bench_router), server)
+
+    if transport == "unix":
+        directory = tempfile.mkdtemp(prefix="grpcplugin-bench-")
+        target = f"unix:{os.path.join(directory, 'bench.sock')}"
+        server.add_insecure_port(target)
+    else:
+        port = server.add_insecure_port("127.0.0.1:0")
+        target = f"127.0.0.1:{port}"
+    server.start()
+
+    def cleanup() -> None:
+        server.stop(grace=None)
+        if transport == "unix":
+            path = target[len("unix:") :]
+            if os.path.exists(path):
+                os.unlink(path)
+            os.rmdir(os.path.dirname(path))
+
+    return server, target, cleanup
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """Summarize latency samples in milliseconds.
+
+    Args:
+        samples: Latencies in seconds
+
+    Returns:
+        Dictionary with mean, p50, p90, p99, p999 and max
+    """
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+
+    def at(quantile: float) -> float:
+        return round(ordered[min(last, int(quantile * len(ordered)))] * 1e3, 4)
+
+    return {
+        "mean": round(sum(ordered) / len(ordered) * 1e3, 4),
+        "p50": at(0.50),
+        "p90": at(0.90),
+        "p99": at(0.99),
+        "p999": at(0.999),
+        "max": round(ordered[-1] * 1e3, 4),
+    }
+
+
+def drive(
+    handler: GrpcRequestHandler,
+    target: str,
+    payload: str,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> dict[str, Any]:
+    """Call a route from ``concurrency`` threads for ``duration`` seconds.
+
+    Args:
+        handler: Client request handler
+        target: Server target
+        payload: Payload shape to send
+        concurrency: Number of client threads with a call in flight
+        duration: Measured seconds
+        warmup: Unmeasured seconds before the measurement starts
+
+    Returns:
+        Throughput, error count and latency percentiles
+    """
+    request = Request(
+        method=CLIENT_METHODS.POST, url=f"/bench/{payload}", body=PAYLOADS[payload]
+    )
+    latencies: list[list[float]] = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    barrier = threading.Barrier(concurrency + 1)
+    deadline = [0.0, 0.0]  # measurement start, measurement end
+
+    def worker(index: int) -> None:
+        samples = latencies[index]
+        barrier.wait()
+        while True:
+            started = time.perf_counter()
+            if started >= deadline[1]:
+                return
+            try:
+                ok = handler.call(request, grpc_url=target)["result"]
+            except GrpcException:
+                ok = False
+            finished = time.perf_counter()
+            if started >= deadline[0]:
+                samples.append(finished - started)
+                if not ok:
+                    errors[index] += 1
+
+    threads = [
+        threading.Thread(target=worker, args=(index,), daemon=True)
+        for index in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    now = time.perf_counter()
+    deadline[0] = now + warmup
+    deadline[1] = deadline[0] + duration
+    barrier.wait()
+    for thread in threads:
+        thread.join()
+
+    samples = [sample for worker_samples in latencies for sample in worker_samples]
+    return {
+        "payload": payload,
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "errors": sum(errors),
+        "throughput_rps": round(len(samples) / duration, 1),
+        "latency_ms": percentiles(samples),
+    }
+
+
+def phase_split(
+    bench_router: GrpcRouter, payload: str, iterations: int, codec: str | None = None
+) -> dict[str, dict[str, float]]:
+    """Measure the CPU time of each Dispatch phase for one payload.
+
+    The pipeline steps of :meth:`GrpcManager.Dispatch` are replayed
+    in-process, one phase at a time, so gRPC transport cost is excluded.
+
+    Args:
+        bench_router: Router holding the benchmark routes
+        payload: Payload shape
+        iterations: Repetitions per phase
+        codec: Payload codec; None measures Struct decoding and encoding
+
+    Returns:
+        Per phase: CPU microseconds per request and share of the total
+    """
+    wire = _to_grpc_request(
+        Request(method=CLIENT_METHODS.POST, url=f"/bench/{payload}", body=PAYLOADS[payload]),
+        codec,
+    ).SerializeToString()
+    payload_codec = get_codec(codec) if codec is not None else None
+
+    def decode() -> dict[str, Any]:
+        request = GrpcRequest.FromString(wire)
+        if payload_codec is not None:
+            return payload_codec.decode(request.payload)
+        return json_format.MessageToDict(request.body)
+
+    request = GrpcRequest.FromString(wire)
+    method = GrpcMethod.Name(request.method)
+    func_detail, path_params = bench_router._routing(method, request.url)
+    body = decode()
+    arguments = func_detail.binder.bind(body, path_params)
+    result = func_detail.func(**arguments)
+    serializer = func_detail.serializer
+    validated = serializer.validate(result)
+
+    def encode() -> bytes:
+        if payload_codec is not None:
+            return GrpcResponse(
+                result=True,
+                status_code=200,
+                payload=serializer.encode(validated, payload_codec),
+                codec=payload_codec.name,
+            ).SerializeToString()
+        response = GrpcResponse(result=True, status_code=200)
+        response.data.update(serializer.dump(validated))
+        return response.SerializeToString()
+
+    steps: dict[str, Callable[[], Any]] = {
+        "decode": decode,
+        "routing": lambda: bench_router._routing(method, request.url),
+        "binding": lambda: func_detail.binder.bind(body, path_params),
+        "handler": lambda: func_detail.func(**arguments),
+        "response_validation": lambda: serializer.validate(result),
+        "encode": encode,
+    }
+
+    cpu: dict[str, float] = {}
+    for phase in PHASES:
+        step = steps[phase]
+        started = time.thread_time()
+        for _ in range(iterations):
+            step()
+        cpu[phase] = (time.thread_time() - started) / iterations * 1e6
+
+    total = sum(cpu.values()) or 1.0
+    return {
+        phase: {"cpu_us": round(cpu[phase], 3), "share": round(cpu[phase] / total, 4)}
+        for phase in PHASES
+    }
+
+
+def run_benchmark(
+    payloads: list[str],
+    concurrency: list[int],
+    duration: float = 5.0,
+    warmup: float = 1.0,
+    transport: str = "tcp",
+    workers: int = 16,
+    codec: str | None = None,
+    phase_iterations: int = 2_000,
+) -> dict[str, Any]:
+    """Run the benchmark matrix and return the report.
+
+    Args:
+        payloads: Payload shapes to send (keys of :data:`PAYLOADS`)
+        concurrency: Client concurrency levels to run for every payload
+        duration: Measured seconds per run
+        warmup: Unmeasured seconds per run
+        transport: "tcp" or "unix"
+        workers: Server thread pool size
+        codec: Payload codec for the client; None uses Struct
+        phase_iterations: Repetitions per phase for the CPU split
+
+    Returns:
+        JSON-serializable report
+    """
+    bench_router = build_router()
+    _, target, cleanup = start_server(bench_router, transport, workers)
+    pool = ChannelPool(channels_per_target=1, idle_timeout=None)
+    handler = GrpcRequestHandler(pool=pool, codec=codec)
+    try:
+        runs = [
+            drive(handler, target, payload, level, duration, warmup)
+            for payload in payloads
+            for level in concurrency
+        ]
+    finally:
+        handler.close()
+        cleanup()
+
+    return {
+        "config": {
+            "transport": transport,
+            "server_workers": workers,
+            "codec": codec or "struct",
+            "duration_s": duration,
+            "warmup_s": warmup,
+            "python": platform.python_version(),
+            "grpc": grpc.__version__,
+            "cpu_count": os.cpu_count(),
+        },
+        "runs": runs,
+        "phases": {
+            payload: phase_split(bench_router, payload, phase_iterations, codec)
+            for payload in payloads
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Parse command-line options, run the benchmark and print the report."""
+    parser = argparse.ArgumentParser(
+        prog="python -m GrpcPluin.bench", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--payload", nargs="+", choices=list(PAYLOADS), default=list(PAYLOADS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8])
+    parser.add_argument("--duration", type=float, default=5.0, help="measured seconds per run")
+    parser.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds per run")
+    parser.add_argument("--transport", choices=["tcp", "unix"], default="tcp")
+    parser.add_argument("--workers", type=int, default=16, help="server thread pool size")
+    parser.add_argument("--codec", default=None, help="client payload codec (default: Struct)")
+    parser.add_argument("--phase-iterations", type=int, default=2_000)
+    parser.add_argument("-o", "--output", help="also write the report to this file")
+    options = parser.parse_args(argv)
+
+    report = run_benchmark(
+        payloads=options.payload,
+        concurrency=options.concurrency,
+        duration=options.duration,
+        warmup=options.warmup,
+        transport=options.transport,
+        workers=options.workers,
+        codec=options.codec,
+        phase_iterations=options.phase_iterations,
+    )
+    text = json.dumps(report, indent=2)
+    print(text)
+    if options.output:
+        with open(options.output, "w") as output:
+            output.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
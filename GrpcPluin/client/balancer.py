@@ -0,0 +1,568 @@
+"""Client-side load balancing over several server replicas.
+
+A :class:`LoadBalancer` spreads calls over the targets of a
+:class:`Resolver` (a static list, DNS or a watched file), so clients reach
+replicas directly instead of through a proxy. Policies:
+
+* ``"round_robin"``: targets in turn
+* ``"least_outstanding"``: the target with the fewest calls in flight
+* ``"p2c"``: power of two choices; of two random targets, the one with the
+  lower (calls in flight + 1) x average latency
+
+:class:`OutlierEjection` takes replicas out of rotation for a while when
+they keep failing (unavailable, overloaded, timing out) or are much slower
+than the others.
+"""
+
+import itertools
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Collection, Iterator, Optional, Sequence
+
+import grpc
+
+from .exceptions import GrpcException
+
+logger = logging.getLogger(__name__)
+
+# Status codes that count against a replica: it is down, overloaded or slow.
+# Other codes are answers of a healthy server. Responses the server shed
+# with status 429 or 503 count as RESOURCE_EXHAUSTED and UNAVAILABLE.
+FAILURE_CODES: frozenset[grpc.StatusCode] = frozenset(
+    {
+        grpc.StatusCode.UNAVAILABLE,
+        grpc.StatusCode.DEADLINE_EXCEEDED,
+        grpc.StatusCode.RESOURCE_EXHAUSTED,
+        grpc.StatusCode.INTERNAL,
+        grpc.StatusCode.UNKNOWN,
+    }
+)
+
+# Weight of the newest sample in a replica's average latency
+_LATENCY_DECAY = 0.2
+
+
+class Resolver:
+    """Source of the targets a load balancer spreads calls over.
+
+    Attributes:
+        refresh_interval: Seconds between two lookups; None looks up once
+    """
+
+    refresh_interval: float | None = None
+
+    def resolve(self) -> list[str]:
+        """Look up the current targets.
+
+        Returns:
+            Targets as host:port
+
+        Raises:
+            OSError: If the lookup fails; the balancer keeps the targets of
+                the previous lookup
+        """
+        raise NotImplementedError
+
+
+class StaticResolver(Resolver):
+    """Fixed list of targets."""
+
+    def __init__(self, targets: Sequence[str]) -> None:
+        """Initialize the resolver.
+
+        Args:
+            targets: Server URIs (host:port)
+
+        Raises:
+            ValueError: If the list is empty
+        """
+        if not targets:
+            raise ValueError("At least one target is required")
+        self.targets: list[str] = list(targets)
+
+    def resolve(self) -> list[str]:
+        """Return the targets."""
+        return list(self.targets)
+
+    def __repr__(self) -> str:
+        """Describe the resolver in error messages."""
+        return f"StaticResolver({self.targets!r})"
+
+
+class DNSResolver(Resolver):
+    """Every address a host name resolves to, looked up periodically.
+
+    Lookups are blocking; on asyncio clients they happen on the event loop
+    once per ``refresh_interval``.
+    """
+
+    def __init__(self, host: str, port: int = 50052, refresh_interval: float = 30.0) -> None:
+        """Initialize the resolver.
+
+        Args:
+            host: Host name, e.g. a headless Kubernetes service
+            port: Port of every replica
+            refresh_interval: Seconds between two lookups
+        """
+        self.host: str = host
+        self.port: int = port
+        self.refresh_interval: float | None = refresh_interval
+
+    def resolve(self) -> list[str]:
+        """Look up the addresses of the host.
+
+        Returns:
+            One target per distinct address, sorted
+
+        Raises:
+            OSError: If the lookup fails
+        """
+        targets = set()
+        for family, _, _, _, address in socket.getaddrinfo(
+            self.host, self.port, type=socket.SOCK_STREAM
+        ):
+            host = f"[{address[0]}]" if family == socket.AF_INET6 else address[0]
+            targets.add(f"{host}:{address[1]}")
+        return sorted(targets)
+
+    def __repr__(self) -> str:
+        """Describe the resolver in error messages."""
+        return f"DNSResolver({self.host!r}, {self.port})"
+
+
+class FileResolver(Resolver):
+    """Targets listed in a file, re-read when it changes.
+
+    One host:port per line; blank lines and ``#`` comments are ignored.
+    The file is checked every ``refresh_interval`` seconds and only read
+    again when its modification time changed.
+    """
+
+    def __init__(self, path: str, refresh_interval: float = 5.0) -> None:
+        """Initialize the resolver.
+
+        Args:
+            path: File listing the targets
+            refresh_interval: Seconds between two checks of the file
+        """
+        self.path: str = path
+        self.refresh_interval: float | None = refresh_interval
+        self._mtime: int | None = None
+        self._targets: list[str] = []
+
+    def resolve(self) -> list[str]:
+        """Return the targets listed in the file.
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        mtime = os.stat(self.path).st_mtime_ns
+        if mtime != self._mtime:
+            with open(self.path) as file:
+                lines = [line.split("#", 1)[0].strip() for line in file]
+            self._targets = [line for line in lines if line]
+            self._mtime = mtime
+        return list(self._targets)
+
+    def __repr__(self) -> str:
+        """Describe the resolver in error messages."""
+        return f"FileResolver({self.path!r})"
+
+
+@dataclass(frozen=True)
+class OutlierEjection:
+    """When a replica is taken out of rotation.
+
+    Attributes:
+        consecutive_failures: Failures in a row (see ``FAILURE_CODES``)
+            that eject a replica
+        latency_factor: Eject a replica whose average latency exceeds this
+            multiple of the median of the other replicas; None disables
+            latency-based ejection
+        min_latency: Average latencies below this many seconds never eject
+            a replica, however they compare
+        min_samples: Calls a replica must have completed before its
+            latency is judged
+        base_ejection_time: Seconds of a first ejection; each further
+            ejection in a row lasts one more multiple of it
+        max_ejection_time: Upper bound of an ejection, in seconds
+        max_ejected_percent: Never eject more than this share of the
+            replicas
+    """
+
+    consecutive_failures: int = 5
+    latency_factor: Optional[float] = 3.0
+    min_latency: float = 0.005
+    min_samples: int = 20
+    base_ejection_time: float = 30.0
+    max_ejection_time: float = 300.0
+    max_ejected_percent: float = 50.0
+
+    def __post_init__(self) -> None:
+        """Validate the settings.
+
+        Raises:
+            ValueError: If a count or duration is out of range
+        """
+        if self.consecutive_failures < 1 or self.min_samples < 1:
+            raise ValueError("consecutive_failures and min_samples must be at least 1")
+        if self.latency_factor is not None and self.latency_factor <= 1:
+            raise ValueError("latency_factor must be greater than 1")
+        if not 0 <= self.max_ejected_percent <= 100:
+            raise ValueError("max_ejected_percent must be between 0 and 100")
+
+
+class Endpoint:
+    """Load and health of one target.
+
+    Attributes:
+        target: Server URI (host:port)
+        outstanding: Calls in flight
+        latency: Moving average of call latency, in seconds; 0 before the
+            first sample
+        samples: Calls completed since the replica (re)joined the rotation
+        failures: Failures in a row
+        ejections: Ejections in a row; lengthens the next one
+        ejected_until: Monotonic time the current ejection ends; 0 when
+            the replica is in rotation
+    """
+
+    __slots__ = (
+        "target",
+        "outstanding",
+        "latency",
+        "samples",
+        "failures",
+        "ejections",
+        "ejected_until",
+    )
+
+    def __init__(self, target: str) -> None:
+        """Initialize the statistics of a new target.
+
+        Args:
+            target: Server URI (host:port)
+        """
+        self.target: str = target
+        self.outstanding: int = 0
+        self.latency: float = 0.0
+        self.samples: int = 0
+        self.failures: int = 0
+        self.ejections: int = 0
+        self.ejected_until: float = 0.0
+
+    def record(self, latency: float) -> None:
+        """Add a latency sample to the moving average."""
+        if self.samples:
+            self.latency += (latency - self.latency) * _LATENCY_DECAY
+        else:
+            self.latency = latency
+        self.samples += 1
+
+    def cost(self) -> float:
+        """Expected wait of a new call, for the power of two choices."""
+        return (self.outstanding + 1) * self.latency
+
+
+class LoadBalancer:
+    """Spreads calls over the targets of a resolver.
+
+    Thread-safe; the same balancer may be shared by several handlers,
+    sync and asyncio alike.
+
+    Attributes:
+        resolver: Source of the targets
+        policy: "round_robin", "least_outstanding" or "p2c"
+        ejection: Outlier ejection settings; None never ejects
+    """
+
+    POLICIES: tuple[str, ...] = ("round_robin", "least_outstanding", "p2c")
+
+    def __init__(
+        self,
+        targets: Sequence[str] | Resolver,
+        policy: str = "round_robin",
+        ejection: OutlierEjection | None = OutlierEjection(),
+    ) -> None:
+        """Initialize the balancer; targets are looked up on the first call.
+
+        Args:
+            targets: Server URIs (host:port), or a resolver
+            policy: "round_robin", "least_outstanding" or "p2c"
+            ejection: Outlier ejection settings; None never ejects
+
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}; expected one of {self.POLICIES}")
+        self.resolver: Resolver = (
+            targets if isinstance(targets, Resolver) else StaticResolver(targets)
+        )
+        self.policy: str = policy
+        self.ejection: OutlierEjection | None = ejection
+        self._choose = getattr(self, f"_choose_{policy}")
+        self._endpoints: list[Endpoint] = []
+        self._ejected: int = 0
+        self._counter: Iterator[int] = itertools.count()
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._resolved_at: float | None = None
+
+    @contextmanager
+    def call(
+        self, record_latency: bool = True, avoid: Collection[str] = ()
+    ) -> Iterator[str]:
+        """Pick a target for one call and learn from its outcome.
+
+        Failures with a code in ``FAILURE_CODES`` count against the
+        target; calls abandoned by the caller count neither way.
+
+        Args:
+            record_latency: Add the call's duration to the target's
+                average; False for calls of unusual length (streams,
+                batches)
+            avoid: Targets not to pick unless nothing else is available
+
+        Yields:
+            Target of the call
+
+        Raises:
+            GrpcException: If no target could be resolved
+        """
+        endpoint = self.pick(avoid)
+        started = time.monotonic()
+        failed: bool | None = None
+        try:
+            yield endpoint.target
+            failed = False
+        except Exception as error:
+            failed = _is_failure(error)
+            raise
+        finally:
+            self.finish(endpoint, time.monotonic() - started, failed, record_latency)
+
+    def pick(self, avoid: Collection[str] = ()) -> Endpoint:
+        """Choose the target of a call and count it as in flight.
+
+        Every call to :meth:`pick` must be followed by one to
+        :meth:`finish`.
+
+        Args:
+            avoid: Targets not to pick unless nothing else is available,
+                e.g. those of earlier attempts of a retried call
+
+        Returns:
+            Chosen endpoint
+
+        Raises:
+            GrpcException: If no target could be resolved
+        """
+        now = time.monotonic()
+        self._refresh(now)
+        with self._lock:
+            endpoints = self._endpoints
+            if not endpoints:
+                raise GrpcException(
+                    url=repr(self.resolver),
+                    status_code=grpc.StatusCode.UNAVAILABLE,
+                    details="No server targets resolved",
+                    debug_error_string="",
+                )
+            if self._ejected:
+                endpoints = self._available(now)
+            if avoid:
+                endpoints = [e for e in endpoints if e.target not in avoid] or endpoints
+            endpoint = self._choose(endpoints)
+            endpoint.outstanding += 1
+            return endpoint
+
+    def finish(
+        self,
+        endpoint: Endpoint,
+        latency: float,
+        failed: bool | None,
+        record_latency: bool = True,
+    ) -> None:
+        """Record the outcome of a call started with :meth:`pick`.
+
+        Args:
+            endpoint: Endpoint returned by :meth:`pick`
+            latency: Seconds the call took
+            failed: Whether the replica failed the call; None when the
+                outcome says nothing about the replica
+            record_latency: Add the latency to the endpoint's average
+        """
+        ejection = self.ejection
+        with self._lock:
+            endpoint.outstanding -= 1
+            if failed is None or endpoint.ejected_until:
+                return
+            if failed:
+                endpoint.failures += 1
+                if ejection is not None and endpoint.failures >= ejection.consecutive_failures:
+                    self._eject(endpoint, "failures in a row")
+                return
+
+            endpoint.failures = 0
+            if not record_latency:
+                return
+            endpoint.record(latency)
+            if ejection is None or endpoint.samples < ejection.min_samples:
+                return
+            if self._slow(endpoint, ejection):
+                self._eject(endpoint, "latency")
+            else:
+                endpoint.ejections = 0
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Report the load and health of every target.
+
+        Returns:
+            Per-target calls in flight, average latency, failures in a row
+            and whether the target is ejected
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                endpoint.target: {
+                    "outstanding": endpoint.outstanding,
+                    "latency": endpoint.latency,
+                    "failures": endpoint.failures,
+                    "ejected": endpoint.ejected_until > now,
+                }
+                for endpoint in self._endpoints
+            }
+
+    def _refresh(self, now: float) -> None:
+        """Look up the targets again when the resolver's interval passed.
+
+        The first lookup blocks every caller; later ones are done by a
+        single caller while the others keep using the previous targets.
+        """
+        resolved_at = self._resolved_at
+        if resolved_at is not None:
+            interval = self.resolver.refresh_interval
+            if interval is None or now - resolved_at < interval:
+                return
+        if not self._refresh_lock.acquire(blocking=resolved_at is None):
+            return
+        try:
+            if self._resolved_at != resolved_at:
+                return
+            try:
+                targets = self.resolver.resolve()
+            except OSError as error:
+                logger.warning(f"Resolving {self.resolver!r} failed: {error}")
+                targets = None
+            self._resolved_at = now
+            if targets:
+                self._update(targets)
+        finally:
+            self._refresh_lock.release()
+
+    def _update(self, targets: list[str]) -> None:
+        """Replace the targets, keeping the statistics of remaining ones."""
+        with self._lock:
+            known = {endpoint.target: endpoint for endpoint in self._endpoints}
+            self._endpoints = [known.get(target) or Endpoint(target) for target in targets]
+            self._ejected = sum(1 for endpoint in self._endpoints if endpoint.ejected_until)
+
+    def _available(self, now: float) -> list[Endpoint]:
+        """Return the endpoints in rotation, readmitting expired ejections.
+
+        Must be called with the lock held. When every endpoint is ejected,
+        all of them are returned: a degraded replica beats none.
+        """
+        available = []
+        for endpoint in self._endpoints:
+            if endpoint.ejected_until:
+                if endpoint.ejected_until > now:
+                    continue
+                # Back in rotation: judge it on fresh samples
+                endpoint.ejected_until = 0.0
+                endpoint.latency = 0.0
+                endpoint.samples = 0
+                endpoint.failures = 0
+                self._ejected -= 1
+            available.append(endpoint)
+        return available or self._endpoints
+
+    def _slow(self, endpoint: Endpoint, ejection: OutlierEjection) -> bool:
+        """Check whether an endpoint's latency makes it an outlier.
+
+        Must be called with the lock held.
+        """
+        if ejection.latency_factor is None or endpoint.latency < ejection.min_latency:
+            return False
+        others = sorted(
+            other.latency
+            for other in self._endpoints
+            if other is not endpoint and other.samples and not other.ejected_until
+        )
+        if not others:
+            return False
+        return endpoint.latency > ejection.latency_factor * others[len(others) // 2]
+
+    def _eject(self, endpoint: Endpoint, reason: str) -> None:
+        """Take an endpoint out of rotation, unless too many already are.
+
+        Must be called with the lock held.
+        """
+        ejection = self.ejection
+        if (self._ejected + 1) * 100 > ejection.max_ejected_percent * len(self._endpoints):
+            return
+        endpoint.ejections += 1
+        duration = min(
+            ejection.base_ejection_time * endpoint.ejections, ejection.max_ejection_time
+        )
+        endpoint.ejected_until = time.monotonic() + duration
+        endpoint.failures = 0
+        self._ejected += 1
+        logger.warning(f"Ejected {endpoint.target} for {duration:.0f}s ({reason})")
+
+    def _choose_round_robin(self, endpoints: list[Endpoint]) -> Endpoint:
+        """Choose the next endpoint in turn."""
+        return endpoints[next(self._counter) % len(endpoints)]
+
+    def _choose_least_outstanding(self, endpoints: list[Endpoint]) -> Endpoint:
+        """Choose the endpoint with the fewest calls in flight.
+
+        The scan starts at a rotating offset, so ties are spread evenly.
+        """
+        start = next(self._counter) % len(endpoints)
+        best = endpoints[start]
+        for index in range(1, len(endpoints)):
+            endpoint = endpoints[(start + index) % len(endpoints)]
+            if endpoint.outstanding < best.outstanding:
+                best = endpoint
+        return best
+
+    def _choose_p2c(self, endpoints: list[Endpoint]) -> Endpoint:
+        """Choose the cheaper of two random endpoints."""
+        if len(endpoints) == 1:
+            return endpoints[0]
+        first, second = random.sample(endpoints, 2)
+        return first if first.cost() <= second.cost() else second
+
+
+def _is_failure(error: Exception) -> bool | None:
+    """Judge a failed call: True if the replica is to blame.
+
+    Returns:
+        True for codes in ``FAILURE_CODES``, False for other answers of
+        the server, None for calls the caller cancelled and errors raised
+        before the server was involved
+    """
+    code = getattr(error, "status_code", None)
+    if code is None and isinstance(error, grpc.RpcError):
+        code = error.code()
+    if code is None or code == grpc.StatusCode.CANCELLED:
+        return None
+    return code in FAILURE_CODES
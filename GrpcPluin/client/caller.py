@@ -1,78 +1,1752 @@
 """gRPC client request handler."""
 
-from typing import Any
+import asyncio
+import itertools
+import queue
+import time
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Sequence
 
 import grpc
 from google.protobuf.struct_pb2 import Struct
 from google.protobuf import json_format
 from grpc import RpcError
 
+from GrpcPluin.codec import get_codec
+from GrpcPluin.compression import METADATA_KEY, CompressionPolicy, as_policy
+from GrpcPluin.deadline import effective_timeout
+from GrpcPluin.schema import (
+    SCHEMA_METADATA_KEY,
+    STATUS_METADATA_KEY,
+    TypedRoute,
+    TypedSchema,
+)
 from GrpcPluin.proto.base_proto_pb2 import Request as GrpcRequest  # type: ignore
-from GrpcPluin.proto.base_proto_pb2_grpc import GrpcHandlerStub
-from .structures import Request, Response
+from GrpcPluin.proto.base_proto_pb2 import BatchRequest as GrpcBatchRequest  # type: ignore
+from GrpcPluin.proto.base_proto_pb2 import Method as GrpcMethod  # type: ignore
+from GrpcPluin.proto.base_proto_pb2 import SchemaRequest as GrpcSchemaRequest  # type: ignore
+from GrpcPluin.proto.base_proto_pb2 import StatsRequest as GrpcStatsRequest  # type: ignore
+from .balancer import LoadBalancer, Resolver, _is_failure
+from .pool import AsyncChannelPool, ChannelPool, default_pool
+from .structures import METHODS, Request, Response
 from .exceptions import GrpcException
+from .retry import HedgePolicy, LatencyTracker, RetryBudget, RetryPolicy
 from logging import getLogger
 
 logger = getLogger(__name__)
 
+# Server called when neither the call nor the handler names one
+DEFAULT_TARGET = "0.0.0.0:50052"
+
+# Attachments larger than this are streamed in chunks of this size
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Response statuses of calls the server shed instead of running, and the
+# gRPC codes they stand for
+SHED_STATUSES: dict[int, grpc.StatusCode] = {
+    429: grpc.StatusCode.RESOURCE_EXHAUSTED,
+    503: grpc.StatusCode.UNAVAILABLE,
+}
+
+
+class _ShedResponse(RpcError):
+    """A shed response (see ``SHED_STATUSES``) raised as the failure it reports.
+
+    The server answers overload through ``Dispatch`` with gRPC OK and the
+    status in the payload; raising it lets retries, hedging and the load
+    balancer see it. ``call`` returns the response itself if no other
+    attempt succeeds.
+    """
+
+    def __init__(self, response: dict[str, Any]) -> None:
+        super().__init__(response["message"])
+        self.response: dict[str, Any] = response
+
+    def code(self) -> grpc.StatusCode:
+        """Return the gRPC code matching the response status."""
+        return SHED_STATUSES[self.response["status"]]
+
+    def details(self) -> str | None:
+        """Return the response message."""
+        return self.response["message"]
+
+    def trailing_metadata(self) -> tuple:
+        """Return no metadata: the call itself succeeded."""
+        return ()
+
+
+def _unless_shed(response: dict[str, Any]) -> dict[str, Any]:
+    """Return a response, raising :class:`_ShedResponse` if it was shed."""
+    if response["status"] in SHED_STATUSES:
+        raise _ShedResponse(response)
+    return response
+
+
+def _hedged(request: Request, policy: HedgePolicy) -> bool:
+    """Tell whether a call may be hedged: GET, or a policy vouching for it."""
+    return policy.idempotent or request.method == METHODS.GET
+
+
+def _to_grpc_request(request: Request, codec: str | None = None) -> GrpcRequest:
+    """Convert a client request into its protobuf message.
+
+    Args:
+        request: Client request object
+        codec: Payload codec to encode the body with; None uses a Struct
+
+    Returns:
+        Protobuf request
+    """
+    if codec is not None:
+        message = GrpcRequest(
+            url=request.url,
+            method=request.method,
+            payload=get_codec(codec).encode(request.body),
+            codec=codec,
+        )
+    else:
+        # Convert Python dict to protobuf Struct
+        request_data = Struct()
+        request_data.update(request.body)
+        message = GrpcRequest(url=request.url, method=request.method, body=request_data)
+
+    if request.attachment:
+        message.attachment = request.attachment
+    return message
+
+
+def _upload_call(
+    request: Request,
+    timeout: float | None,
+    compression: CompressionPolicy | str | None,
+    handler: "GrpcRequestHandler | AsyncGrpcRequestHandler",
+) -> tuple[Iterator[GrpcRequest], dict[str, Any]] | None:
+    """Split a request with a large attachment into ``DispatchUpload`` messages.
+
+    The first message carries the request and the first chunk of the
+    attachment, the others one further chunk each. Chunks are sliced as
+    gRPC sends them.
+
+    Args:
+        request: Client request object
+        timeout: Timeout passed to the call, if any
+        compression: Compression passed to the call, if any
+        handler: Request handler making the call
+
+    Returns:
+        (messages, gRPC options of the call), or None if the attachment
+        fits in a single message
+    """
+    attachment = request.attachment
+    chunk_size = handler.upload_chunk_size
+    if attachment is None or len(attachment) <= chunk_size:
+        return None
+
+    first = _to_grpc_request(replace(request, attachment=None), handler.codec)
+    first.attachment = attachment[:chunk_size]
+    chunks = (
+        GrpcRequest(attachment=attachment[start:start + chunk_size])
+        for start in range(chunk_size, len(attachment), chunk_size)
+    )
+    options = _call_options(first, timeout, compression, handler)
+    return itertools.chain((first,), chunks), options
+
+
+def _as_balancer(
+    targets: Sequence[str] | Resolver | LoadBalancer | None,
+) -> LoadBalancer | None:
+    """Turn the targets of a request handler into a load balancer.
+
+    Args:
+        targets: Server URIs, a resolver, a load balancer, or None
+
+    Returns:
+        Round-robin balancer over plain targets or a resolver; the
+        balancer itself; None without targets
+    """
+    if targets is None or isinstance(targets, LoadBalancer):
+        return targets
+    if isinstance(targets, str):
+        targets = [targets]
+    return LoadBalancer(targets)
+
+
+@contextmanager
+def _target(
+    handler: "GrpcRequestHandler | AsyncGrpcRequestHandler",
+    grpc_url: str | None,
+    record_latency: bool = True,
+    tried: set[str] | None = None,
+) -> Iterator[str]:
+    """Choose the server of a call.
+
+    An explicit ``grpc_url`` wins; otherwise the handler's load balancer
+    picks a target and learns from the outcome of the call. The target's
+    pooled channels are leased until the block exits, so a long stream
+    or upload is never closed as idle.
+
+    Args:
+        handler: Request handler making the call
+        grpc_url: Server passed to the call, if any
+        record_latency: Let the balancer learn from the call's duration
+        tried: Targets of earlier attempts of the call, avoided when
+            another one is available; the chosen target is added
+
+    Yields:
+        Server URI (host:port)
+    """
+    if grpc_url is not None or handler.balancer is None:
+        target = grpc_url if grpc_url is not None else DEFAULT_TARGET
+        with handler.pool.lease(target):
+            yield target
+        return
+    with handler.balancer.call(record_latency, tried or ()) as target:
+        if tried is not None:
+            tried.add(target)
+        with handler.pool.lease(target):
+            yield target
+
+
+def _policy_for(
+    handler: "GrpcRequestHandler | AsyncGrpcRequestHandler",
+    url: str,
+    policy: RetryPolicy | HedgePolicy | None,
+) -> RetryPolicy | HedgePolicy | None:
+    """Resolve the retry or hedging policy of a call.
+
+    Args:
+        handler: Request handler making the call
+        url: URL of the request
+        policy: Policy passed to the call, if any
+
+    Returns:
+        The call's policy, else the handler's policy for the URL (an
+        exact key, then the longest matching ``prefix*`` key), else the
+        handler's default
+    """
+    if policy is not None:
+        return policy
+    policies = handler.url_policies
+    if not policies:
+        return handler.policy
+    if url in policies:
+        return policies[url]
+    prefixes = [key for key in policies if key.endswith("*") and url.startswith(key[:-1])]
+    if prefixes:
+        return policies[max(prefixes, key=len)]
+    return handler.policy
+
+
+def _deadline(timeout: float | None, default: float | None) -> float | None:
+    """Return the monotonic time at which a call with retries must end.
+
+    Args:
+        timeout: Timeout passed to the call, if any
+        default: Timeout of the request handler
+
+    Returns:
+        Deadline, or None for no deadline
+    """
+    timeout = _call_timeout(timeout, default)
+    return None if timeout is None else time.monotonic() + timeout
+
+
+def _remaining(deadline: float | None) -> float | None:
+    """Return the seconds left before a deadline, None without one."""
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+def _retry_allowed(
+    policy: RetryPolicy,
+    budget: RetryBudget,
+    attempt: int,
+    error: RpcError,
+    deadline: float | None,
+    backoff: float,
+) -> bool:
+    """Decide whether a failed attempt is retried.
+
+    Args:
+        policy: Retry policy of the call
+        budget: Retry budget of the handler
+        attempt: Number of the attempt that failed, from 1
+        error: Error of the attempt
+        deadline: Deadline of the whole call, if any
+        backoff: Pause before the retry
+
+    Returns:
+        True if the call is retried after ``backoff`` seconds
+    """
+    if attempt >= policy.max_attempts or error.code() not in policy.retryable_codes:
+        return False
+    if deadline is not None and time.monotonic() + backoff >= deadline:
+        return False
+    if not budget.withdraw():
+        logger.debug(f"Retry budget exhausted, not retrying {error.code()}")
+        return False
+    return True
+
+
+def _hedge_after_failure(
+    policy: HedgePolicy, budget: RetryBudget, launched: int, failure: RpcError
+) -> bool:
+    """Decide whether a failed attempt of a hedged call starts another one.
+
+    Shared by the sync and asyncio handlers. An outdated typed schema is
+    fetched again by the next attempt, so it is retried like a
+    retryable code.
+
+    Args:
+        policy: Hedging policy of the call
+        budget: Retry budget of the handler
+        launched: Attempts started so far
+        failure: Error of the attempt
+
+    Returns:
+        True if another attempt is started at once
+    """
+    if failure.code() not in policy.retryable_codes and not _stale_schema(failure):
+        return False
+    return launched < policy.max_attempts and budget.withdraw()
+
+
+def _call_timeout(timeout: float | None, default: float | None) -> float | None:
+    """Resolve the timeout of a call.
+
+    Inside a route handler a call never outlives the request being served:
+    the remaining time of that request caps the timeout.
+
+    Args:
+        timeout: Timeout passed to the call, if any
+        default: Timeout of the request handler
+
+    Returns:
+        Timeout in seconds, or None for no deadline
+    """
+    return effective_timeout(timeout if timeout is not None else default)
+
+
+def _call_options(
+    message: Any,
+    timeout: float | None,
+    compression: CompressionPolicy | str | None,
+    handler: "GrpcRequestHandler | AsyncGrpcRequestHandler",
+) -> dict[str, Any]:
+    """Build the gRPC options of a call.
+
+    The request is compressed only when it reaches the policy's size
+    threshold. The policy's algorithm is also sent to the server, which
+    then uses it for the response.
+
+    Args:
+        message: Protobuf request about to be sent
+        timeout: Timeout passed to the call, if any
+        compression: Compression passed to the call, if any
+        handler: Request handler supplying the defaults
+
+    Returns:
+        Keyword arguments for the stub call
+    """
+    options: dict[str, Any] = {"timeout": _call_timeout(timeout, handler.timeout)}
+    policy = as_policy(compression) if compression is not None else handler.compression
+    if policy is not None:
+        if policy.compresses(message.ByteSize()):
+            options["compression"] = policy.compression
+        options["metadata"] = ((METADATA_KEY, policy.algorithm),)
+    return options
+
+
+def _typed_options(
+    message: Any,
+    timeout: float | None,
+    compression: CompressionPolicy | str | None,
+    handler: "GrpcRequestHandler | AsyncGrpcRequestHandler",
+    schema: TypedSchema,
+) -> dict[str, Any]:
+    """Build the gRPC options of a typed call.
+
+    Like :func:`_call_options`, plus the fingerprint of the schema the
+    message was built from, so the server can reject an outdated one.
+
+    Returns:
+        Keyword arguments for the multicallable
+    """
+    options = _call_options(message, timeout, compression, handler)
+    options["metadata"] = options.get("metadata", ()) + (
+        (SCHEMA_METADATA_KEY, schema.fingerprint),
+    )
+    return options
+
+
+def _to_schema(response: Any) -> TypedSchema | None:
+    """Rebuild the typed schema described by a Schema response.
+
+    Args:
+        response: Protobuf schema response
+
+    Returns:
+        Typed schema, or None if the server has no typed RPCs
+    """
+    if not response.descriptor:
+        return None
+    return TypedSchema(
+        response.descriptor,
+        [
+            (GrpcMethod.Name(route.method), route.url, route.rpc, route.streaming)
+            for route in response.routes
+        ],
+    )
+
+
+def _to_grpc_batch(
+    requests: list[Request], parallel: bool, codec: str | None = None
+) -> GrpcBatchRequest:
+    """Convert client requests into a protobuf batch request.
+
+    Args:
+        requests: Client request objects
+        parallel: Whether the server may run the requests concurrently
+        codec: Payload codec to encode the bodies with
+
+    Returns:
+        Protobuf batch request
+    """
+    return GrpcBatchRequest(
+        requests=[_to_grpc_request(request, codec) for request in requests],
+        parallel=parallel,
+    )
+
+
+def _batch_request(requests: list[Request]) -> Request:
+    """Describe a whole batch as one request for error reporting."""
+    urls = ", ".join(request.url for request in requests)
+    return Request(method=METHODS.POST, url=f"batch[{urls}]", body={})
+
+
+def _stats_request() -> Request:
+    """Describe a Stats call as a request for error reporting."""
+    return Request(method=METHODS.GET, url="stats", body={})
+
+
+def _to_response(response: Any) -> dict[str, Any]:
+    """Convert a protobuf response into the client response dictionary.
+
+    Args:
+        response: Protobuf response
+
+    Returns:
+        Response dictionary with result, status, data, message and attachment
+    """
+    if response.codec:
+        data = get_codec(response.codec).decode(response.payload) or None
+    else:
+        data = json_format.MessageToDict(getattr(response, "data", None)) or None
+
+    return Response(
+        result=response.result,
+        status=response.status_code,
+        data=data,
+        message=getattr(response, "message", None) or None,
+        attachment=response.attachment or None,
+    ).__dict__
+
+
+def _typed_response(route: TypedRoute, response: Any) -> dict[str, Any]:
+    """Convert a typed response message into the client response dictionary.
+
+    Args:
+        route: Typed route that answered
+        response: Response message
+
+    Returns:
+        Response dictionary, shaped like the one of a ``Dispatch`` call
+    """
+    # Typed RPCs only return a message on success
+    data = route.response.to_dict(response) or None
+    return Response(result=True, status=200, data=data).__dict__
+
+
+def _stale_schema(error: RpcError) -> bool:
+    """Tell whether the server rejected the schema a typed message was built from."""
+    return any(key == SCHEMA_METADATA_KEY for key, _ in error.trailing_metadata() or ())
+
+
+def _typed_error(error: RpcError) -> dict[str, Any] | None:
+    """Convert a route error of a typed call into the client response dictionary.
+
+    Route errors (not found, invalid arguments, ...) come back as a failed
+    response, exactly as through ``Dispatch``.
+
+    Args:
+        error: Error raised by gRPC
+
+    Returns:
+        Failed response dictionary, or None if the call itself failed
+        (transport, deadline, outdated schema, ...)
+    """
+    trailing = {key: value for key, value in error.trailing_metadata() or ()}
+    status = trailing.get(STATUS_METADATA_KEY)
+    if status is None:
+        return None
+    return Response(
+        result=False, status=int(status), data=None, message=error.details() or None
+    ).__dict__
+
+
+def _to_exception(request: Request, error: RpcError) -> GrpcException:
+    """Convert a failed RPC into a client exception.
+
+    Args:
+        request: Request that failed
+        error: Error raised by gRPC
+
+    Returns:
+        Exception to raise to the caller
+    """
+    # Extract error information
+    status_code = getattr(error, "code", lambda: grpc.StatusCode.UNKNOWN)()
+    details = getattr(error, "details", lambda: "Unknown error")()
+    debug_error_string = getattr(error, "debug_error_string", lambda: "")()
+
+    # Log detailed error on client side (for debugging)
+    logger.error(f"gRPC call failed: {error}")
+
+    # Create exception with minimal details for user-facing errors
+    return GrpcException(
+        url=request.url,
+        status_code=status_code,
+        details=details,
+        debug_error_string=debug_error_string,
+    )
+
 
 class GrpcRequestHandler:
     """Handler for making gRPC client requests.
 
     This class encapsulates the logic for making gRPC calls, converting
     between Python types and protobuf types, and handling errors.
+
+    Channels are taken from a :class:`ChannelPool`, so repeated calls
+    reuse warm HTTP/2 connections instead of reconnecting every time.
     """
 
-    def call(self, request: Request, grpc_url: str = "0.0.0.0:50052") -> dict[str, Any]:
+    def __init__(
+        self,
+        pool: ChannelPool | None = None,
+        codec: str | None = None,
+        timeout: float | None = None,
+        compression: CompressionPolicy | str | None = None,
+        typed: bool = False,
+        targets: Sequence[str] | Resolver | LoadBalancer | None = None,
+        policy: RetryPolicy | HedgePolicy | None = None,
+        url_policies: dict[str, RetryPolicy | HedgePolicy] | None = None,
+        retry_budget: RetryBudget | None = None,
+        upload_chunk_size: int = UPLOAD_CHUNK_SIZE,
+    ) -> None:
+        """Initialize the request handler.
+
+        Args:
+            pool: Channel pool to use; handlers created without one share
+                the process-wide default pool
+            codec: Payload codec (e.g. "json", "msgpack") to use instead of
+                google.protobuf.Struct; requires servers that support it
+            timeout: Default timeout of every call in seconds; None waits
+                indefinitely
+            compression: Default compression of every call: a policy, or
+                "gzip", "deflate" or "none"; None leaves it to the server
+            typed: Call the server's typed per-route RPCs where it has
+                them, falling back to ``Dispatch`` elsewhere
+            targets: Replicas that calls without a ``grpc_url`` are spread
+                over: server URIs, a resolver, or a configured
+                LoadBalancer (default: every call goes to 0.0.0.0:50052)
+            policy: Retry or hedging policy of :meth:`call`; None makes a
+                single attempt
+            url_policies: Policies of particular URLs, overriding
+                ``policy``; keys are URLs, or prefixes ending in "*"
+            retry_budget: Budget capping the retries and hedges of all
+                calls (default: a budget of this handler's own)
+            upload_chunk_size: Attachments larger than this many bytes are
+                streamed to the server in chunks of this size
+        """
+        if codec is not None:
+            get_codec(codec)
+
+        self.pool: ChannelPool = pool if pool is not None else default_pool
+        self._owns_pool: bool = pool is not None
+        self.codec: str | None = codec
+        self.timeout: float | None = timeout
+        self.compression: CompressionPolicy | None = as_policy(compression)
+        self.typed: bool = typed
+        self.balancer: LoadBalancer | None = _as_balancer(targets)
+        self.policy: RetryPolicy | HedgePolicy | None = policy
+        self.url_policies: dict[str, RetryPolicy | HedgePolicy] = dict(url_policies or {})
+        self.retry_budget: RetryBudget = (
+            retry_budget if retry_budget is not None else RetryBudget()
+        )
+        self.upload_chunk_size: int = upload_chunk_size
+        # Recent latencies of each URL, for hedging delays
+        self._latencies: LatencyTracker = LatencyTracker()
+        # Typed schema of each server; None for servers without one
+        self._schemas: dict[str, TypedSchema | None] = {}
+
+    def call(
+        self,
+        request: Request,
+        grpc_url: str | None = None,
+        timeout: float | None = None,
+        compression: CompressionPolicy | str | None = None,
+        policy: RetryPolicy | HedgePolicy | None = None,
+    ) -> dict[str, Any]:
         """Call a gRPC service endpoint.
 
+        Args:
+            request: Client request object
+            grpc_url: gRPC server URL (host:port) (default: a target of
+                the handler's balancer)
+            timeout: Seconds to wait for the response, retries and hedges
+                included (default: the handler's timeout); expiry raises
+                DEADLINE_EXCEEDED
+            compression: Compression of the call (default: the handler's)
+            policy: Retry or hedging policy of the call (default: the
+                handler's policy for the URL); only GET calls are hedged,
+                unless the policy is marked ``idempotent``
+
+        Returns:
+            Response dictionary with result, status, data, message and
+            attachment
+
+        Raises:
+            GrpcException: If the gRPC call fails
+        """
+        policy = _policy_for(self, request.url, policy)
+        try:
+            if isinstance(policy, HedgePolicy) and _hedged(request, policy):
+                return self._call_hedged(request, grpc_url, timeout, compression, policy)
+            if isinstance(policy, RetryPolicy):
+                return self._call_retried(request, grpc_url, timeout, compression, policy)
+            return self._attempt(request, grpc_url, timeout, compression)
+
+        except _ShedResponse as shed:
+            return shed.response
+
+        except RpcError as error:
+            raise _to_exception(request, error) from error
+
+    def call_batch(
+        self,
+        requests: Iterable[Request],
+        grpc_url: str | None = None,
+        parallel: bool = False,
+        timeout: float | None = None,
+        compression: CompressionPolicy | str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Call many endpoints in a single round trip.
+
+        Each request is routed and validated on its own, so one failing
+        item shows up as a failed response without affecting the others.
+
+        Args:
+            requests: Client request objects
+            grpc_url: gRPC server URL (host:port) (default: a target of
+                the handler's balancer)
+            parallel: Let the server run the requests concurrently
+            timeout: Seconds to wait for the whole batch (default: the
+                handler's timeout)
+            compression: Compression of the call (default: the handler's)
+
+        Returns:
+            One response dictionary per request, in order
+
+        Raises:
+            GrpcException: If the batch call itself fails
+        """
+        requests = list(requests)
+        try:
+            # A batch takes as long as its items: keep it out of the latency stats
+            with _target(self, grpc_url, record_latency=False) as target:
+                stub = self.pool.get_stub(target)
+                message = _to_grpc_batch(requests, parallel, self.codec)
+                response = stub.DispatchBatch(
+                    message, **_call_options(message, timeout, compression, self)
+                )
+                return [_to_response(item) for item in response.responses]
+
+        except RpcError as error:
+            raise _to_exception(_batch_request(requests), error) from error
+
+    def stream(
+        self,
+        request: Request,
+        grpc_url: str | None = None,
+        timeout: float | None = None,
+        compression: CompressionPolicy | str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Call a streaming endpoint and iterate over its chunks lazily.
+
+        Chunks are received as the iterator is consumed; abandoning the
+        iterator cancels the call.
+
+        Args:
+            request: Client request object
+            grpc_url: gRPC server URL (host:port) (default: a target of
+                the handler's balancer)
+            timeout: Seconds the whole stream may take (default: the
+                handler's timeout)
+            compression: Compression of the call (default: the handler's)
+
+        Yields:
+            One response dictionary per chunk sent by the handler
+
+        Raises:
+            GrpcException: If the gRPC call fails
+        """
+        # A stream lasts as long as its consumer: keep it out of the latency stats
+        with _target(self, grpc_url, record_latency=False) as target:
+            bound = self._bind(request, target, streaming=True) if self.typed else None
+            if bound is not None:
+                schema, route, message = bound
+                responses = route.multicallable(self.pool.get_channel(target))(
+                    message, **_typed_options(message, timeout, compression, self, schema)
+                )
+                try:
+                    for response in responses:
+                        yield _typed_response(route, response)
+                    return
+
+                except RpcError as error:
+                    if not _stale_schema(error):
+                        failed = _typed_error(error)
+                        if failed is None:
+                            raise _to_exception(request, error) from error
+                        yield failed
+                        return
+                    # Outdated schema: fetch it again next time, use Dispatch now
+                    self._schemas.pop(target, None)
+
+                finally:
+                    responses.cancel()
+
+            stub = self.pool.get_stub(target)
+            message = _to_grpc_request(request, self.codec)
+            responses = stub.DispatchStream(
+                message, **_call_options(message, timeout, compression, self)
+            )
+            try:
+                for response in responses:
+                    yield _to_response(response)
+
+            except RpcError as error:
+                raise _to_exception(request, error) from error
+
+            finally:
+                responses.cancel()
+
+    def stats(self, grpc_url: str | None = None) -> dict[str, Any]:
+        """Fetch the server's per-route request metrics.
+
+        Args:
+            grpc_url: gRPC server URL (host:port) (default: a target of
+                the handler's balancer)
+
+        Returns:
+            Dictionary with "routes" (requests, errors, in_flight, statuses
+            and p50/p99/p999 latency per route) and "caches"
+
+        Raises:
+            GrpcException: If the gRPC call fails
+        """
+        try:
+            with _target(self, grpc_url, record_latency=False) as target:
+                response = self.pool.get_stub(target).Stats(GrpcStatsRequest())
+            return json_format.MessageToDict(response.data)
+
+        except RpcError as error:
+            raise _to_exception(_stats_request(), error) from error
+
+    def prometheus_stats(self, grpc_url: str | None = None) -> str:
+        """Fetch the server's metrics in the Prometheus text format.
+
+        Args:
+            grpc_url: gRPC server URL (host:port) (default: a target of
+                the handler's balancer)
+
+        Returns:
+            Prometheus exposition text
+
+        Raises:
+            GrpcException: If the gRPC call fails
+        """
+        try:
+            with _target(self, grpc_url, record_latency=False) as target:
+                response = self.pool.get_stub(target).Stats(
+                    GrpcStatsRequest(format="prometheus")
+                )
+            return response.text
+
+        except RpcError as error:
+            raise _to_exception(_stats_request(), error) from error
+
+    def _attempt(
+        self,
+        request: Request,
+        grpc_url: str | None,
+        timeout: float | None,
+        compression: CompressionPolicy | str | None,
+        tried: set[str] | None = None,
+    ) -> dict[str, Any]:
+        """Make one attempt of a call.
+
+        Args:
+            request: Client request object
+            grpc_url: gRPC server URL (host:port), if passed to the call
+            timeout: Timeout of the attempt, if any
+            compression: Compression passed to the call, if any
+            tried: Targets of earlier attempts, avoided when possible
+
+        Returns:
+            Response dictionary
+
+        Raises:
+            RpcError: If the attempt failed, or was shed by the server
+        """
+        with _target(self, grpc_url, tried=tried) as target:
+            if self.typed:
+                response = self._call_typed(request, target, timeout, compression)
+                if response is not None:
+                    return _unless_shed(response)
+            stub = self.pool.get_stub(target)
+            upload = _upload_call(request, timeout, compression, self)
+            if upload is not None:
+                messages, options = upload
+                return _unless_shed(_to_response(stub.DispatchUpload(messages, **options)))
+            message = _to_grpc_request(request, self.codec)
+            response = stub.Dispatch(
+                message, **_call_options(message, timeout, compression, self)
+            )
+            return _unless_shed(_to_response(response))
+
+    def _call_retried(
+        self,
+        request: Request,
+        grpc_url: str | None,
+        timeout: float | None,
+        compression: CompressionPolicy | str | None,
+        policy: RetryPolicy,
+    ) -> dict[str, Any]:
+        """Call an endpoint, retrying the failures a policy allows.
+
+        Each retry goes to a replica not tried yet when the balancer has
+        one; all attempts share the timeout of the call.
+
+        Returns:
+            Response dictionary
+
+        Raises:
+            RpcError: If the last attempt failed
+        """
+        deadline = _deadline(timeout, self.timeout)
+        tried: set[str] = set()
+        self.retry_budget.deposit()
+        attempt = 1
+        while True:
+            try:
+                return self._attempt(
+                    request, grpc_url, _remaining(deadline), compression, tried
+                )
+            except RpcError as error:
+                backoff = policy.backoff(attempt)
+                allowed = _retry_allowed(
+                    policy, self.retry_budget, attempt, error, deadline, backoff
+                )
+                if not allowed:
+                    raise
+            time.sleep(backoff)
+            attempt += 1
+
+    def _call_hedged(
+        self,
+        request: Request,
+        grpc_url: str | None,
+        timeout: float | None,
+        compression: CompressionPolicy | str | None,
+        policy: HedgePolicy,
+    ) -> dict[str, Any]:
+        """Call an endpoint, racing extra attempts against a slow one.
+
+        Without an answer after the policy's delay, another attempt goes
+        to a replica not tried yet. The first answer wins and the other
+        attempts are cancelled; a failure with a retryable code starts the
+        next attempt at once.
+
+        Returns:
+            Response dictionary
+
+        Raises:
+            RpcError: If every attempt failed
+        """
+        deadline = _deadline(timeout, self.timeout)
+        delay: float | None = policy.hedge_delay(self._latencies, request.url)
+        tried: set[str] = set()
+        finished: queue.SimpleQueue = queue.SimpleQueue()
+        futures: list[grpc.Future] = []
+
+        def launch() -> None:
+            futures.append(
+                self._launch(request, grpc_url, deadline, compression, tried, finished)
+            )
+
+        self.retry_budget.deposit()
+        launch()
+        answered = 0
+        error: RpcError | None = None
+        try:
+            while answered < len(futures):
+                hedge = delay is not None and len(futures) < policy.max_attempts
+                try:
+                    response, failure, latency = finished.get(
+                        timeout=delay if hedge else None
+                    )
+                except queue.Empty:
+                    if self.retry_budget.withdraw():
+                        launch()
+                    else:
+                        delay = None
+                    continue
+
+                answered += 1
+                if failure is not None:
+                    error = failure
+                    if _hedge_after_failure(policy, self.retry_budget, len(futures), failure):
+                        launch()
+                    continue
+                self._latencies.record(request.url, latency)
+                return response
+
+            if error is None:
+                raise RuntimeError("Hedged call ended without any attempt finishing")
+            raise error
+
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _launch(
+        self,
+        request: Request,
+        grpc_url: str | None,
+        deadline: float | None,
+        compression: CompressionPolicy | str | None,
+        tried: set[str],
+        finished: queue.SimpleQueue,
+    ) -> grpc.Future:
+        """Start one attempt of a hedged call without waiting for it.
+
+        Once done, the attempt puts (response, error, latency) on
+        ``finished``: the response dictionary, or the RpcError the attempt
+        failed with, shed responses included.
+
+        Returns:
+            Future of the attempt, cancelled if it loses the race
+        """
+        balancer = self.balancer
+        endpoint = None
+        if grpc_url is None and balancer is not None:
+            endpoint = balancer.pick(tried)
+            target = endpoint.target
+            tried.add(target)
+        else:
+            target = grpc_url if grpc_url is not None else DEFAULT_TARGET
+        started = time.monotonic()
+        lease = self.pool.acquire(target)
+        try:
+            future, finish = self._send(request, target, _remaining(deadline), compression)
+        except BaseException:
+            self.pool.release(lease)
+            if endpoint is not None:
+                balancer.finish(endpoint, 0.0, None)  # type: ignore[union-attr]
+            raise
+
+        def done(future: grpc.Future) -> None:
+            latency = time.monotonic() - started
+            self.pool.release(lease)
+            if future.cancelled():
+                # Only losing attempts are cancelled, once the call is over
+                if endpoint is not None:
+                    balancer.finish(endpoint, latency, None)  # type: ignore[union-attr]
+                return
+            response: dict[str, Any] | None = None
+            error: RpcError | None = None
+            try:
+                response = _unless_shed(finish(future))
+            except RpcError as failure:
+                error = failure
+            if endpoint is not None:
+                failed = _is_failure(error) if error is not None else False
+                balancer.finish(endpoint, latency, failed)  # type: ignore[union-attr]
+            finished.put((response, error, latency))
+
+        future.add_done_callback(done)
+        return future
+
+    def _send(
+        self,
+        request: Request,
+        grpc_url: str,
+        timeout: float | None,
+        compression: CompressionPolicy | str | None,
+    ) -> tuple[grpc.Future, Callable[[grpc.Future], dict[str, Any]]]:
+        """Send one attempt of a call as a gRPC future.
+
+        Returns:
+            (future, finish): ``finish`` turns the completed future into a
+            response dictionary, and raises RpcError if the attempt failed
+            or the typed schema was outdated
+        """
+        bound = self._bind(request, grpc_url) if self.typed else None
+        if bound is None:
+            stub = self.pool.get_stub(grpc_url)
+            upload = _upload_call(request, timeout, compression, self)
+            if upload is not None:
+                messages, options = upload
+                future = stub.DispatchUpload.future(messages, **options)
+            else:
+                message = _to_grpc_request(request, self.codec)
+                future = stub.Dispatch.future(
+                    message, **_call_options(message, timeout, compression, self)
+                )
+            return future, lambda future: _to_response(future.result())
+
+        schema, route, message = bound
+        future = route.multicallable(self.pool.get_channel(grpc_url)).future(
+            message, **_typed_options(message, timeout, compression, self, schema)
+        )
+
+        def finish(future: grpc.Future) -> dict[str, Any]:
+            try:
+                return _typed_response(route, future.result())
+            except RpcError as error:
+                if _stale_schema(error):
+                    self._schemas.pop(grpc_url, None)
+                    raise
+                failed = _typed_error(error)
+                if failed is None:
+                    raise
+                return failed
+
+        return future, finish
+
+    def _call_typed(
+        self,
+        request: Request,
+        grpc_url: str,
+        timeout: float | None,
+        compression: CompressionPolicy | str | None,
+    ) -> dict[str, Any] | None:
+        """Call the typed RPC of a request's route, if the server has one.
+
+        Args:
+            request: Client request object
+            grpc_url: gRPC server URL (host:port)
+            timeout: Timeout passed to the call, if any
+            compression: Compression passed to the call, if any
+
+        Returns:
+            Response dictionary, or None to go through ``Dispatch``
+
+        Raises:
+            RpcError: If the call itself failed
+        """
+        bound = self._bind(request, grpc_url)
+        if bound is None:
+            return None
+        schema, route, message = bound
+        call = route.multicallable(self.pool.get_channel(grpc_url))
+        try:
+            response = call(
+                message, **_typed_options(message, timeout, compression, self, schema)
+            )
+        except RpcError as error:
+            if _stale_schema(error):
+                # Outdated schema: fetch it again next time, use Dispatch now
+                self._schemas.pop(grpc_url, None)
+                return None
+            failed = _typed_error(error)
+            if failed is None:
+                raise
+            return failed
+        return _typed_response(route, response)
+
+    def _bind(
+        self, request: Request, grpc_url: str, streaming: bool = False
+    ) -> tuple[TypedSchema, TypedRoute, Any] | None:
+        """Build the typed request message of a request.
+
         Args:
             request: Client request object
             grpc_url: gRPC server URL (host:port)
+            streaming: Whether the caller reads a stream of responses
+
+        Returns:
+            (schema, route, message), or None if the request has no
+            typed RPC; requests with an attachment never have one
+        """
+        if request.attachment:
+            return None
+        schema = self._schema(grpc_url)
+        if schema is None:
+            return None
+        bound = schema.bind(request.method, request.url, request.body, streaming)
+        if bound is None:
+            return None
+        return (schema, *bound)
+
+    def _schema(self, grpc_url: str) -> TypedSchema | None:
+        """Return the typed schema of a server, fetching it once.
+
+        Args:
+            grpc_url: gRPC server URL (host:port)
+
+        Returns:
+            Typed schema, or None if the server has none
+        """
+        if grpc_url in self._schemas:
+            return self._schemas[grpc_url]
+        try:
+            response = self.pool.get_stub(grpc_url).Schema(
+                GrpcSchemaRequest(), timeout=_call_timeout(None, self.timeout)
+            )
+        except RpcError as error:
+            # Servers predating typed RPCs never will have them; other
+            # errors are retried on the next call
+            if error.code() == grpc.StatusCode.UNIMPLEMENTED:
+                self._schemas[grpc_url] = None
+            return None
+        schema = self._schemas[grpc_url] = _to_schema(response)
+        return schema
+
+    def close(self) -> None:
+        """Close the channel pool if it was passed to this handler.
+
+        The shared default pool is left open for other handlers and
+        cleans itself up through idle eviction.
+        """
+        if self._owns_pool:
+            self.pool.close()
+
+    def __enter__(self) -> "GrpcRequestHandler":
+        """Return the handler for use in a ``with`` block."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Close the handler when leaving a ``with`` block."""
+        self.close()
+
+
+class AsyncGrpcRequestHandler:
+    """asyncio handler for making gRPC client requests on ``grpc.aio``.
+
+    Takes the same :class:`Request` objects and returns the same response
+    dictionaries as :class:`GrpcRequestHandler`. Many calls can be in
+    flight at once over the shared channels of its pool.
+    """
+
+    def __init__(
+        self,
+        pool: AsyncChannelPool | None = None,
+        codec: str | None = None,
+        timeout: float | None = None,
+        compression: CompressionPolicy | str | None = None,
+        typed: bool = False,
+        targets: Sequence[str] | Resolver | LoadBalancer | None = None,
+        policy: RetryPolicy | HedgePolicy | None = None,
+        url_policies: dict[str, RetryPolicy | HedgePolicy] | None = None,
+        retry_budget: RetryBudget | None = None,
+        upload_chunk_size: int = UPLOAD_CHUNK_SIZE,
+    ) -> None:
+        """Initialize the asyncio request handler.
+
+        Args:
+            pool: asyncio channel pool to use (default: a new pool with
+                one channel per target, closed by :meth:`close`)
+            codec: Payload codec to use instead of google.protobuf.Struct
+            timeout: Default timeout of every call in seconds; None waits
+                indefinitely
+            compression: Default compression of every call; None leaves
+                it to the server
+            typed: Call the server's typed per-route RPCs where it has
+                them, falling back to ``Dispatch`` elsewhere
+            targets: Replicas that calls without a ``grpc_url`` are spread
+                over: server URIs, a resolver, or a configured
+                LoadBalancer (default: every call goes to 0.0.0.0:50052)
+            policy: Retry or hedging policy of :meth:`call`; None makes a
+                single attempt
+            url_policies: Policies of particular URLs, overriding
+                ``policy``; keys are URLs, or prefixes ending in "*"
+            retry_budget: Budget capping the retries and hedges of all
+                calls (default: a budget of this handler's own)
+            upload_chunk_size: Attachments larger than this many bytes are
+                streamed to the server in chunks of this size
+        """
+        if codec is not None:
+            get_codec(codec)
+
+        self.pool: AsyncChannelPool = pool if pool is not None else AsyncChannelPool()
+        self.codec: str | None = codec
+        self.timeout: float | None = timeout
+        self.compression: CompressionPolicy | None = as_policy(compression)
+        self.typed: bool = typed
+        self.balancer: LoadBalancer | None = _as_balancer(targets)
+        self.policy: RetryPolicy | HedgePolicy | None = policy
+        self.url_policies: dict[str, RetryPolicy | HedgePolicy] = dict(url_policies or {})
+        self.retry_budget: RetryBudget = (
+            retry_budget if retry_budget is not None else RetryBudget()
+        )
+        self.upload_chunk_size: int = upload_chunk_size
+        # Recent latencies of each URL, for hedging delays
+        self._latencies: LatencyTracker = LatencyTracker()
+        # Typed schema of each server; None for servers without one
+        self._schemas: dict[str, TypedSchema | None] = {}
+
+    async def call(
+        self,
+        request: Request,
+        grpc_url: str | None = None,
+        timeout: float | None = None,
+        compression: CompressionPolicy | str | None = None,
+        policy: RetryPolicy | HedgePolicy | None = None,
+    ) -> dict[str, Any]:
+        """Call a gRPC service endpoint.
+
+        Args:
+            request: Client request object
+            grpc_url: gRPC server URL (host:port) (default: a target of
+                the handler's balancer)
+            timeout: Seconds to wait for the response, retries and hedges
+                included (default: the handler's timeout); expiry raises
+                DEADLINE_EXCEEDED
+            compression: Compression of the call (default: the handler's)
+            policy: Retry or hedging policy of the call (default: the
+                handler's policy for the URL); only GET calls are hedged,
+                unless the policy is marked ``idempotent``
+
+        Returns:
+            Response dictionary with result, status, data, message and
+            attachment
+
+        Raises:
+            GrpcException: If the gRPC call fails
+        """
+        policy = _policy_for(self, request.url, policy)
+        try:
+            if isinstance(policy, HedgePolicy) and _hedged(request, policy):
+                return await self._call_hedged(request, grpc_url, timeout, compression, policy)
+            if isinstance(policy, RetryPolicy):
+                return await self._call_retried(
+                    request, grpc_url, timeout, compression, policy
+                )
+            return await self._attempt(request, grpc_url, timeout, compression)
+
+        except _ShedResponse as shed:
+            return shed.response
+
+        except RpcError as error:
+            raise _to_exception(request, error) from error
+
+    async def call_batch(
+        self,
+        requests: Iterable[Request],
+        grpc_url: str | None = None,
+        parallel: bool = False,
+        timeout: float | None = None,
+        compression: CompressionPolicy | str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Call many endpoints in a single round trip.
+
+        Args:
+            requests: Client request objects
+            grpc_url: gRPC server URL (host:port) (default: a target of
+                the handler's balancer)
+            parallel: Let the server run the requests concurrently
+            timeout: Seconds to wait for the whole batch (default: the
+                handler's timeout)
+            compression: Compression of the call (default: the handler's)
+
+        Returns:
+            One response dictionary per request, in order
+
+        Raises:
+            GrpcException: If the batch call itself fails
+        """
+        requests = list(requests)
+        try:
+            # A batch takes as long as its items: keep it out of the latency stats
+            with _target(self, grpc_url, record_latency=False) as target:
+                stub = self.pool.get_stub(target)
+                message = _to_grpc_batch(requests, parallel, self.codec)
+                response = await stub.DispatchBatch(
+                    message, **_call_options(message, timeout, compression, self)
+                )
+                return [_to_response(item) for item in response.responses]
+
+        except RpcError as error:
+            raise _to_exception(_batch_request(requests), error) from error
+
+    async def stream(
+        self,
+        request: Request,
+        grpc_url: str | None = None,
+        timeout: float | None = None,
+        compression: CompressionPolicy | str | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Call a streaming endpoint and iterate over its chunks lazily.
+
+        Args:
+            request: Client request object
+            grpc_url: gRPC server URL (host:port) (default: a target of
+                the handler's balancer)
+            timeout: Seconds the whole stream may take (default: the
+                handler's timeout)
+            compression: Compression of the call (default: the handler's)
+
+        Yields:
+            One response dictionary per chunk sent by the handler
+
+        Raises:
+            GrpcException: If the gRPC call fails
+        """
+        # A stream lasts as long as its consumer: keep it out of the latency stats
+        with _target(self, grpc_url, record_latency=False) as target:
+            bound = await self._bind(request, target, streaming=True) if self.typed else None
+            if bound is not None:
+                schema, route, message = bound
+                responses = route.multicallable(self.pool.get_channel(target))(
+                    message, **_typed_options(message, timeout, compression, self, schema)
+                )
+                try:
+                    async for response in responses:
+                        yield _typed_response(route, response)
+                    return
+
+                except RpcError as error:
+                    if not _stale_schema(error):
+                        failed = _typed_error(error)
+                        if failed is None:
+                            raise _to_exception(request, error) from error
+                        yield failed
+                        return
+                    self._schemas.pop(target, None)
+
+                finally:
+                    responses.cancel()
+
+            stub = self.pool.get_stub(target)
+            message = _to_grpc_request(request, self.codec)
+            responses = stub.DispatchStream(
+                message, **_call_options(message, timeout, compression, self)
+            )
+            try:
+                async for response in responses:
+                    yield _to_response(response)
+
+            except RpcError as error:
+                raise _to_exception(request, error) from error
+
+            finally:
+                responses.cancel()
+
+    async def call_many(
+        self,
+        requests: Iterable[Request],
+        grpc_url: str | None = None,
+        concurrency: int = 10,
+        return_exceptions: bool = False,
+        timeout: float | None = None,
+        compression: CompressionPolicy | str | None = None,
+        policy: RetryPolicy | HedgePolicy | None = None,
+    ) -> list[dict[str, Any] | Exception]:
+        """Call many endpoints concurrently and return results in order.
+
+        Args:
+            requests: Client request objects
+            grpc_url: gRPC server URL (host:port) (default: a target of
+                the handler's balancer)
+            concurrency: Maximum number of calls in flight at once
+            return_exceptions: Return the exception in place of a failed
+                call's result instead of raising the first failure: a
+                GrpcException for calls that failed or found no server,
+                the original error for anything else (e.g. encoding)
+            timeout: Seconds each call may take (default: the handler's
+                timeout)
+            compression: Compression of the call (default: the handler's)
+            policy: Retry or hedging policy of each call (default: the
+                handler's policy for its URL)
 
         Returns:
-            Response dictionary with result, status, data, and message
+            One response dictionary (or exception) per request, in order
+
+        Raises:
+            GrpcException: If a call fails and return_exceptions is False;
+                the calls still running are cancelled
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(request: Request) -> dict[str, Any]:
+            async with semaphore:
+                return await self.call(request, grpc_url, timeout, compression, policy)
+
+        tasks = [asyncio.ensure_future(bounded(request)) for request in requests]
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+        finally:
+            # After the first failure, do not leave the other calls running
+            for task in tasks:
+                task.cancel()
+
+    async def as_completed(
+        self,
+        requests: Iterable[Request],
+        grpc_url: str | None = None,
+        concurrency: int = 10,
+        timeout: float | None = None,
+        compression: CompressionPolicy | str | None = None,
+        policy: RetryPolicy | HedgePolicy | None = None,
+    ) -> AsyncIterator[tuple[int, dict[str, Any] | GrpcException]]:
+        """Call many endpoints concurrently, yielding results as they finish.
+
+        Args:
+            requests: Client request objects
+            grpc_url: gRPC server URL (host:port) (default: a target of
+                the handler's balancer)
+            concurrency: Maximum number of calls in flight at once
+            timeout: Seconds each call may take (default: the handler's
+                timeout)
+            compression: Compression of the call (default: the handler's)
+            policy: Retry or hedging policy of each call (default: the
+                handler's policy for its URL)
+
+        Yields:
+            (index of the request, response dictionary or GrpcException)
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(
+            index: int, request: Request
+        ) -> tuple[int, dict[str, Any] | GrpcException]:
+            async with semaphore:
+                try:
+                    return index, await self.call(
+                        request, grpc_url, timeout, compression, policy
+                    )
+                except GrpcException as error:
+                    return index, error
+
+        tasks = [
+            asyncio.ensure_future(bounded(index, request))
+            for index, request in enumerate(requests)
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            # The consumer stopped early: do not leave calls running
+            for task in tasks:
+                task.cancel()
+
+    async def stats(self, grpc_url: str | None = None) -> dict[str, Any]:
+        """Fetch the server's per-route request metrics.
+
+        Args:
+            grpc_url: gRPC server URL (host:port) (default: a target of
+                the handler's balancer)
+
+        Returns:
+            Dictionary with "routes" (requests, errors, in_flight, statuses
+            and p50/p99/p999 latency per route) and "caches"
+
+        Raises:
+            GrpcException: If the gRPC call fails
+        """
+        try:
+            with _target(self, grpc_url, record_latency=False) as target:
+                response = await self.pool.get_stub(target).Stats(GrpcStatsRequest())
+            return json_format.MessageToDict(response.data)
+
+        except RpcError as error:
+            raise _to_exception(_stats_request(), error) from error
+
+    async def prometheus_stats(self, grpc_url: str | None = None) -> str:
+        """Fetch the server's metrics in the Prometheus text format.
+
+        Args:
+            grpc_url: gRPC server URL (host:port) (default: a target of
+                the handler's balancer)
+
+        Returns:
+            Prometheus exposition text
 
         Raises:
             GrpcException: If the gRPC call fails
         """
         try:
-            with grpc.insecure_channel(grpc_url) as channel:
-                stub = GrpcHandlerStub(channel)
+            with _target(self, grpc_url, record_latency=False) as target:
+                response = await self.pool.get_stub(target).Stats(
+                    GrpcStatsRequest(format="prometheus")
+                )
+            return response.text
+
+        except RpcError as error:
+            raise _to_exception(_stats_request(), error) from error
+
+    async def _attempt(
+        self,
+        request: Request,
+        grpc_url: str | None,
+        timeout: float | None,
+        compression: CompressionPolicy | str | None,
+        tried: set[str] | None = None,
+    ) -> dict[str, Any]:
+        """Make one attempt of a call.
+
+        Args:
+            request: Client request object
+            grpc_url: gRPC server URL (host:port), if passed to the call
+            timeout: Timeout of the attempt, if any
+            compression: Compression passed to the call, if any
+            tried: Targets of earlier attempts, avoided when possible
+
+        Returns:
+            Response dictionary
+
+        Raises:
+            RpcError: If the attempt failed, or was shed by the server
+        """
+        with _target(self, grpc_url, tried=tried) as target:
+            if self.typed:
+                response = await self._call_typed(request, target, timeout, compression)
+                if response is not None:
+                    return _unless_shed(response)
+            stub = self.pool.get_stub(target)
+            upload = _upload_call(request, timeout, compression, self)
+            if upload is not None:
+                messages, options = upload
+                response = await stub.DispatchUpload(messages, **options)
+                return _unless_shed(_to_response(response))
+            message = _to_grpc_request(request, self.codec)
+            response = await stub.Dispatch(
+                message, **_call_options(message, timeout, compression, self)
+            )
+            return _unless_shed(_to_response(response))
 
-                # Convert Python dict to protobuf Struct
-                request_data = Struct()
-                request_data.update(request.body)
+    async def _call_retried(
+        self,
+        request: Request,
+        grpc_url: str | None,
+        timeout: float | None,
+        compression: CompressionPolicy | str | None,
+        policy: RetryPolicy,
+    ) -> dict[str, Any]:
+        """Call an endpoint, retrying the failures a policy allows.
 
-                # Make the gRPC call
-                grpc_request = GrpcRequest(
-                    url=request.url, method=request.method, body=request_data
+        Each retry goes to a replica not tried yet when the balancer has
+        one; all attempts share the timeout of the call.
+
+        Returns:
+            Response dictionary
+
+        Raises:
+            RpcError: If the last attempt failed
+        """
+        deadline = _deadline(timeout, self.timeout)
+        tried: set[str] = set()
+        self.retry_budget.deposit()
+        attempt = 1
+        while True:
+            try:
+                return await self._attempt(
+                    request, grpc_url, _remaining(deadline), compression, tried
                 )
-                response = stub.Dispatch(grpc_request)
+            except RpcError as error:
+                backoff = policy.backoff(attempt)
+                allowed = _retry_allowed(
+                    policy, self.retry_budget, attempt, error, deadline, backoff
+                )
+                if not allowed:
+                    raise
+            await asyncio.sleep(backoff)
+            attempt += 1
+
+    async def _call_hedged(
+        self,
+        request: Request,
+        grpc_url: str | None,
+        timeout: float | None,
+        compression: CompressionPolicy | str | None,
+        policy: HedgePolicy,
+    ) -> dict[str, Any]:
+        """Call an endpoint, racing extra attempts against a slow one.
 
-                # Convert protobuf Response to Python dict
-                return Response(
-                    result=response.result,
-                    status=response.status_code,
-                    data=json_format.MessageToDict(getattr(response, "data", None))
-                    or None,
-                    message=getattr(response, "message", None) or None,
-                ).__dict__
+        Without an answer after the policy's delay, another attempt goes
+        to a replica not tried yet. The first answer wins and the other
+        attempts are cancelled; a failure with a retryable code starts the
+        next attempt at once.
+
+        Returns:
+            Response dictionary
+
+        Raises:
+            RpcError: If every attempt failed
+        """
+        deadline = _deadline(timeout, self.timeout)
+        delay: float | None = policy.hedge_delay(self._latencies, request.url)
+        tried: set[str] = set()
+        started: dict[asyncio.Future, float] = {}
+        pending: set[asyncio.Future] = set()
+
+        def launch() -> None:
+            task = asyncio.ensure_future(
+                self._attempt(request, grpc_url, _remaining(deadline), compression, tried)
+            )
+            started[task] = time.monotonic()
+            pending.add(task)
+
+        self.retry_budget.deposit()
+        launch()
+        error: RpcError | None = None
+        try:
+            while pending:
+                hedge = delay is not None and len(started) < policy.max_attempts
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=delay if hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    if self.retry_budget.withdraw():
+                        launch()
+                    else:
+                        delay = None
+                    continue
+
+                for task in done:
+                    pending.discard(task)
+                    try:
+                        response = task.result()
+                    except RpcError as failure:
+                        error = failure
+                        if _hedge_after_failure(
+                            policy, self.retry_budget, len(started), failure
+                        ):
+                            launch()
+                        continue
+                    self._latencies.record(request.url, time.monotonic() - started[task])
+                    return response
+
+            if error is None:
+                raise RuntimeError("Hedged call ended without any attempt finishing")
+            raise error
+
+        finally:
+            for task in started:
+                task.cancel()
+
+    async def _call_typed(
+        self,
+        request: Request,
+        grpc_url: str,
+        timeout: float | None,
+        compression: CompressionPolicy | str | None,
+    ) -> dict[str, Any] | None:
+        """Call the typed RPC of a request's route, if the server has one.
+
+        Args:
+            request: Client request object
+            grpc_url: gRPC server URL (host:port)
+            timeout: Timeout passed to the call, if any
+            compression: Compression passed to the call, if any
 
+        Returns:
+            Response dictionary, or None to go through ``Dispatch``
+
+        Raises:
+            RpcError: If the call itself failed
+        """
+        bound = await self._bind(request, grpc_url)
+        if bound is None:
+            return None
+        schema, route, message = bound
+        call = route.multicallable(self.pool.get_channel(grpc_url))
+        try:
+            response = await call(
+                message, **_typed_options(message, timeout, compression, self, schema)
+            )
         except RpcError as error:
-            # Extract error information
-            status_code = getattr(error, "code", lambda: grpc.StatusCode.UNKNOWN)()
-            details = getattr(error, "details", lambda: "Unknown error")()
-            debug_error_string = getattr(error, "debug_error_string", lambda: "")()
-
-            # Log detailed error on client side (for debugging)
-            logger.error(f"gRPC call failed: {error}")
-
-            # Create exception with minimal details for user-facing errors
-            exception = GrpcException(
-                url=request.url,
-                status_code=status_code,
-                details=details,
-                debug_error_string=debug_error_string,
+            if _stale_schema(error):
+                # Outdated schema: fetch it again next time, use Dispatch now
+                self._schemas.pop(grpc_url, None)
+                return None
+            failed = _typed_error(error)
+            if failed is None:
+                raise
+            return failed
+        return _typed_response(route, response)
+
+    async def _bind(
+        self, request: Request, grpc_url: str, streaming: bool = False
+    ) -> tuple[TypedSchema, TypedRoute, Any] | None:
+        """Build the typed request message of a request.
+
+        Args:
+            request: Client request object
+            grpc_url: gRPC server URL (host:port)
+            streaming: Whether the caller reads a stream of responses
+
+        Returns:
+            (schema, route, message), or None if the request has no
+            typed RPC; requests with an attachment never have one
+        """
+        if request.attachment:
+            return None
+        schema = await self._schema(grpc_url)
+        if schema is None:
+            return None
+        bound = schema.bind(request.method, request.url, request.body, streaming)
+        if bound is None:
+            return None
+        return (schema, *bound)
+
+    async def _schema(self, grpc_url: str) -> TypedSchema | None:
+        """Return the typed schema of a server, fetching it once.
+
+        Args:
+            grpc_url: gRPC server URL (host:port)
+
+        Returns:
+            Typed schema, or None if the server has none
+        """
+        if grpc_url in self._schemas:
+            return self._schemas[grpc_url]
+        try:
+            response = await self.pool.get_stub(grpc_url).Schema(
+                GrpcSchemaRequest(), timeout=_call_timeout(None, self.timeout)
             )
-            raise exception from error
+        except RpcError as error:
+            # Servers predating typed RPCs never will have them; other
+            # errors are retried on the next call
+            if error.code() == grpc.StatusCode.UNIMPLEMENTED:
+                self._schemas[grpc_url] = None
+            return None
+        schema = self._schemas[grpc_url] = _to_schema(response)
+        return schema
+
+    async def close(self) -> None:
+        """Close the channel pool."""
+        await self.pool.close()
+
+    async def __aenter__(self) -> "AsyncGrpcRequestHandler":
+        """Return the handler for use in an ``async with`` block."""
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Close the handler when leaving an ``async with`` block."""
+        await self.close()
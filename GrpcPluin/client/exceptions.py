@@ -34,17 +34,32 @@ class GrpcException(Exception):
         self.url: str = url
         self.status_code: grpc.StatusCode = status_code
         self.details: str | None = details
-        self.created_time: datetime = self._parse_created_time(debug_error_string)
+        self._debug_error_string: str = debug_error_string
+        self._created_time: datetime | None = None
+        self._raised_time: datetime = datetime.now()
+
+    @property
+    def created_time(self) -> datetime:
+        """Timestamp when the error was created.
+
+        Parsed from the debug error string on first access, so failures
+        that are retried or only counted never pay for the regex.
+        """
+        if self._created_time is None:
+            self._created_time = (
+                self._parse_created_time(self._debug_error_string) or self._raised_time
+            )
+        return self._created_time
 
     @staticmethod
-    def _parse_created_time(error_string: str) -> datetime:
+    def _parse_created_time(error_string: str) -> datetime | None:
         """Parse created_time from debug error string.
 
         Args:
             error_string: Debug error string containing timestamp
 
         Returns:
-            Parsed datetime object
+            Parsed datetime object, or None if the string has no timestamp
 
         Raises:
             ValueError: If timestamp cannot be parsed
@@ -53,7 +68,7 @@ class GrpcException(Exception):
         match = re.search(pattern, error_string)
 
         if match is None:
-            return datetime.now()
+            return None
 
         time_str = match.group(1)
         return datetime.fromisoformat(time_str)
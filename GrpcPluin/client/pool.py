@@ -0,0 +1,285 @@
+"""Pool of reusable gRPC client channels."""
+
+import contextlib
+import itertools
+import threading
+import time
+from typing import Any, Iterator, Sequence
+
+import grpc
+
+from GrpcPluin.proto.base_proto_pb2_grpc import GrpcHandlerStub
+
+
+class _PooledTarget:
+    """Channels and stubs kept open for a single target."""
+
+    __slots__ = ("channels", "stubs", "counter", "last_used", "in_flight")
+
+    def __init__(self, channels: list[grpc.Channel]) -> None:
+        self.channels: list[grpc.Channel] = channels
+        self.stubs: list[GrpcHandlerStub] = [GrpcHandlerStub(c) for c in channels]
+        self.counter: Iterator[int] = itertools.count()
+        self.last_used: float = time.monotonic()
+        self.in_flight: int = 0
+
+    def next_index(self) -> int:
+        """Return the index of the next channel in round-robin order."""
+        self.last_used = time.monotonic()
+        return next(self.counter) % len(self.channels)
+
+    def next_stub(self) -> GrpcHandlerStub:
+        """Return the next stub in round-robin order."""
+        return self.stubs[self.next_index()]
+
+    def next_channel(self) -> grpc.Channel:
+        """Return the next channel in round-robin order."""
+        return self.channels[self.next_index()]
+
+    def close(self) -> None:
+        """Close every channel of the target."""
+        for channel in self.channels:
+            channel.close()
+
+
+class ChannelPool:
+    """Pool of warm gRPC channels keyed by target.
+
+    Each target gets ``channels_per_target`` channels, each with its own
+    HTTP/2 connection, and calls are spread over them round-robin.
+    Targets unused for ``idle_timeout`` seconds are closed; targets with
+    a call in progress under :meth:`lease` never are.
+
+    The pool is thread-safe and can be used as a context manager.
+    """
+
+    def __init__(
+        self,
+        channels_per_target: int = 1,
+        idle_timeout: float | None = 300.0,
+        options: Sequence[tuple[str, Any]] = (),
+    ) -> None:
+        """Initialize an empty pool.
+
+        Args:
+            channels_per_target: Sub-channels (connections) per target
+            idle_timeout: Seconds before an unused target is closed;
+                None keeps targets open until :meth:`close`
+            options: Extra channel arguments passed to every channel
+        """
+        if channels_per_target < 1:
+            raise ValueError("channels_per_target must be at least 1")
+
+        self.channels_per_target: int = channels_per_target
+        self.idle_timeout: float | None = idle_timeout
+        self.options: list[tuple[str, Any]] = list(options)
+        if channels_per_target > 1:
+            # Without a local subchannel pool, channels with identical
+            # arguments would share a single connection.
+            self.options.append(("grpc.use_local_subchannel_pool", 1))
+
+        self._targets: dict[str, _PooledTarget] = {}
+        self._lock = threading.Lock()
+        self._last_sweep: float = time.monotonic()
+
+    def get_stub(self, target: str) -> GrpcHandlerStub:
+        """Return a stub bound to a pooled channel for ``target``.
+
+        Args:
+            target: Server URI (host:port)
+
+        Returns:
+            Stub sharing a warm channel
+        """
+        with self._lock:
+            return self._pooled(target).next_stub()
+
+    def get_channel(self, target: str) -> grpc.Channel:
+        """Return a pooled channel for ``target``, for calls outside the stub.
+
+        Args:
+            target: Server URI (host:port)
+
+        Returns:
+            Warm channel, in the same round-robin order as the stubs
+        """
+        with self._lock:
+            return self._pooled(target).next_channel()
+
+    @contextlib.contextmanager
+    def lease(self, target: str) -> Iterator[None]:
+        """Keep the channels of ``target`` open while a ``with`` block runs.
+
+        Wrap calls that may outlast ``idle_timeout``, such as streams and
+        uploads; the target counts as used until the block exits.
+
+        Args:
+            target: Server URI (host:port)
+        """
+        token = self.acquire(target)
+        try:
+            yield
+        finally:
+            self.release(token)
+
+    def acquire(self, target: str) -> _PooledTarget:
+        """Mark ``target`` busy until :meth:`release`.
+
+        For calls that end in a callback rather than a ``with`` block.
+
+        Args:
+            target: Server URI (host:port)
+
+        Returns:
+            Token to pass to :meth:`release`
+        """
+        with self._lock:
+            pooled = self._pooled(target)
+            pooled.in_flight += 1
+            return pooled
+
+    def release(self, token: _PooledTarget) -> None:
+        """End a use of a target started by :meth:`acquire`.
+
+        Args:
+            token: Token returned by :meth:`acquire`
+        """
+        with self._lock:
+            token.in_flight -= 1
+            token.last_used = time.monotonic()
+
+    def _pooled(self, target: str) -> _PooledTarget:
+        """Return the channels of a target, opening them if needed.
+
+        Must be called with the lock held.
+        """
+        self._evict_idle()
+        pooled = self._targets.get(target)
+        if pooled is None:
+            pooled = _PooledTarget(
+                [
+                    grpc.insecure_channel(target, options=self.options)
+                    for _ in range(self.channels_per_target)
+                ]
+            )
+            self._targets[target] = pooled
+        return pooled
+
+    def _evict_idle(self) -> None:
+        """Close targets that have been idle for longer than the timeout.
+
+        Must be called with the lock held. Sweeps at most twice per
+        timeout period so the common path stays a clock read.
+        """
+        if self.idle_timeout is None:
+            return
+        now = time.monotonic()
+        if now - self._last_sweep < self.idle_timeout / 2:
+            return
+        self._last_sweep = now
+
+        for target, pooled in list(self._targets.items()):
+            if pooled.in_flight == 0 and now - pooled.last_used >= self.idle_timeout:
+                del self._targets[target]
+                pooled.close()
+
+    def close(self) -> None:
+        """Close every pooled channel."""
+        with self._lock:
+            targets, self._targets = self._targets, {}
+        for pooled in targets.values():
+            pooled.close()
+
+    def __enter__(self) -> "ChannelPool":
+        """Return the pool for use in a ``with`` block."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Close the pool when leaving a ``with`` block."""
+        self.close()
+
+
+# Shared by every GrpcRequestHandler created without an explicit pool
+default_pool = ChannelPool()
+
+
+class AsyncChannelPool:
+    """Pool of ``grpc.aio`` channels keyed by target.
+
+    asyncio channels are bound to the event loop they were created on,
+    so a pool must only be used from a single loop. Unlike
+    :class:`ChannelPool` it has no lock and no idle eviction: it lives
+    as long as the handler or task group that owns it.
+    """
+
+    def __init__(
+        self,
+        channels_per_target: int = 1,
+        options: Sequence[tuple[str, Any]] = (),
+    ) -> None:
+        """Initialize an empty pool.
+
+        Args:
+            channels_per_target: Sub-channels (connections) per target
+            options: Extra channel arguments passed to every channel
+        """
+        if channels_per_target < 1:
+            raise ValueError("channels_per_target must be at least 1")
+
+        self.channels_per_target: int = channels_per_target
+        self.options: list[tuple[str, Any]] = list(options)
+        if channels_per_target > 1:
+            self.options.append(("grpc.use_local_subchannel_pool", 1))
+
+        self._targets: dict[str, _PooledTarget] = {}
+
+    def get_stub(self, target: str) -> GrpcHandlerStub:
+        """Return a stub bound to a pooled asyncio channel for ``target``.
+
+        Args:
+            target: Server URI (host:port)
+
+        Returns:
+            Stub whose RPC methods return awaitables
+        """
+        return self._pooled(target).next_stub()
+
+    def get_channel(self, target: str) -> grpc.aio.Channel:
+        """Return a pooled asyncio channel for ``target``.
+
+        Args:
+            target: Server URI (host:port)
+
+        Returns:
+            Channel, in the same round-robin order as the stubs
+        """
+        return self._pooled(target).next_channel()
+
+    @contextlib.contextmanager
+    def lease(self, target: str) -> Iterator[None]:
+        """Same as :meth:`ChannelPool.lease`; this pool never evicts.
+
+        Args:
+            target: Server URI (host:port)
+        """
+        yield
+
+    def _pooled(self, target: str) -> _PooledTarget:
+        """Return the channels of a target, opening them if needed."""
+        pooled = self._targets.get(target)
+        if pooled is None:
+            pooled = _PooledTarget(
+                [
+                    grpc.aio.insecure_channel(target, options=self.options)
+                    for _ in range(self.channels_per_target)
+                ]
+            )
+            self._targets[target] = pooled
+        return pooled
+
+    async def close(self) -> None:
+        """Close every pooled channel."""
+        targets, self._targets = self._targets, {}
+        for pooled in targets.values():
+            for channel in pooled.channels:
+                await channel.close()
@@ -0,0 +1,259 @@
+"""Retries and hedged requests for the client.
+
+A :class:`RetryPolicy` retries calls that failed with a retryable status
+code, after a jittered exponential backoff. A :class:`HedgePolicy` sends
+another attempt when the first one takes longer than the URL usually does
+(its p95 by default), returns the first answer and cancels the others.
+Hedging runs a request more than once, so only GET calls are hedged
+unless the policy is marked ``idempotent``; other calls make one attempt.
+
+Responses the server shed under load (status 429 or 503, sent with gRPC
+OK) count as RESOURCE_EXHAUSTED and UNAVAILABLE failures here.
+
+Both draw extra attempts from a :class:`RetryBudget`, which caps them at a
+share of all calls: when a server is down, calls fail fast instead of
+multiplying its load.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+import grpc
+
+# Status codes worth another attempt: the server did not process the call.
+# Shed responses with status 429 and 503 are retried as these codes.
+RETRYABLE_CODES: frozenset[grpc.StatusCode] = frozenset(
+    {grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.RESOURCE_EXHAUSTED}
+)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retries of failed calls.
+
+    Attributes:
+        max_attempts: Attempts in total, the first one included
+        initial_backoff: Upper bound of the first backoff, in seconds
+        max_backoff: Upper bound of any backoff, in seconds
+        multiplier: Growth of the backoff bound after each attempt
+        retryable_codes: Status codes that are retried
+    """
+
+    max_attempts: int = 3
+    initial_backoff: float = 0.05
+    max_backoff: float = 1.0
+    multiplier: float = 2.0
+    retryable_codes: frozenset[grpc.StatusCode] = RETRYABLE_CODES
+
+    def __post_init__(self) -> None:
+        """Validate the policy.
+
+        Raises:
+            ValueError: If max_attempts is below 1 or a backoff negative
+        """
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if self.initial_backoff < 0 or self.max_backoff < 0:
+            raise ValueError("Backoffs must not be negative")
+
+    def backoff(self, attempt: int) -> float:
+        """Return the pause before the attempt after ``attempt``.
+
+        Full jitter: a uniform draw below the exponential bound, so
+        clients that failed together do not retry together.
+
+        Args:
+            attempt: Number of the attempt that failed, from 1
+        """
+        bound = min(self.max_backoff, self.initial_backoff * self.multiplier ** (attempt - 1))
+        return random.uniform(0.0, bound)
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """Hedged requests: extra attempts racing a slow one.
+
+    Attributes:
+        max_attempts: Attempts in total, the first one included
+        delay: Seconds before each extra attempt; None uses the URL's
+            ``percentile`` latency
+        percentile: Latency percentile of the URL that triggers a hedge
+        initial_delay: Delay until the URL has ``min_samples`` latencies
+        min_samples: Calls of a URL needed before its percentile is used
+        min_delay: Lower bound of the percentile-based delay, in seconds
+        retryable_codes: Failures that start the next attempt at once
+        idempotent: Hedge calls of every method; by default only GET
+            calls are hedged, others get a single attempt
+    """
+
+    max_attempts: int = 2
+    delay: Optional[float] = None
+    percentile: float = 95.0
+    initial_delay: float = 0.05
+    min_samples: int = 20
+    min_delay: float = 0.001
+    retryable_codes: frozenset[grpc.StatusCode] = RETRYABLE_CODES
+    idempotent: bool = False
+
+    def __post_init__(self) -> None:
+        """Validate the policy.
+
+        Raises:
+            ValueError: If max_attempts is below 1 or the percentile out
+                of range
+        """
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if not 0 < self.percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+
+    def hedge_delay(self, latencies: "LatencyTracker", url: str) -> float:
+        """Return the seconds to wait before hedging a call.
+
+        Args:
+            latencies: Recent latencies of the handler's calls
+            url: URL of the call
+        """
+        if self.delay is not None:
+            return self.delay
+        quantile = latencies.quantile(url, self.percentile, self.min_samples)
+        if quantile is None:
+            return self.initial_delay
+        return max(self.min_delay, quantile)
+
+
+class RetryBudget:
+    """Caps retries and hedges at a share of all calls.
+
+    A token bucket: every call deposits ``ratio`` tokens, and every extra
+    attempt withdraws one. ``min_per_second`` tokens are added each second
+    regardless, so low-traffic clients can still retry. Thread-safe.
+
+    Attributes:
+        ratio: Extra attempts allowed per call
+        min_per_second: Extra attempts always allowed per second
+        max_tokens: Largest burst of extra attempts
+    """
+
+    def __init__(
+        self, ratio: float = 0.1, min_per_second: float = 10.0, max_tokens: float = 20.0
+    ) -> None:
+        """Initialize a full budget.
+
+        Args:
+            ratio: Extra attempts allowed per call
+            min_per_second: Extra attempts always allowed per second
+            max_tokens: Largest burst of extra attempts
+
+        Raises:
+            ValueError: If a setting is negative or max_tokens below 1
+        """
+        if ratio < 0 or min_per_second < 0 or max_tokens < 1:
+            raise ValueError("ratio and min_per_second must not be negative, max_tokens >= 1")
+        self.ratio: float = ratio
+        self.min_per_second: float = min_per_second
+        self.max_tokens: float = max_tokens
+        self._tokens: float = max_tokens
+        self._updated: float = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """Extra attempts currently available."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def deposit(self) -> None:
+        """Credit the budget for a call."""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take one extra attempt from the budget.
+
+        Returns:
+            True if the attempt may be made
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last update; lock held."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.max_tokens, self._tokens + (now - self._updated) * self.min_per_second
+        )
+        self._updated = now
+
+
+class LatencyTracker:
+    """Recent latencies of each URL, for percentile-based hedging delays.
+
+    Keeps the last ``window`` latencies of at most ``max_urls`` URLs;
+    sorted copies are refreshed every ``window // 8`` samples, so reading a
+    percentile is a list lookup. Thread-safe.
+    """
+
+    def __init__(self, window: int = 256, max_urls: int = 1024) -> None:
+        """Initialize an empty tracker.
+
+        Args:
+            window: Latencies kept per URL
+            max_urls: URLs tracked at once; the oldest is dropped first
+        """
+        self.window: int = window
+        self.max_urls: int = max_urls
+        self._samples: dict[str, deque[float]] = {}
+        self._sorted: dict[str, list[float]] = {}
+        self._pending: dict[str, int] = {}
+        self._refresh_every: int = max(1, window // 8)
+        self._lock = threading.Lock()
+
+    def record(self, url: str, latency: float) -> None:
+        """Add the latency of a successful call.
+
+        Args:
+            url: URL of the call
+            latency: Seconds the call took
+        """
+        with self._lock:
+            samples = self._samples.get(url)
+            if samples is None:
+                if len(self._samples) >= self.max_urls:
+                    oldest = next(iter(self._samples))
+                    del self._samples[oldest]
+                    self._sorted.pop(oldest, None)
+                    self._pending.pop(oldest, None)
+                samples = self._samples[url] = deque(maxlen=self.window)
+            samples.append(latency)
+            pending = self._pending.get(url, 0) + 1
+            if pending >= self._refresh_every or url not in self._sorted:
+                self._sorted[url] = sorted(samples)
+                pending = 0
+            self._pending[url] = pending
+
+    def quantile(self, url: str, percentile: float, min_samples: int = 1) -> float | None:
+        """Return a latency percentile of a URL.
+
+        Args:
+            url: URL of the calls
+            percentile: Percentile, between 0 and 100
+            min_samples: Latencies needed for a meaningful answer
+
+        Returns:
+            Latency in seconds, or None with too few samples
+        """
+        with self._lock:
+            ordered = self._sorted.get(url)
+        if ordered is None or len(ordered) < min_samples:
+            return None
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
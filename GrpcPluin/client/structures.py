@@ -22,10 +22,12 @@ class Request:
         method: HTTP method
         url: Request URL path
         body: Request body data as dictionary
+        attachment: Raw binary data for the handler's bytes parameters
     """
     method: METHODS
     url: str
     body: dict[str, Any]
+    attachment: Optional[bytes] = None
 
 
 @dataclass
@@ -37,8 +39,10 @@ class Response:
         status: HTTP status code
         data: Response data payload
         message: Optional response message
+        attachment: Raw binary data returned by the handler
     """
     result: bool
     status: int
     data: Optional[dict[str, Any]] = None
     message: Optional[str] = None
+    attachment: Optional[bytes] = None
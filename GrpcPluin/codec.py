@@ -0,0 +1,99 @@
+"""Compact payload codecs negotiated per request.
+
+A request that sets ``Request.codec`` carries its body in
+``Request.payload`` encoded with that codec, and the server answers in
+``Response.payload`` with the same codec. Requests without a codec keep
+using ``google.protobuf.Struct``, so old clients are unaffected.
+
+``json`` is always available (accelerated by ``orjson`` when installed);
+``msgpack`` is registered when the ``msgpack`` package is installed.
+"""
+
+import json
+from typing import Any, Callable
+
+
+class Codec:
+    """A named pair of encode/decode functions.
+
+    Attributes:
+        name: Identifier sent on the wire in the ``codec`` field
+        encode: Function turning a Python value into bytes
+        decode: Function turning bytes back into a Python value
+    """
+
+    __slots__ = ("name", "encode", "decode")
+
+    def __init__(
+        self,
+        name: str,
+        encode: Callable[[Any], bytes],
+        decode: Callable[[bytes], Any],
+    ) -> None:
+        """Initialize a codec.
+
+        Args:
+            name: Identifier sent on the wire
+            encode: Encoder function
+            decode: Decoder function
+        """
+        self.name: str = name
+        self.encode: Callable[[Any], bytes] = encode
+        self.decode: Callable[[bytes], Any] = decode
+
+
+CODECS: dict[str, Codec] = {}
+
+
+def register_codec(codec: Codec) -> None:
+    """Register a codec, replacing any codec with the same name.
+
+    Args:
+        codec: Codec to register
+    """
+    CODECS[codec.name] = codec
+
+
+def get_codec(name: str) -> Codec:
+    """Look up a registered codec.
+
+    Args:
+        name: Codec name
+
+    Returns:
+        The registered codec
+
+    Raises:
+        KeyError: If no codec is registered under that name
+    """
+    return CODECS[name]
+
+
+try:
+    import orjson
+
+    register_codec(Codec("json", orjson.dumps, orjson.loads))
+except ImportError:
+    register_codec(
+        Codec(
+            "json",
+            lambda value: json.dumps(value, separators=(",", ":")).encode(),
+            json.loads,
+        )
+    )
+
+# The built-in JSON codec: response models may be serialized to it directly
+JSON_CODEC: Codec = CODECS["json"]
+
+try:
+    import msgpack
+
+    register_codec(
+        Codec(
+            "msgpack",
+            msgpack.packb,
+            lambda data: msgpack.unpackb(data, raw=False),
+        )
+    )
+except ImportError:
+    pass
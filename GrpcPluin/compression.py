@@ -0,0 +1,74 @@
+"""Size-aware message compression, shared by the client and the server.
+
+Compression is gRPC's own transport compression, so any gRPC peer can
+read the messages. A :class:`CompressionPolicy` adds a size threshold:
+messages smaller than ``min_size`` are sent uncompressed, where
+compressing would cost more CPU than it saves on the wire.
+
+The server picks the policy of a response from, most specific first: the
+client's per-call choice, the route's ``compression`` and the router's
+default.
+"""
+
+from dataclasses import dataclass
+
+import grpc
+
+ALGORITHMS: dict[str, grpc.Compression] = {
+    "none": grpc.Compression.NoCompression,
+    "gzip": grpc.Compression.Gzip,
+    "deflate": grpc.Compression.Deflate,
+}
+
+# Metadata key a client sets to choose the compression of the response
+METADATA_KEY = "grpcplugin-compression"
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    """Compression policy of a call, route or server.
+
+    Attributes:
+        algorithm: "gzip", "deflate" or "none"
+        min_size: Messages smaller than this many bytes (before
+            compression) are sent uncompressed
+    """
+
+    algorithm: str = "gzip"
+    min_size: int = 1024
+
+    def __post_init__(self) -> None:
+        """Validate the policy.
+
+        Raises:
+            ValueError: If the algorithm is unknown or min_size negative
+        """
+        if self.algorithm not in ALGORITHMS:
+            raise ValueError(
+                f"Unknown compression {self.algorithm!r}; expected one of {sorted(ALGORITHMS)}"
+            )
+        if self.min_size < 0:
+            raise ValueError("min_size must not be negative")
+
+    @property
+    def compression(self) -> grpc.Compression:
+        """gRPC compression algorithm of the policy."""
+        return ALGORITHMS[self.algorithm]
+
+    def compresses(self, size: int) -> bool:
+        """Return whether a message of ``size`` bytes should be compressed."""
+        return self.algorithm != "none" and size >= self.min_size
+
+
+def as_policy(value: "CompressionPolicy | str | None") -> CompressionPolicy | None:
+    """Turn a policy or an algorithm name into a policy.
+
+    Args:
+        value: CompressionPolicy, algorithm name, or None
+
+    Returns:
+        The policy (default threshold for a bare name), or None
+    """
+    if value is None or isinstance(value, CompressionPolicy):
+        return value
+    return CompressionPolicy(algorithm=value)
@@ -0,0 +1,189 @@
+"""Deadline and cancellation state of the RPC being served.
+
+The server runs every handler inside a :class:`CallContext` holding the
+caller's deadline and a way to tell whether the caller is still there.
+Handlers read it with :func:`current_call`, and client calls made while
+serving a request inherit the remaining time as their own timeout, so a
+whole chain of calls gives up together.
+
+This module is shared by the client and the server and imports neither.
+"""
+
+import contextlib
+import contextvars
+import time
+from typing import Callable, Iterator
+
+# Remaining times above this are gRPC's "infinite" deadline
+_NO_DEADLINE = 10.0**8
+
+
+class CallAbandoned(Exception):
+    """Raised by :meth:`CallContext.check` once the result is no longer wanted.
+
+    Attributes:
+        cancelled: True if the caller cancelled, False if the deadline passed
+    """
+
+    def __init__(self, cancelled: bool) -> None:
+        """Initialize the exception.
+
+        Args:
+            cancelled: True if the caller cancelled, False if the deadline
+                passed
+        """
+        super().__init__("Call cancelled by the client" if cancelled else "Deadline exceeded")
+        self.cancelled: bool = cancelled
+
+
+class CallContext:
+    """Deadline and cancellation token of one call.
+
+    Attributes:
+        deadline: ``time.monotonic()`` value at which the caller gives up,
+            or None for no deadline
+    """
+
+    __slots__ = ("deadline", "_is_active")
+
+    def __init__(
+        self,
+        deadline: float | None = None,
+        is_active: Callable[[], bool] | None = None,
+    ) -> None:
+        """Initialize the call context.
+
+        Args:
+            deadline: Monotonic deadline, or None
+            is_active: Returns False once the caller has gone away
+        """
+        self.deadline: float | None = deadline
+        self._is_active: Callable[[], bool] | None = is_active
+
+    @classmethod
+    def from_timeout(
+        cls, timeout: float | None, is_active: Callable[[], bool] | None = None
+    ) -> "CallContext":
+        """Create a context whose deadline is ``timeout`` seconds away.
+
+        Args:
+            timeout: Seconds left, as reported by gRPC; None or gRPC's
+                "infinite" value means no deadline
+            is_active: Returns False once the caller has gone away
+
+        Returns:
+            Call context
+        """
+        if timeout is None or timeout > _NO_DEADLINE:
+            return cls(None, is_active)
+        return cls(time.monotonic() + timeout, is_active)
+
+    def time_remaining(self) -> float | None:
+        """Return the seconds left before the deadline, or None without one."""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has passed."""
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the caller cancelled or disconnected."""
+        return self._is_active is not None and not self._is_active()
+
+    def is_active(self) -> bool:
+        """Return True while the result of the call is still wanted."""
+        return not (self.expired or self.cancelled)
+
+    def check(self) -> None:
+        """Stop a handler that works for a caller who already gave up.
+
+        Long-running handlers should call this between steps.
+
+        Raises:
+            CallAbandoned: If the caller cancelled or the deadline passed
+        """
+        # gRPC also cancels calls whose deadline passed: report those as such
+        if self.expired:
+            raise CallAbandoned(cancelled=False)
+        if self.cancelled:
+            raise CallAbandoned(cancelled=True)
+
+
+_current_call: contextvars.ContextVar[CallContext | None] = contextvars.ContextVar(
+    "current_call", default=None
+)
+
+
+def current_call() -> CallContext | None:
+    """Return the context of the call being served, if any.
+
+    Returns:
+        Call context inside a route handler, None elsewhere
+    """
+    return _current_call.get()
+
+
+def time_remaining() -> float | None:
+    """Return the seconds left for the call being served.
+
+    Returns:
+        Remaining seconds, or None outside a call or without a deadline
+    """
+    call = _current_call.get()
+    return call.time_remaining() if call is not None else None
+
+
+@contextlib.contextmanager
+def call_scope(call: CallContext) -> Iterator[CallContext]:
+    """Make ``call`` the current call for the duration of a ``with`` block.
+
+    Args:
+        call: Context of the call being served
+
+    Yields:
+        The same call context
+    """
+    token = _current_call.set(call)
+    try:
+        yield call
+    finally:
+        _current_call.reset(token)
+
+
+def bound_context(call: CallContext) -> contextvars.Context:
+    """Return a copy of the current context in which ``call`` is current.
+
+    For work that a ``with`` block cannot span, such as a generator
+    resumed by gRPC: run each step with the returned context's ``run``.
+
+    Args:
+        call: Context of the call being served
+
+    Returns:
+        Context to run the call's work in
+    """
+    context = contextvars.copy_context()
+    context.run(_current_call.set, call)
+    return context
+
+
+def effective_timeout(timeout: float | None) -> float | None:
+    """Combine an explicit timeout with the budget of the current call.
+
+    Args:
+        timeout: Timeout asked for by the caller, if any
+
+    Returns:
+        The smaller of ``timeout`` and the time left for the call being
+        served; None if neither is set
+    """
+    remaining = time_remaining()
+    if remaining is None:
+        return timeout
+    if timeout is None:
+        return remaining
+    return min(timeout, remaining)
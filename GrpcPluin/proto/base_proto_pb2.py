@@ -1,11 +1,22 @@
 # -*- coding: utf-8 -*-
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
 # source: base_proto.proto
+# Protobuf Python Version: 6.31.1
 """Generated protocol buffer code."""
-from google.protobuf.internal import builder as _builder
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
 from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    6,
+    31,
+    1,
+    '',
+    'base_proto.proto'
+)
 # @@protoc_insertion_point(imports)
 
 _sym_db = _symbol_database.Default()
@@ -14,19 +25,33 @@ _sym_db = _symbol_database.Default()
 from google.protobuf import struct_pb2 as google_dot_protobuf_dot_struct__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x10\x62\x61se_proto.proto\x1a\x1cgoogle/protobuf/struct.proto\"V\n\x07Request\x12\x0b\n\x03url\x18\x01 \x01(\t\x12\x17\n\x06method\x18\x02 \x01(\x0e\x32\x07.Method\x12%\n\x04\x62ody\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct\"\x86\x01\n\x08Response\x12\x0e\n\x06result\x18\x01 \x01(\x08\x12\x13\n\x0bstatus_code\x18\x04 \x01(\x03\x12\x14\n\x07message\x18\x02 \x01(\tH\x00\x88\x01\x01\x12*\n\x04\x64\x61ta\x18\x03 \x01(\x0b\x32\x17.google.protobuf.StructH\x01\x88\x01\x01\x42\n\n\x08_messageB\x07\n\x05_data*0\n\x06Method\x12\x07\n\x03GET\x10\x00\x12\x08\n\x04POST\x10\x01\x12\x07\n\x03PUT\x10\x02\x12\n\n\x06\x44\x45LETE\x10\x03\x32\x30\n\x0bGrpcHandler\x12!\n\x08\x44ispatch\x12\x08.Request\x1a\t.Response\"\x00\x62\x06proto3')
-
-_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
-_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'base_proto_pb2', globals())
-if _descriptor._USE_C_DESCRIPTORS == False:
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x10\x62\x61se_proto.proto\x1a\x1cgoogle/protobuf/struct.proto\"\x8a\x01\n\x07Request\x12\x0b\n\x03url\x18\x01 \x01(\t\x12\x17\n\x06method\x18\x02 \x01(\x0e\x32\x07.Method\x12%\n\x04\x62ody\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x0f\n\x07payload\x18\x04 \x01(\x0c\x12\r\n\x05\x63odec\x18\x05 \x01(\t\x12\x12\n\nattachment\x18\x06 \x01(\x0c\"\xba\x01\n\x08Response\x12\x0e\n\x06result\x18\x01 \x01(\x08\x12\x13\n\x0bstatus_code\x18\x04 \x01(\x03\x12\x14\n\x07message\x18\x02 \x01(\tH\x00\x88\x01\x01\x12*\n\x04\x64\x61ta\x18\x03 \x01(\x0b\x32\x17.google.protobuf.StructH\x01\x88\x01\x01\x12\x0f\n\x07payload\x18\x05 \x01(\x0c\x12\r\n\x05\x63odec\x18\x06 \x01(\t\x12\x12\n\nattachment\x18\x07 \x01(\x0c\x42\n\n\x08_messageB\x07\n\x05_data\"<\n\x0c\x42\x61tchRequest\x12\x1a\n\x08requests\x18\x01 \x03(\x0b\x32\x08.Request\x12\x10\n\x08parallel\x18\x02 \x01(\x08\"-\n\rBatchResponse\x12\x1c\n\tresponses\x18\x01 \x03(\x0b\x32\t.Response\"\x1e\n\x0cStatsRequest\x12\x0e\n\x06\x66ormat\x18\x01 \x01(\t\"D\n\rStatsResponse\x12%\n\x04\x64\x61ta\x18\x01 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x0c\n\x04text\x18\x02 \x01(\t\"\x0f\n\rSchemaRequest\"S\n\x0bRouteSchema\x12\x17\n\x06method\x18\x01 \x01(\x0e\x32\x07.Method\x12\x0b\n\x03url\x18\x02 \x01(\t\x12\x0b\n\x03rpc\x18\x03 \x01(\t\x12\x11\n\tstreaming\x18\x04 \x01(\x08\"B\n\x0eSchemaResponse\x12\x12\n\ndescriptor\x18\x01 \x01(\x0c\x12\x1c\n\x06routes\x18\x02 \x03(\x0b\x32\x0c.RouteSchema*0\n\x06Method\x12\x07\n\x03GET\x10\x00\x12\x08\n\x04POST\x10\x01\x12\x07\n\x03PUT\x10\x02\x12\n\n\x06\x44\x45LETE\x10\x03\x32\x8f\x02\n\x0bGrpcHandler\x12!\n\x08\x44ispatch\x12\x08.Request\x1a\t.Response\"\x00\x12)\n\x0e\x44ispatchStream\x12\x08.Request\x1a\t.Response\"\x00\x30\x01\x12\x30\n\rDispatchBatch\x12\r.BatchRequest\x1a\x0e.BatchResponse\"\x00\x12)\n\x0e\x44ispatchUpload\x12\x08.Request\x1a\t.Response\"\x00(\x01\x12(\n\x05Stats\x12\r.StatsRequest\x1a\x0e.StatsResponse\"\x00\x12+\n\x06Schema\x12\x0e.SchemaRequest\x1a\x0f.SchemaResponse\"\x00\x62\x06proto3')
 
-  DESCRIPTOR._options = None
-  _METHOD._serialized_start=275
-  _METHOD._serialized_end=323
-  _REQUEST._serialized_start=50
-  _REQUEST._serialized_end=136
-  _RESPONSE._serialized_start=139
-  _RESPONSE._serialized_end=273
-  _GRPCHANDLER._serialized_start=325
-  _GRPCHANDLER._serialized_end=373
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'base_proto_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_METHOD']._serialized_start=761
+  _globals['_METHOD']._serialized_end=809
+  _globals['_REQUEST']._serialized_start=51
+  _globals['_REQUEST']._serialized_end=189
+  _globals['_RESPONSE']._serialized_start=192
+  _globals['_RESPONSE']._serialized_end=378
+  _globals['_BATCHREQUEST']._serialized_start=380
+  _globals['_BATCHREQUEST']._serialized_end=440
+  _globals['_BATCHRESPONSE']._serialized_start=442
+  _globals['_BATCHRESPONSE']._serialized_end=487
+  _globals['_STATSREQUEST']._serialized_start=489
+  _globals['_STATSREQUEST']._serialized_end=519
+  _globals['_STATSRESPONSE']._serialized_start=521
+  _globals['_STATSRESPONSE']._serialized_end=589
+  _globals['_SCHEMAREQUEST']._serialized_start=591
+  _globals['_SCHEMAREQUEST']._serialized_end=606
+  _globals['_ROUTESCHEMA']._serialized_start=608
+  _globals['_ROUTESCHEMA']._serialized_end=691
+  _globals['_SCHEMARESPONSE']._serialized_start=693
+  _globals['_SCHEMARESPONSE']._serialized_end=759
+  _globals['_GRPCHANDLER']._serialized_start=812
+  _globals['_GRPCHANDLER']._serialized_end=1083
 # @@protoc_insertion_point(module_scope)
@@ -1,9 +1,29 @@
 # Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
 """Client and server classes corresponding to protobuf-defined services."""
 import grpc
+import warnings
 
 from . import base_proto_pb2 as base__proto__pb2
 
+GRPC_GENERATED_VERSION = '1.76.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in base_proto_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
 
 class GrpcHandlerStub(object):
     """Missing associated documentation comment in .proto file."""
@@ -18,7 +38,32 @@ class GrpcHandlerStub(object):
                 '/GrpcHandler/Dispatch',
                 request_serializer=base__proto__pb2.Request.SerializeToString,
                 response_deserializer=base__proto__pb2.Response.FromString,
-                )
+                _registered_method=True)
+        self.DispatchStream = channel.unary_stream(
+                '/GrpcHandler/DispatchStream',
+                request_serializer=base__proto__pb2.Request.SerializeToString,
+                response_deserializer=base__proto__pb2.Response.FromString,
+                _registered_method=True)
+        self.DispatchBatch = channel.unary_unary(
+                '/GrpcHandler/DispatchBatch',
+                request_serializer=base__proto__pb2.BatchRequest.SerializeToString,
+                response_deserializer=base__proto__pb2.BatchResponse.FromString,
+                _registered_method=True)
+        self.DispatchUpload = channel.stream_unary(
+                '/GrpcHandler/DispatchUpload',
+                request_serializer=base__proto__pb2.Request.SerializeToString,
+                response_deserializer=base__proto__pb2.Response.FromString,
+                _registered_method=True)
+        self.Stats = channel.unary_unary(
+                '/GrpcHandler/Stats',
+                request_serializer=base__proto__pb2.StatsRequest.SerializeToString,
+                response_deserializer=base__proto__pb2.StatsResponse.FromString,
+                _registered_method=True)
+        self.Schema = channel.unary_unary(
+                '/GrpcHandler/Schema',
+                request_serializer=base__proto__pb2.SchemaRequest.SerializeToString,
+                response_deserializer=base__proto__pb2.SchemaResponse.FromString,
+                _registered_method=True)
 
 
 class GrpcHandlerServicer(object):
@@ -30,6 +75,37 @@ class GrpcHandlerServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def DispatchStream(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DispatchBatch(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DispatchUpload(self, request_iterator, context):
+        """One request whose attachment is split over the streamed messages
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Stats(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Schema(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_GrpcHandlerServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -38,10 +114,36 @@ def add_GrpcHandlerServicer_to_server(servicer, server):
                     request_deserializer=base__proto__pb2.Request.FromString,
                     response_serializer=base__proto__pb2.Response.SerializeToString,
             ),
+            'DispatchStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.DispatchStream,
+                    request_deserializer=base__proto__pb2.Request.FromString,
+                    response_serializer=base__proto__pb2.Response.SerializeToString,
+            ),
+            'DispatchBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.DispatchBatch,
+                    request_deserializer=base__proto__pb2.BatchRequest.FromString,
+                    response_serializer=base__proto__pb2.BatchResponse.SerializeToString,
+            ),
+            'DispatchUpload': grpc.stream_unary_rpc_method_handler(
+                    servicer.DispatchUpload,
+                    request_deserializer=base__proto__pb2.Request.FromString,
+                    response_serializer=base__proto__pb2.Response.SerializeToString,
+            ),
+            'Stats': grpc.unary_unary_rpc_method_handler(
+                    servicer.Stats,
+                    request_deserializer=base__proto__pb2.StatsRequest.FromString,
+                    response_serializer=base__proto__pb2.StatsResponse.SerializeToString,
+            ),
+            'Schema': grpc.unary_unary_rpc_method_handler(
+                    servicer.Schema,
+                    request_deserializer=base__proto__pb2.SchemaRequest.FromString,
+                    response_serializer=base__proto__pb2.SchemaResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'GrpcHandler', rpc_method_handlers)
     server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('GrpcHandler', rpc_method_handlers)
 
 
  # This class is part of an EXPERIMENTAL API.
@@ -59,8 +161,153 @@ class GrpcHandler(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/GrpcHandler/Dispatch',
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/GrpcHandler/Dispatch',
+            base__proto__pb2.Request.SerializeToString,
+            base__proto__pb2.Response.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def DispatchStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/GrpcHandler/DispatchStream',
             base__proto__pb2.Request.SerializeToString,
             base__proto__pb2.Response.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def DispatchBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/GrpcHandler/DispatchBatch',
+            base__proto__pb2.BatchRequest.SerializeToString,
+            base__proto__pb2.BatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def DispatchUpload(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/GrpcHandler/DispatchUpload',
+            base__proto__pb2.Request.SerializeToString,
+            base__proto__pb2.Response.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Stats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/GrpcHandler/Stats',
+            base__proto__pb2.StatsRequest.SerializeToString,
+            base__proto__pb2.StatsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Schema(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/GrpcHandler/Schema',
+            base__proto__pb2.SchemaRequest.SerializeToString,
+            base__proto__pb2.SchemaResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,540 @@
+"""Typed per-route protobuf messages, shared by the client and the server.
+
+Besides the generic ``Dispatch`` RPC, the server exposes one RPC per route
+whose request and response are protobuf messages generated from the
+route's pydantic types (see ``GrpcPluin.Frame.codegen``). Those messages
+are encoded natively by protobuf instead of going through a schemaless
+``google.protobuf.Struct``, and keep ints and floats apart.
+
+The server describes the typed RPCs through the ``Schema`` RPC; a
+:class:`TypedSchema` rebuilds the message classes from that description,
+so clients need no generated code. This module imports protobuf only.
+"""
+
+import hashlib
+import re
+import weakref
+from typing import Any, Callable, Iterable
+
+from google.protobuf import descriptor_pool, json_format, message_factory, struct_pb2
+from google.protobuf.descriptor import Descriptor, FieldDescriptor
+from google.protobuf.message import DecodeError, Message
+
+# Metadata key carrying the schema fingerprint a client built its messages from
+SCHEMA_METADATA_KEY = "grpcplugin-schema"
+
+# Trailing metadata key carrying the HTTP-style status of a failed typed call
+STATUS_METADATA_KEY = "grpcplugin-status"
+
+_STRUCT = "google.protobuf.Struct"
+_VALUE = "google.protobuf.Value"
+
+# Converters of path parameter segments, by protobuf field type
+_SEGMENT_CONVERTERS: dict[int, Callable[[str], Any]] = {
+    FieldDescriptor.TYPE_INT64: int,
+    FieldDescriptor.TYPE_DOUBLE: float,
+    FieldDescriptor.TYPE_STRING: str,
+}
+
+_PARAM_PATTERN = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)(?::[A-Za-z_]+)?\}")
+
+
+def _value_writer(value_class: type[Message]) -> Callable[[Any], Message]:
+    """Build the converter of JSON-compatible Python values to ``Value`` messages.
+
+    Args:
+        value_class: ``google.protobuf.Value`` class of the schema's pool
+    """
+    return lambda value: json_format.ParseDict(value, value_class())
+
+
+def _from_value(value: Message) -> Any:
+    """Convert a ``google.protobuf.Value`` or ``Struct`` to Python data."""
+    return json_format.MessageToDict(value)
+
+
+class MessageCodec:
+    """Converts between dicts and the messages of one protobuf type.
+
+    The conversion plan is built once from the message descriptor; fields
+    typed as ``google.protobuf.Value`` carry values the generator could not
+    map to a protobuf type.
+
+    Attributes:
+        message_class: Generated message class
+        complete: Whether :meth:`to_dict` reports unset optional fields as
+            None (responses, like a model dump) or leaves them out
+            (requests, so handler defaults apply)
+    """
+
+    __slots__ = (
+        "message_class",
+        "complete",
+        "_readers",
+        "_defaults",
+        "_fields",
+        "_writers",
+        "_is_struct",
+    )
+
+    def __init__(
+        self,
+        descriptor: Descriptor,
+        complete: bool = False,
+        codecs: dict[tuple[str, bool], "MessageCodec"] | None = None,
+    ) -> None:
+        """Build the conversion plan of a message type.
+
+        Args:
+            descriptor: Message descriptor
+            complete: Report unset optional fields as None; applies to
+                nested messages too
+            codecs: Codecs of the nested message types built so far, so
+                recursive types reuse them instead of recursing forever
+        """
+        if codecs is None:
+            codecs = {}
+        codecs[descriptor.full_name, complete] = self
+        self.message_class: type[Message] = message_factory.GetMessageClass(descriptor)
+        self.complete: bool = complete
+        self._is_struct: bool = descriptor.full_name == _STRUCT
+        # Field name -> converter of its value, None when used as is
+        self._readers: dict[str, Callable[[Any], Any] | None] = {}
+        # Field name -> factory of the value reported when it is unset
+        self._defaults: dict[str, Callable[[], Any]] = {}
+        # Field name -> converter of dict values before building a message
+        self._writers: dict[str, Callable[[Any], Any] | None] = {}
+        self._fields: frozenset[str] = frozenset(field.name for field in descriptor.fields)
+        if self._is_struct:
+            return
+
+        for field in descriptor.fields:
+            self._readers[field.name] = self._reader(field, codecs)
+            self._writers[field.name] = self._writer(field, codecs)
+            if field.message_type is not None and field.message_type.GetOptions().map_entry:
+                self._defaults[field.name] = dict
+            elif field.label == FieldDescriptor.LABEL_REPEATED:
+                self._defaults[field.name] = list
+            elif complete:
+                self._defaults[field.name] = _none
+
+    def _nested(
+        self, descriptor: Descriptor, codecs: dict[tuple[str, bool], "MessageCodec"]
+    ) -> "MessageCodec":
+        """Return the codec of a nested message type."""
+        codec = codecs.get((descriptor.full_name, self.complete))
+        if codec is None:
+            codec = MessageCodec(descriptor, self.complete, codecs)
+        return codec
+
+    def _reader(
+        self, field: FieldDescriptor, codecs: dict[tuple[str, bool], "MessageCodec"]
+    ) -> Callable[[Any], Any] | None:
+        """Build the converter of a field's protobuf value to Python."""
+        message_type = field.message_type
+        if message_type is not None and message_type.GetOptions().map_entry:
+            value_field = message_type.fields_by_name["value"]
+            convert = self._single_reader(value_field, codecs)
+            if convert is None:
+                return dict
+            return lambda entries: {key: convert(value) for key, value in entries.items()}
+
+        convert = self._single_reader(field, codecs)
+        if field.label == FieldDescriptor.LABEL_REPEATED:
+            if convert is None:
+                return list
+            return lambda values: [convert(value) for value in values]
+        return convert
+
+    def _single_reader(
+        self, field: FieldDescriptor, codecs: dict[tuple[str, bool], "MessageCodec"]
+    ) -> Callable[[Any], Any] | None:
+        """Build the converter of one value of a field, ignoring its label."""
+        if field.message_type is None:
+            return None
+        if field.message_type.full_name in (_STRUCT, _VALUE):
+            return _from_value
+        return self._nested(field.message_type, codecs).to_dict
+
+    def _writer(
+        self, field: FieldDescriptor, codecs: dict[tuple[str, bool], "MessageCodec"]
+    ) -> Callable[[Any], Any] | None:
+        """Build the converter of a field's Python value, None if not needed.
+
+        Message constructors take nested dicts and lists as they are; only
+        ``Value`` fields, at any depth, need converting first.
+        """
+        message_type = field.message_type
+        if message_type is None:
+            return None
+        if message_type.GetOptions().map_entry:
+            convert = self._writer(message_type.fields_by_name["value"], codecs)
+            if convert is None:
+                return None
+            return lambda entries: {key: convert(value) for key, value in entries.items()}
+
+        if message_type.full_name == _VALUE:
+            single: Callable[[Any], Any] | None = _value_writer(
+                message_factory.GetMessageClass(message_type)
+            )
+        elif message_type.full_name == _STRUCT or not _has_values(message_type):
+            single = None
+        else:
+            single = self._nested(message_type, codecs)._kwargs
+
+        if single is None:
+            return None
+        if field.label == FieldDescriptor.LABEL_REPEATED:
+            return lambda values: [single(value) for value in values]
+        return lambda value: single(value) if value is not None else None
+
+    def to_dict(self, message: Message) -> dict[str, Any]:
+        """Convert a message to a dict.
+
+        Args:
+            message: Message of this codec's type
+
+        Returns:
+            Field values by name; repeated and map fields are always present
+        """
+        if self._is_struct:
+            return _from_value(message)
+
+        data = {}
+        readers = self._readers
+        for field, value in message.ListFields():
+            convert = readers[field.name]
+            data[field.name] = value if convert is None else convert(value)
+        for name, default in self._defaults.items():
+            if name not in data:
+                data[name] = default()
+        return data
+
+    def from_dict(self, data: dict[str, Any]) -> Message:
+        """Build a message from a dict of JSON-compatible values.
+
+        Keys that are not fields of the message are ignored.
+
+        Args:
+            data: Field values by name; None leaves a field unset
+
+        Returns:
+            Message of this codec's type
+
+        Raises:
+            ValueError, TypeError: If a value does not fit its field
+        """
+        if self._is_struct:
+            message = self.message_class()
+            message.update(data)
+            return message
+        return self.message_class(**self._kwargs(data))
+
+    def _kwargs(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Turn a dict into constructor arguments of the message class."""
+        if not isinstance(data, dict):
+            raise TypeError(f"Expected a dict, got {type(data).__name__}")
+        fields = self._fields
+        writers = self._writers
+        kwargs = {}
+        for name, value in data.items():
+            if name in fields:
+                convert = writers[name]
+                kwargs[name] = value if convert is None else convert(value)
+        return kwargs
+
+    def decode(self, payload: bytes) -> dict[str, Any]:
+        """Parse serialized message bytes into a dict.
+
+        Args:
+            payload: Serialized message
+
+        Returns:
+            Field values by name
+
+        Raises:
+            ValueError: If the bytes are not a valid message
+        """
+        try:
+            return self.to_dict(self.message_class.FromString(payload))
+        except DecodeError as error:
+            raise ValueError(str(error)) from None
+
+    def encode(self, data: dict[str, Any]) -> bytes:
+        """Serialize a dict as a message of this codec's type.
+
+        Args:
+            data: Field values by name
+
+        Returns:
+            Serialized message
+        """
+        return self.from_dict(data).SerializeToString()
+
+
+def _none() -> None:
+    """Report an unset optional field."""
+    return None
+
+
+def _has_values(descriptor: Descriptor, seen: frozenset[str] = frozenset()) -> bool:
+    """Check whether a message type contains ``Value`` fields at any depth."""
+    if descriptor.full_name in seen:
+        return False
+    seen = seen | {descriptor.full_name}
+    for field in descriptor.fields:
+        message_type = field.message_type
+        if message_type is None:
+            continue
+        if message_type.full_name == _VALUE or _has_values(message_type, seen):
+            return True
+    return False
+
+
+class TypedRoute:
+    """A route and, if it has one, its typed RPC.
+
+    Attributes:
+        method: HTTP method of the route
+        url: URL template of the route
+        rpc: Full gRPC method name, e.g. ``/grpcplugin.routes.Routes/GetUser``;
+            empty if the route has no typed RPC
+        streaming: Whether the typed RPC streams its responses
+        path_params: Names of the URL template's parameters, in order
+        request: Codec of the request message, None without a typed RPC
+        response: Codec of the response message, None without a typed RPC
+    """
+
+    __slots__ = (
+        "method",
+        "url",
+        "rpc",
+        "streaming",
+        "path_params",
+        "request",
+        "response",
+        "_pattern",
+        "_segments",
+        "_calls",
+    )
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        rpc: str = "",
+        streaming: bool = False,
+        request: MessageCodec | None = None,
+        response: MessageCodec | None = None,
+    ) -> None:
+        """Initialize the route.
+
+        Args:
+            method: HTTP method
+            url: URL template
+            rpc: Full gRPC method name; empty for routes without one
+            streaming: Whether the typed RPC streams its responses
+            request: Codec of the request message
+            response: Codec of the response message
+        """
+        self.method: str = method
+        self.url: str = url
+        self.rpc: str = rpc
+        self.streaming: bool = streaming
+        self.request: MessageCodec | None = request
+        self.response: MessageCodec | None = response
+        self.path_params: tuple[str, ...] = tuple(_PARAM_PATTERN.findall(url))
+        # Template split around its parameters: names are at odd positions
+        self._segments: list[str] = _PARAM_PATTERN.split(url)
+        self._pattern: re.Pattern[str] | None = None
+        if self.path_params:
+            self._pattern = re.compile(
+                "".join(
+                    f"(?P<{segment}>[^/]+)" if index % 2 else re.escape(segment)
+                    for index, segment in enumerate(self._segments)
+                )
+                + "$"
+            )
+        self._calls: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @property
+    def typed(self) -> bool:
+        """Whether the route has a typed RPC."""
+        return bool(self.rpc)
+
+    def match(self, url: str) -> dict[str, Any] | None:
+        """Match a concrete URL against the route's template.
+
+        Parameter values are converted to the type of their request field.
+
+        Args:
+            url: Concrete URL
+
+        Returns:
+            Path parameters, or None if the URL does not match
+        """
+        if self._pattern is None:
+            return {} if url == self.url else None
+        matched = self._pattern.match(url)
+        if matched is None:
+            return None
+
+        path_params = matched.groupdict()
+        if self.request is None:
+            return path_params
+        fields = self.request.message_class.DESCRIPTOR.fields_by_name
+        try:
+            for name, value in path_params.items():
+                convert = _SEGMENT_CONVERTERS.get(fields[name].type, str)
+                path_params[name] = convert(value)
+        except (KeyError, ValueError):
+            return None
+        return path_params
+
+    def url_for(self, path_params: dict[str, Any]) -> str:
+        """Build the concrete URL of the route.
+
+        Args:
+            path_params: Values of the template's parameters
+
+        Returns:
+            URL with the parameters filled in
+
+        Raises:
+            KeyError: If a parameter is missing
+        """
+        if not self.path_params:
+            return self.url
+        segments = self._segments.copy()
+        for index in range(1, len(segments), 2):
+            segments[index] = str(path_params[segments[index]])
+        return "".join(segments)
+
+    def multicallable(self, channel: Any) -> Any:
+        """Return the stub method of the typed RPC on a channel.
+
+        Stub methods are cached per channel, which is how long they live.
+
+        Args:
+            channel: gRPC channel (sync or asyncio)
+
+        Returns:
+            Unary or server-streaming multicallable
+        """
+        call = self._calls.get(channel)
+        if call is None:
+            factory = channel.unary_stream if self.streaming else channel.unary_unary
+            call = factory(
+                self.rpc,
+                request_serializer=_serialize,
+                response_deserializer=self.response.message_class.FromString,
+            )
+            self._calls[channel] = call
+        return call
+
+
+def _serialize(message: Message) -> bytes:
+    """Serialize a request message."""
+    return message.SerializeToString()
+
+
+class TypedSchema:
+    """Typed RPCs of a server, rebuilt from its ``Schema`` RPC.
+
+    Message classes live in a descriptor pool of their own, so schemas of
+    several servers never clash.
+
+    Attributes:
+        fingerprint: Short hash of the descriptor; typed calls send it so
+            the server can reject messages built from an outdated schema
+        routes: Every route of the server, typed or not
+    """
+
+    def __init__(
+        self, descriptor: bytes, routes: Iterable[tuple[str, str, str, bool]]
+    ) -> None:
+        """Build the message classes of a schema.
+
+        Args:
+            descriptor: Serialized FileDescriptorProto of the typed service
+            routes: (method, url template, rpc, streaming) of every route
+        """
+        pool = descriptor_pool.DescriptorPool()
+        pool.AddSerializedFile(struct_pb2.DESCRIPTOR.serialized_pb)
+        pool.AddSerializedFile(descriptor)
+        self.fingerprint: str = hashlib.sha256(descriptor).hexdigest()[:16]
+        self.routes: list[TypedRoute] = []
+        self._static: dict[str, dict[str, TypedRoute]] = {}
+        self._templates: dict[str, list[TypedRoute]] = {}
+
+        for method, url, rpc, streaming in routes:
+            request = response = None
+            if rpc:
+                service_name, rpc_name = rpc.lstrip("/").split("/")
+                rpc_descriptor = pool.FindServiceByName(service_name).methods_by_name[rpc_name]
+                request = MessageCodec(rpc_descriptor.input_type)
+                response = MessageCodec(rpc_descriptor.output_type, complete=True)
+            route = TypedRoute(method, url, rpc, streaming, request, response)
+            self.routes.append(route)
+            if route.path_params:
+                self._templates.setdefault(method, []).append(route)
+            else:
+                self._static.setdefault(method, {})[url] = route
+
+    def match(
+        self, method: str, url: str, streaming: bool = False
+    ) -> tuple[TypedRoute, dict[str, Any]] | None:
+        """Find the typed RPC serving a request.
+
+        Mirrors the server's routing: a static route wins over templates.
+        When several templates match, the choice is left to the server.
+
+        Args:
+            method: HTTP method
+            url: Concrete URL
+            streaming: Whether the caller reads a stream of responses
+
+        Returns:
+            (route, path parameters), or None if the request should go
+            through the generic RPCs
+        """
+        route = self._static.get(method, {}).get(url)
+        if route is None:
+            matches = []
+            for template in self._templates.get(method, ()):
+                path_params = template.match(url)
+                if path_params is not None:
+                    matches.append((template, path_params))
+            if len(matches) != 1:
+                return None
+            route, path_params = matches[0]
+        else:
+            path_params = {}
+        if not route.typed or route.streaming != streaming:
+            return None
+        return route, path_params
+
+    def bind(
+        self, method: str, url: str, body: dict[str, Any], streaming: bool = False
+    ) -> tuple[TypedRoute, Message] | None:
+        """Build the typed request message of a request.
+
+        Args:
+            method: HTTP method
+            url: Concrete URL
+            body: Request body
+            streaming: Whether the caller reads a stream of responses
+
+        Returns:
+            (route, request message), or None if the request has no typed
+            RPC or its body does not fit the message
+        """
+        matched = self.match(method, url, streaming)
+        if matched is None:
+            return None
+        route, path_params = matched
+        try:
+            return route, route.request.from_dict({**body, **path_params})
+        except (TypeError, ValueError):
+            # Let the generic RPC report what is wrong with the body
+            return None
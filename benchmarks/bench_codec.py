@@ -0,0 +1,163 @@
+"""Micro-benchmark: google.protobuf.Struct vs compact payload codecs.
+
+Measures a full encode + decode round trip of the request message and
+its serialized size for small, nested and large-list payloads. "typed"
+is the per-route message generated from the route's pydantic model.
+Binary blobs compare a base64 string in the Struct body with the raw
+``attachment`` field.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_codec
+"""
+
+import base64
+import os
+import timeit
+from typing import Any
+
+from google.protobuf import json_format
+from google.protobuf.struct_pb2 import Struct
+from pydantic import BaseModel
+
+from GrpcPluin.codec import CODECS
+from GrpcPluin.Frame.codegen import build_schema
+from GrpcPluin.Frame.enums import METHODS
+from GrpcPluin.Frame.router import GrpcRouter
+from GrpcPluin.proto.base_proto_pb2 import Request as GrpcRequest  # type: ignore
+from GrpcPluin.schema import MessageCodec
+
+
+PAYLOADS: dict[str, dict[str, Any]] = {
+    "small": {"name": "far", "family": "ghorbani", "age": 4},
+    "nested": {
+        "user": {"id": 1, "tags": ["a", "b"], "address": {"city": "x", "zip": 12345}},
+        "scores": [1.5, 2.5, 3.5],
+    },
+    "large_list": {
+        "rows": [{"id": i, "name": f"row-{i}", "value": i * 0.5} for i in range(5_000)]
+    },
+}
+
+BLOBS: dict[str, bytes] = {"blob_1k": os.urandom(1 << 10), "blob_1m": os.urandom(1 << 20)}
+
+
+class Small(BaseModel):
+    name: str
+    family: str
+    age: int
+
+
+class Address(BaseModel):
+    city: str
+    zip: int
+
+
+class User(BaseModel):
+    id: int
+    tags: list[str]
+    address: Address
+
+
+class Nested(BaseModel):
+    user: User
+    scores: list[float]
+
+
+class Row(BaseModel):
+    id: int
+    name: str
+    value: float
+
+
+class LargeList(BaseModel):
+    rows: list[Row]
+
+
+def typed_codecs() -> dict[str, MessageCodec]:
+    """Generate the request message of a route taking each payload's model."""
+    router = GrpcRouter()
+    models = {"small": Small, "nested": Nested, "large_list": LargeList}
+    for label, model in models.items():
+
+        def handler(body: model) -> dict:  # type: ignore[valid-type]
+            return {}
+
+        handler.__name__ = label
+        router(f"/{label}", methods=[METHODS.POST])(handler)
+    schema = build_schema(router).typed_schema()
+    return {route.url.lstrip("/"): route.request for route in schema.routes}
+
+
+def struct_round_trip(body: dict[str, Any]) -> bytes:
+    """Encode and decode through Struct, as Dispatch does by default."""
+    struct = Struct()
+    struct.update(body)
+    wire = GrpcRequest(url="/bench", body=struct).SerializeToString()
+    json_format.MessageToDict(GrpcRequest.FromString(wire).body)
+    return wire
+
+
+def codec_round_trip(name: str, body: dict[str, Any]) -> bytes:
+    """Encode and decode through a payload codec."""
+    codec = CODECS[name]
+    wire = GrpcRequest(
+        url="/bench", payload=codec.encode(body), codec=name
+    ).SerializeToString()
+    codec.decode(GrpcRequest.FromString(wire).payload)
+    return wire
+
+
+def typed_round_trip(codec: MessageCodec, body: dict[str, Any]) -> bytes:
+    """Encode and decode through a generated per-route message."""
+    wire = codec.encode(body)
+    codec.decode(wire)
+    return wire
+
+
+def base64_round_trip(blob: bytes) -> bytes:
+    """Send a blob as a base64 string in the Struct body."""
+    struct = Struct()
+    struct.update({"blob": base64.b64encode(blob).decode()})
+    wire = GrpcRequest(url="/bench", body=struct).SerializeToString()
+    base64.b64decode(json_format.MessageToDict(GrpcRequest.FromString(wire).body)["blob"])
+    return wire
+
+
+def attachment_round_trip(blob: bytes) -> bytes:
+    """Send a blob as the request's binary attachment."""
+    wire = GrpcRequest(url="/bench", attachment=blob).SerializeToString()
+    memoryview(GrpcRequest.FromString(wire).attachment)
+    return wire
+
+
+def main() -> None:
+    """Time every codec against Struct for each payload shape."""
+    typed = typed_codecs()
+    print(f"{'payload':>10} {'codec':>8} {'us/round trip':>14} {'bytes':>9}")
+    for label, body in PAYLOADS.items():
+        number = 20 if label == "large_list" else 5_000
+        candidates = {"struct": lambda: struct_round_trip(body)}
+        for name in CODECS:
+            candidates[name] = lambda name=name: codec_round_trip(name, body)
+        candidates["typed"] = lambda: typed_round_trip(typed[label], body)
+
+        for name, run in candidates.items():
+            size = len(run())
+            elapsed = min(timeit.repeat(run, number=number, repeat=3))
+            print(f"{label:>10} {name:>8} {elapsed / number * 1e6:>14.1f} {size:>9}")
+
+    for label, blob in BLOBS.items():
+        number = 200 if label == "blob_1m" else 5_000
+        blob_candidates = {
+            "base64": lambda: base64_round_trip(blob),
+            "attach": lambda: attachment_round_trip(blob),
+        }
+        for name, run in blob_candidates.items():
+            size = len(run())
+            elapsed = min(timeit.repeat(run, number=number, repeat=3))
+            print(f"{label:>10} {name:>8} {elapsed / number * 1e6:>14.1f} {size:>9}")
+
+
+if __name__ == "__main__":
+    main()
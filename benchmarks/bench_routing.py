@@ -0,0 +1,51 @@
+"""Micro-benchmark: route lookup cost as the route table grows.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_routing
+"""
+
+import timeit
+
+from GrpcPluin.Frame.router import GrpcRouter
+
+
+def handler(id: int) -> dict:
+    """Handler shared by every synthetic route."""
+    return {}
+
+
+def build_router(size: int) -> GrpcRouter:
+    """Register ``size`` static and ``size`` templated GET routes."""
+    router = GrpcRouter()
+    for index in range(size):
+        router(url=f"/service{index}/items")(handler)
+        router(url=f"/service{index}/items/{{id:int}}/tags/{{tag}}")(handler)
+    return router
+
+
+def main() -> None:
+    """Time the last registered static and templated routes per table size."""
+    number = 50_000
+    print(f"{'routes':>8} {'static us':>10} {'template us':>12}")
+    for size in (10, 100, 1_000, 5_000):
+        router = build_router(size)
+        static_url = f"/service{size - 1}/items"
+        template_url = f"/service{size - 1}/items/42/tags/red"
+        assert router._routing("GET", template_url)[1] == {"id": 42, "tag": "red"}
+
+        static = min(
+            timeit.repeat(lambda: router._routing("GET", static_url), number=number, repeat=5)
+        )
+        template = min(
+            timeit.repeat(
+                lambda: router._routing("GET", template_url), number=number, repeat=5
+            )
+        )
+        print(
+            f"{size * 2:>8} {static / number * 1e6:>10.3f} {template / number * 1e6:>12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
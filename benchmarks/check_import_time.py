@@ -0,0 +1,103 @@
+"""Import-time regression check for client-side imports.
+
+Imports each module in a fresh interpreter with ``-X importtime``, keeps
+the best of several runs, and fails when a module is over its budget or
+pulls in server-side modules (the router, pydantic, ...).
+
+Run from the repository root:
+
+    python -m benchmarks.check_import_time
+    python -m benchmarks.check_import_time --budget-scale 2   # slow CI
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+
+# Module -> cumulative import budget in milliseconds
+BUDGETS_MS: dict[str, float] = {
+    "GrpcPluin": 50.0,
+    "GrpcPluin.client": 50.0,
+}
+
+# Module -> modules it must not load
+FORBIDDEN: dict[str, tuple[str, ...]] = {
+    "GrpcPluin": ("grpc", "GrpcPluin.Frame", "pydantic"),
+    "GrpcPluin.client": ("grpc", "GrpcPluin.Frame", "pydantic"),
+    "GrpcPluin.client.caller": ("GrpcPluin.Frame", "pydantic"),
+}
+
+
+def import_time_ms(module: str) -> float:
+    """Measure the cumulative import time of a module in a new interpreter.
+
+    Args:
+        module: Dotted module name
+
+    Returns:
+        Cumulative import time in milliseconds
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in reversed(completed.stderr.splitlines()):
+        fields = line.replace(":", "|", 1).split("|")
+        _, _, cumulative, name = (part.strip() for part in fields)
+        if name == module:
+            return int(cumulative) / 1000
+    raise RuntimeError(f"No import time reported for {module}")
+
+
+def loaded_modules(module: str) -> set[str]:
+    """Return every module loaded by importing ``module`` in a new interpreter."""
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import json, sys, {module}; print(json.dumps(sorted(sys.modules)))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(completed.stdout))
+
+
+def main() -> None:
+    """Check every budget and forbidden import; exit 1 on any failure."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per module")
+    parser.add_argument(
+        "--budget-scale", type=float, default=1.0, help="multiply every budget"
+    )
+    options = parser.parse_args()
+
+    failures = 0
+    for module, budget in BUDGETS_MS.items():
+        budget *= options.budget_scale
+        best = min(import_time_ms(module) for _ in range(options.repeat))
+        status = "ok" if best <= budget else "OVER BUDGET"
+        failures += best > budget
+        print(f"{module:<28} {best:>8.1f} ms  (budget {budget:.0f} ms)  {status}")
+
+    for module, forbidden in FORBIDDEN.items():
+        loaded = loaded_modules(module)
+        leaked = sorted(
+            name
+            for name in loaded
+            if any(name == prefix or name.startswith(prefix + ".") for prefix in forbidden)
+        )
+        failures += bool(leaked)
+        status = "ok" if not leaked else f"LOADS {', '.join(leaked[:5])}"
+        print(f"{module:<28} forbidden imports: {status}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Tests for concurrency limits and admission control."""
+
+import math
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from GrpcPluin.Frame.admission import (
+    AdmissionController,
+    AIMDLimit,
+    GradientLimit,
+    QueueTimedExecutor,
+    StaticLimit,
+    queue_delay,
+)
+from GrpcPluin.Frame.exceptions.exceptions import ResourceExhaustedException
+
+
+def test_aimd_grows_by_one_when_busy():
+    limit = AIMDLimit(initial=10)
+    limit.update(latency=0.01, in_flight=5, dropped=False)
+    assert limit.limit == 11
+
+
+def test_aimd_holds_when_under_used():
+    limit = AIMDLimit(initial=10)
+    limit.update(latency=0.01, in_flight=4, dropped=False)
+    assert limit.limit == 10
+
+
+def test_aimd_backs_off_on_drop_and_slow_requests():
+    limit = AIMDLimit(initial=10, backoff_ratio=0.5, latency_threshold=0.1)
+    limit.update(latency=0.01, in_flight=10, dropped=True)
+    assert limit.limit == 5
+    limit.update(latency=0.2, in_flight=5, dropped=False)
+    assert limit.limit == 2.5
+    assert limit.current == 2
+
+
+def test_aimd_stays_within_bounds():
+    limit = AIMDLimit(initial=2, min_limit=2, max_limit=3, backoff_ratio=0.5)
+    limit.update(latency=0.01, in_flight=3, dropped=False)
+    limit.update(latency=0.01, in_flight=3, dropped=False)
+    assert limit.limit == 3
+    limit.update(latency=0.01, in_flight=3, dropped=True)
+    assert limit.limit == 2
+
+
+@pytest.mark.parametrize("ratio", [0.4, 1.0])
+def test_aimd_rejects_invalid_backoff_ratio(ratio):
+    with pytest.raises(ValueError):
+        AIMDLimit(backoff_ratio=ratio)
+
+
+def test_gradient_grows_by_queue_allowance_at_steady_latency():
+    limit = GradientLimit(initial=16, smoothing=1.0)
+    limit.update(latency=0.01, in_flight=16, dropped=False)
+    assert limit.limit == 16 + math.sqrt(16)
+
+
+def test_gradient_shrinks_when_latency_rises():
+    limit = GradientLimit(initial=100, smoothing=1.0, tolerance=1.0)
+    limit.update(latency=0.01, in_flight=100, dropped=False)
+    grown = limit.limit
+    limit.update(latency=1.0, in_flight=100, dropped=False)
+    # The gradient bottoms out at 0.5
+    assert limit.limit == grown * 0.5 + math.sqrt(grown)
+    assert limit.limit < grown
+
+
+def test_gradient_ignores_under_used_limit():
+    limit = GradientLimit(initial=20)
+    limit.update(latency=5.0, in_flight=1, dropped=False)
+    assert limit.limit == 20
+
+
+def test_gradient_backs_off_on_drop():
+    limit = GradientLimit(initial=20)
+    limit.update(latency=0.01, in_flight=20, dropped=True)
+    assert limit.limit == 18
+
+
+def test_controller_sheds_above_limit():
+    controller = AdmissionController(StaticLimit(1))
+    token = controller.acquire()
+    with pytest.raises(ResourceExhaustedException):
+        controller.acquire()
+    controller.release(token, dropped=False)
+    controller.release(controller.acquire(), dropped=False)
+    assert controller.stats() == {"limit": 1, "in_flight": 0, "admitted": 2, "rejected": 1}
+
+
+def test_controller_updates_limit_on_release():
+    controller = AdmissionController(AIMDLimit(initial=2))
+    tokens = [controller.acquire(), controller.acquire()]
+    for token in tokens:
+        controller.release(token, dropped=True)
+    assert controller.limit.current == 1
+
+
+def test_queue_timed_executor_records_queue_delay():
+    release = threading.Event()
+    with QueueTimedExecutor(max_workers=1) as executor:
+        executor.submit(release.wait)
+        delayed: Future = executor.submit(queue_delay)
+        threading.Timer(0.1, release.set).start()
+        assert delayed.result(timeout=5) >= 0.1
+    assert queue_delay() == 0.0
+
+
+def test_controller_sheds_requests_queued_too_long():
+    controller = AdmissionController(StaticLimit(10), max_queue_delay=0.05)
+    release = threading.Event()
+    with QueueTimedExecutor(max_workers=1) as executor:
+        executor.submit(release.wait)
+        queued = executor.submit(controller.acquire)
+        threading.Timer(0.1, release.set).start()
+        with pytest.raises(ResourceExhaustedException):
+            queued.result(timeout=5)
+    assert controller.stats()["rejected"] == 1
@@ -0,0 +1,136 @@
+"""Tests for request coalescing."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from GrpcPluin.deadline import CallAbandoned
+from GrpcPluin.Frame.coalesce import CoalescePolicy, RequestCoalescer
+from GrpcPluin.Frame.exceptions.exceptions import UnavailableException
+
+
+def _run_together(coalescer, produce, duplicates=1):
+    """Run a leader and its duplicates for the same key.
+
+    Returns:
+        Result or exception of each call, the leader's first
+    """
+    outcomes = [None] * (duplicates + 1)
+
+    def call(index):
+        try:
+            outcomes[index] = coalescer.run("key", produce)
+        except Exception as error:
+            outcomes[index] = error
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(len(outcomes))]
+    threads[0].start()
+    # Let the leader claim the key before its duplicates arrive
+    time.sleep(0.05)
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return outcomes
+
+
+def _slow(calls, result=None, error=None):
+    """Build a produce function that takes a while, then returns ``result``.
+
+    The first call raises ``error`` instead, if given.
+    """
+
+    def produce():
+        calls.append(1)
+        time.sleep(0.2)
+        if error is not None and len(calls) == 1:
+            raise error
+        return result
+
+    return produce
+
+
+def test_duplicates_share_the_leader_result():
+    coalescer = RequestCoalescer(CoalescePolicy())
+    calls = []
+    outcomes = _run_together(coalescer, _slow(calls, result="value"), duplicates=3)
+    assert outcomes == ["value"] * 4
+    assert len(calls) == 1
+    assert coalescer.stats() == {
+        "executions": 1,
+        "coalesced": 3,
+        "timeouts": 0,
+        "in_flight": 0,
+    }
+
+
+def test_duplicates_share_the_leader_error():
+    coalescer = RequestCoalescer(CoalescePolicy())
+    calls = []
+    error = ValueError("boom")
+    outcomes = _run_together(coalescer, _slow(calls, error=error))
+    assert outcomes == [error, error]
+    assert len(calls) == 1
+
+
+def test_duplicates_run_again_when_errors_are_not_shared():
+    coalescer = RequestCoalescer(CoalescePolicy(share_errors=False))
+    calls = []
+    outcomes = _run_together(coalescer, _slow(calls, result="retried", error=ValueError()))
+    assert isinstance(outcomes[0], ValueError)
+    assert outcomes[1] == "retried"
+    assert len(calls) == 2
+
+
+def test_duplicates_run_again_when_the_leader_call_is_abandoned():
+    coalescer = RequestCoalescer(CoalescePolicy())
+    calls = []
+    produce = _slow(calls, result="retried", error=CallAbandoned(cancelled=True))
+    outcomes = _run_together(coalescer, produce)
+    assert isinstance(outcomes[0], CallAbandoned)
+    assert outcomes[1] == "retried"
+    assert coalescer.stats()["in_flight"] == 0
+
+
+def test_duplicate_fails_on_timeout_without_run_on_timeout():
+    coalescer = RequestCoalescer(CoalescePolicy(timeout=0.01, run_on_timeout=False))
+    outcomes = _run_together(coalescer, _slow([], result="value"))
+    assert outcomes[0] == "value"
+    assert isinstance(outcomes[1], UnavailableException)
+    assert coalescer.stats()["timeouts"] == 1
+
+
+def test_negative_timeout_is_rejected():
+    with pytest.raises(ValueError):
+        RequestCoalescer(CoalescePolicy(timeout=-1))
+
+
+def test_async_leader_failure():
+    async def scenario(policy):
+        coalescer = RequestCoalescer(policy)
+        calls = []
+
+        async def produce():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            if len(calls) == 1:
+                raise ValueError("boom")
+            return "retried"
+
+        leader = asyncio.create_task(coalescer.run_async("key", produce))
+        await asyncio.sleep(0)
+        duplicate = asyncio.create_task(coalescer.run_async("key", produce))
+        outcomes = await asyncio.gather(leader, duplicate, return_exceptions=True)
+        return outcomes, len(calls), coalescer.stats()["in_flight"]
+
+    (leader, duplicate), calls, in_flight = asyncio.run(scenario(CoalescePolicy()))
+    assert isinstance(leader, ValueError) and duplicate is leader
+    assert (calls, in_flight) == (1, 0)
+
+    (leader, duplicate), calls, in_flight = asyncio.run(
+        scenario(CoalescePolicy(share_errors=False))
+    )
+    assert isinstance(leader, ValueError) and duplicate == "retried"
+    assert (calls, in_flight) == (2, 0)
@@ -0,0 +1,54 @@
+"""Tests for the client channel pool."""
+
+import time
+
+from GrpcPluin.client.pool import ChannelPool
+
+TARGET = "127.0.0.1:1"
+OTHER = "127.0.0.1:2"
+
+
+def _sweep(pool):
+    """Wait past the idle timeout, then trigger an eviction sweep."""
+    time.sleep(pool.idle_timeout * 1.5)
+    pool.get_stub(OTHER)
+
+
+def test_idle_targets_are_evicted():
+    with ChannelPool(idle_timeout=0.05) as pool:
+        pool.get_stub(TARGET)
+        _sweep(pool)
+        assert TARGET not in pool._targets
+
+
+def test_leased_target_is_not_evicted():
+    with ChannelPool(idle_timeout=0.05) as pool:
+        with pool.lease(TARGET):
+            channel = pool.get_channel(TARGET)
+            _sweep(pool)
+            assert pool.get_channel(TARGET) is channel
+        # The lease refreshed last_used: it survives the next sweep too
+        pool._last_sweep = 0
+        pool.get_stub(OTHER)
+        assert pool.get_channel(TARGET) is channel
+        _sweep(pool)
+        assert TARGET not in pool._targets
+
+
+def test_acquire_release_tracks_calls_in_flight():
+    with ChannelPool(idle_timeout=0.05) as pool:
+        first, second = pool.acquire(TARGET), pool.acquire(TARGET)
+        assert first is second and first.in_flight == 2
+        pool.release(first)
+        _sweep(pool)
+        assert pool._targets[TARGET] is second
+        pool.release(second)
+        _sweep(pool)
+        assert TARGET not in pool._targets
+
+
+def test_channels_are_used_round_robin():
+    with ChannelPool(channels_per_target=3, idle_timeout=None) as pool:
+        channels = [pool.get_channel(TARGET) for _ in range(6)]
+        assert len(set(map(id, channels))) == 3
+        assert channels[:3] == channels[3:]
@@ -0,0 +1,48 @@
+"""Tests for the client retry budget."""
+
+import pytest
+
+from GrpcPluin.client.retry import RetryBudget
+
+
+def test_budget_starts_full_and_runs_out():
+    budget = RetryBudget(ratio=0.1, min_per_second=0, max_tokens=3)
+    assert [budget.withdraw() for _ in range(4)] == [True, True, True, False]
+
+
+def test_deposits_earn_extra_attempts():
+    budget = RetryBudget(ratio=0.5, min_per_second=0, max_tokens=1)
+    assert budget.withdraw()
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+def test_deposits_are_capped():
+    budget = RetryBudget(ratio=1, min_per_second=0, max_tokens=2)
+    for _ in range(10):
+        budget.deposit()
+    assert budget.tokens == 2
+
+
+def test_tokens_refill_over_time(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("GrpcPluin.client.retry.time.monotonic", lambda: now[0])
+    budget = RetryBudget(ratio=0, min_per_second=2, max_tokens=5)
+    for _ in range(5):
+        assert budget.withdraw()
+    assert not budget.withdraw()
+    now[0] += 0.5
+    assert budget.tokens == 1
+    assert budget.withdraw()
+    now[0] += 60
+    assert budget.tokens == 5
+
+
+@pytest.mark.parametrize(
+    "settings", [{"ratio": -1}, {"min_per_second": -1}, {"max_tokens": 0.5}]
+)
+def test_invalid_settings_are_rejected(settings):
+    with pytest.raises(ValueError):
+        RetryBudget(**settings)
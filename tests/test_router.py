@@ -0,0 +1,61 @@
+"""Tests for route lookup."""
+
+import pytest
+
+from GrpcPluin.Frame.enums import METHODS
+from GrpcPluin.Frame.exceptions.exceptions import NotFoundException
+from GrpcPluin.Frame.router import GrpcRouter
+
+
+@pytest.fixture
+def router():
+    router = GrpcRouter()
+
+    @router(url="/items/{id:int}", methods=[METHODS.GET])
+    def get_item(id: int):
+        return {"id": id}
+
+    @router(url="/items/latest", methods=[METHODS.GET])
+    def latest_item():
+        return {}
+
+    @router(url="/files/{name}", methods=[METHODS.GET])
+    def get_file(name: str):
+        return {"name": name}
+
+    return router
+
+
+def test_static_route(router):
+    func_detail, params = router._routing("GET", "/items/latest")
+    assert func_detail.func.__name__ == "latest_item"
+    assert params == {}
+
+
+def test_templated_route_captures_typed_params(router):
+    func_detail, params = router._routing("GET", "/items/42")
+    assert func_detail.func.__name__ == "get_item"
+    assert params == {"id": 42}
+
+
+def test_typed_param_falls_through_on_conversion_error(router):
+    with pytest.raises(NotFoundException):
+        router._routing("GET", "/items/abc")
+
+
+def test_literal_template_is_not_found(router):
+    with pytest.raises(NotFoundException):
+        router._routing("GET", "/items/{id:int}")
+
+
+def test_literal_str_template_is_captured(router):
+    # A str parameter accepts any segment, braces included: the handler
+    # still gets its capture rather than being called without it
+    func_detail, params = router._routing("GET", "/files/{name}")
+    assert func_detail.func.__name__ == "get_file"
+    assert params == {"name": "{name}"}
+
+
+def test_unknown_method_is_not_found(router):
+    with pytest.raises(NotFoundException):
+        router._routing("POST", "/items/42")